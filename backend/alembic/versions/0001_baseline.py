@@ -0,0 +1,64 @@
+"""Baseline schema: the tables create_all built before migrations existed
+
+Databases created before migrations were added already have this schema;
+mark them with `alembic stamp 0001` and then `alembic upgrade head`.
+
+Revision ID: 0001
+Revises:
+Create Date: 2026-10-17
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0001"
+down_revision = None
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "resumes",
+        sa.Column("id", sa.Uuid(), primary_key=True),
+        sa.Column("user_id", sa.String(), nullable=False),
+        sa.Column("raw_text", sa.Text(), nullable=False),
+        sa.Column("parsed_json", sa.JSON(), nullable=True),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now()),
+    )
+    op.create_index("ix_resumes_user_id", "resumes", ["user_id"])
+    op.create_table(
+        "job_descriptions",
+        sa.Column("id", sa.Uuid(), primary_key=True),
+        sa.Column("platform", sa.String(), nullable=False),
+        sa.Column("raw_text", sa.Text(), nullable=False),
+        sa.Column("extracted_signals", sa.JSON(), nullable=True),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now()),
+    )
+    op.create_table(
+        "resume_variants",
+        sa.Column("id", sa.Uuid(), primary_key=True),
+        sa.Column("resume_id", sa.Uuid(), sa.ForeignKey("resumes.id"), nullable=False),
+        sa.Column("jd_id", sa.Uuid(), sa.ForeignKey("job_descriptions.id"), nullable=False),
+        sa.Column("persona", sa.String(), nullable=False),
+        sa.Column("platform", sa.String(), nullable=False),
+        sa.Column("compiled_text", sa.Text(), nullable=False),
+        sa.Column("scores", sa.JSON(), nullable=True),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now()),
+    )
+    op.create_index("ix_resume_variants_resume_id", "resume_variants", ["resume_id"])
+    op.create_index("ix_resume_variants_jd_id", "resume_variants", ["jd_id"])
+    op.create_table(
+        "application_outcomes",
+        sa.Column("id", sa.Uuid(), primary_key=True),
+        sa.Column("variant_id", sa.Uuid(), sa.ForeignKey("resume_variants.id"), nullable=False),
+        sa.Column("status", sa.String(), nullable=False),
+        sa.Column("recorded_at", sa.DateTime(timezone=True), server_default=sa.func.now()),
+    )
+    op.create_index("ix_application_outcomes_variant_id", "application_outcomes", ["variant_id"])
+
+
+def downgrade() -> None:
+    op.drop_table("application_outcomes")
+    op.drop_table("resume_variants")
+    op.drop_table("job_descriptions")
+    op.drop_table("resumes")
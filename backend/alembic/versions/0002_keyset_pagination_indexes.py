@@ -0,0 +1,52 @@
+"""Composite indexes for keyset pagination of the list endpoints
+
+Replace the single-column indexes on resumes.user_id,
+resume_variants.resume_id / jd_id and application_outcomes.variant_id with
+(filter, created_at, id) indexes, which also serve the filter alone.
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-17
+"""
+from alembic import op
+
+revision = "0002"
+down_revision = "0001"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_index("ix_resumes_user_id_created_at_id", "resumes", ["user_id", "created_at", "id"])
+    op.drop_index("ix_resumes_user_id", table_name="resumes")
+
+    op.create_index("ix_resume_variants_created_at_id", "resume_variants", ["created_at", "id"])
+    op.create_index(
+        "ix_resume_variants_resume_id_created_at_id", "resume_variants", ["resume_id", "created_at", "id"]
+    )
+    op.create_index("ix_resume_variants_jd_id_created_at_id", "resume_variants", ["jd_id", "created_at", "id"])
+    op.drop_index("ix_resume_variants_resume_id", table_name="resume_variants")
+    op.drop_index("ix_resume_variants_jd_id", table_name="resume_variants")
+
+    op.create_index("ix_application_outcomes_recorded_at_id", "application_outcomes", ["recorded_at", "id"])
+    op.create_index(
+        "ix_application_outcomes_variant_id_recorded_at_id",
+        "application_outcomes",
+        ["variant_id", "recorded_at", "id"]
+    )
+    op.drop_index("ix_application_outcomes_variant_id", table_name="application_outcomes")
+
+
+def downgrade() -> None:
+    op.create_index("ix_application_outcomes_variant_id", "application_outcomes", ["variant_id"])
+    op.drop_index("ix_application_outcomes_variant_id_recorded_at_id", table_name="application_outcomes")
+    op.drop_index("ix_application_outcomes_recorded_at_id", table_name="application_outcomes")
+
+    op.create_index("ix_resume_variants_jd_id", "resume_variants", ["jd_id"])
+    op.create_index("ix_resume_variants_resume_id", "resume_variants", ["resume_id"])
+    op.drop_index("ix_resume_variants_jd_id_created_at_id", table_name="resume_variants")
+    op.drop_index("ix_resume_variants_resume_id_created_at_id", table_name="resume_variants")
+    op.drop_index("ix_resume_variants_created_at_id", table_name="resume_variants")
+
+    op.create_index("ix_resumes_user_id", "resumes", ["user_id"])
+    op.drop_index("ix_resumes_user_id_created_at_id", table_name="resumes")
@@ -0,0 +1,29 @@
+"""Normalized text hash on job descriptions, for bulk ingestion dedupe
+
+Rows stored before this have no hash, so re-ingesting them would not be
+recognized as a duplicate; fill them in afterwards with
+`python -m app.cli backfill-jd-hashes`.
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-17
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0003"
+down_revision = "0002"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    with op.batch_alter_table("job_descriptions") as batch:
+        batch.add_column(sa.Column("text_hash", sa.String(64), nullable=True))
+    op.create_index("ix_job_descriptions_text_hash_platform", "job_descriptions", ["text_hash", "platform"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_job_descriptions_text_hash_platform", table_name="job_descriptions")
+    with op.batch_alter_table("job_descriptions") as batch:
+        batch.drop_column("text_hash")
@@ -0,0 +1,69 @@
+"""Compiled variant text stored once by hash, and compile input hashes
+
+Variants get text_hash, pointing at variant_texts, and input_hash, unique
+per resume and JD. compiled_text becomes nullable: variants stored before
+this keep their text inline, new ones store it in variant_texts.
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-17
+"""
+import zlib
+
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0004"
+down_revision = "0003"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # New tables are also created at startup, so it may exist already
+    if not sa.inspect(op.get_bind()).has_table("variant_texts"):
+        op.create_table(
+            "variant_texts",
+            sa.Column("text_hash", sa.String(64), primary_key=True),
+            sa.Column("compressed", sa.LargeBinary(), nullable=False),
+            sa.Column("size_bytes", sa.Integer(), nullable=False),
+            sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now()),
+        )
+
+    with op.batch_alter_table("resume_variants") as batch:
+        batch.alter_column("compiled_text", existing_type=sa.Text(), nullable=True)
+        batch.add_column(sa.Column("text_hash", sa.String(64), nullable=True))
+        batch.add_column(sa.Column("input_hash", sa.String(64), nullable=True))
+        batch.create_foreign_key(
+            "fk_resume_variants_text_hash_variant_texts", "variant_texts", ["text_hash"], ["text_hash"]
+        )
+    op.create_index(
+        "ix_resume_variants_resume_id_jd_id_input_hash",
+        "resume_variants",
+        ["resume_id", "jd_id", "input_hash"],
+        unique=True
+    )
+
+
+def downgrade() -> None:
+    # Variants stored by hash need their text back inline before it can be required
+    bind = op.get_bind()
+    variants = sa.table("resume_variants", sa.column("id"), sa.column("compiled_text"), sa.column("text_hash"))
+    texts = sa.table("variant_texts", sa.column("text_hash"), sa.column("compressed"))
+    rows = bind.execute(
+        sa.select(variants.c.id, texts.c.compressed)
+        .join_from(variants, texts, variants.c.text_hash == texts.c.text_hash)
+        .where(variants.c.compiled_text.is_(None))
+    )
+    for variant_id, compressed in rows.all():
+        bind.execute(
+            variants.update()
+            .where(variants.c.id == variant_id)
+            .values(compiled_text=zlib.decompress(compressed).decode("utf-8"))
+        )
+    op.drop_index("ix_resume_variants_resume_id_jd_id_input_hash", table_name="resume_variants")
+    with op.batch_alter_table("resume_variants") as batch:
+        batch.drop_constraint("fk_resume_variants_text_hash_variant_texts", type_="foreignkey")
+        batch.drop_column("input_hash")
+        batch.drop_column("text_hash")
+        batch.alter_column("compiled_text", existing_type=sa.Text(), nullable=False)
@@ -0,0 +1,37 @@
+"""Owner and heartbeat on parse jobs
+
+Jobs are only failed as stale once the process holding them stops
+heartbeating (see parse_queue.fail_stale_parse_jobs). parse_jobs is
+created at startup, so databases that do not have it yet get it, with
+these columns, from the app instead.
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2026-10-17
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0005"
+down_revision = "0004"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    inspector = sa.inspect(op.get_bind())
+    if not inspector.has_table("parse_jobs"):
+        return
+    if "owner_id" in {column["name"] for column in inspector.get_columns("parse_jobs")}:
+        return  # Created by a version of the app that already has them
+    with op.batch_alter_table("parse_jobs") as batch:
+        batch.add_column(sa.Column("owner_id", sa.String(32), nullable=True))
+        batch.add_column(sa.Column("heartbeat_at", sa.DateTime(timezone=True), nullable=True))
+
+
+def downgrade() -> None:
+    if not sa.inspect(op.get_bind()).has_table("parse_jobs"):
+        return
+    with op.batch_alter_table("parse_jobs") as batch:
+        batch.drop_column("heartbeat_at")
+        batch.drop_column("owner_id")
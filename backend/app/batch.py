@@ -0,0 +1,114 @@
+"""
+Batch compilation of one resume against many job descriptions.
+The resume's structured parse is built at most once per batch; large
+batches are spread across a process pool.
+"""
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Any, List, Iterator, Optional, Tuple
+import os
+
+from .compiler import compile_resume_variant, find_matching_skills
+from .parsing import build_parsed_json, parsed_resume_is_current
+from .score_cache import cached_survivability_score
+from .config import settings
+
+# (jd_id, jd_text, jd_signals)
+JDInput = Tuple[Any, str, Dict[str, Any]]
+
+# Per-process resume state, set once by the pool initializer so it is not
+# pickled into every task
+_worker_resume: Dict[str, Any] = {}
+
+
+def _init_worker(resume_text: str, parsed_resume: Dict[str, Any]) -> None:
+    _worker_resume["text"] = resume_text
+    _worker_resume["parsed"] = parsed_resume
+
+
+def compile_for_jd(
+    resume_text: str,
+    parsed_resume: Dict[str, Any],
+    jd: JDInput,
+    personas: List[str],
+    platforms: List[str]
+) -> List[Dict[str, Any]]:
+    """Compile and score every persona x platform variant for a single JD"""
+    jd_id, jd_text, jd_signals = jd
+    results = []
+    
+    # Scores don't depend on persona, so compute them once per platform
+    scores_by_platform = {
+        platform: cached_survivability_score(
+            resume_text, jd_text, platform, jd_signals=jd_signals, parsed_resume=parsed_resume
+        )
+        for platform in platforms
+    }
+    # Nor do the matching skills; every variant reuses one scan of the resume
+    matching_skills = find_matching_skills(resume_text, jd_signals.get("top_terms", []))
+    
+    for persona in personas:
+        for platform in platforms:
+            compiled_text = compile_resume_variant(
+                resume_text,
+                jd_text,
+                persona,
+                platform,
+                jd_signals=jd_signals,
+                resume_sections=parsed_resume["sections"],
+                matching_skills=matching_skills
+            )
+            results.append({
+                "jd_id": jd_id,
+                "persona": persona,
+                "platform": platform,
+                "compiled_text": compiled_text,
+                "scores": scores_by_platform[platform]
+            })
+    
+    return results
+
+
+def _compile_task(args: Tuple[JDInput, List[str], List[str]]) -> List[Dict[str, Any]]:
+    jd, personas, platforms = args
+    return compile_for_jd(
+        _worker_resume["text"], _worker_resume["parsed"], jd, personas, platforms
+    )
+
+
+def iter_compiled_variants(
+    resume_text: str,
+    jds: List[JDInput],
+    personas: List[str],
+    platforms: List[str],
+    max_workers: Optional[int] = None,
+    parsed_resume: Optional[Dict[str, Any]] = None
+) -> Iterator[Dict[str, Any]]:
+    """
+    Compile the cross product of JDs x personas x platforms for one resume.
+    
+    Results are yielded in JD order as soon as each JD is done, so callers
+    can stream them out before the whole batch finishes. parsed_resume is
+    the resume's stored parsed_json; it is rebuilt if missing or stale.
+    """
+    if not parsed_resume_is_current(parsed_resume):
+        parsed_resume = build_parsed_json(resume_text)
+    total = len(jds) * len(personas) * len(platforms)
+    
+    if total < settings.BATCH_POOL_THRESHOLD or len(jds) < 2:
+        for jd in jds:
+            yield from compile_for_jd(resume_text, parsed_resume, jd, personas, platforms)
+        return
+    
+    workers = max_workers or settings.BATCH_MAX_WORKERS or os.cpu_count() or 1
+    workers = min(workers, len(jds))
+    # Keep chunks small enough that the first results arrive early
+    chunksize = max(1, len(jds) // (workers * 4))
+    tasks = [(jd, personas, platforms) for jd in jds]
+    
+    with ProcessPoolExecutor(
+        max_workers=workers,
+        initializer=_init_worker,
+        initargs=(resume_text, parsed_resume)
+    ) as pool:
+        for results in pool.map(_compile_task, tasks, chunksize=chunksize):
+            yield from results
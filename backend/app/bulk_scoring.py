@@ -0,0 +1,166 @@
+"""
+Vectorized survivability scoring for every resume x JD pair in a cohort.
+
+Produces exactly the same numbers as calculate_survivability_score, but
+keyword matches for all pairs come from one matrix product and platform
+weights are applied to all platforms at once.
+"""
+from typing import Any, Dict, List, Optional, Sequence
+
+import numpy as np
+
+from .jd_extract import extract_jd_signals
+from .matcher import KeywordMatcher
+from .platform_profiles import platform_registry
+from .scoring import (
+    AGE_RISK_WEIGHT,
+    DEFAULT_RECENCY_SCORE,
+    OVERQUAL_RISK_WEIGHT,
+    calculate_age_proxy_risk,
+    extract_jd_title,
+    extract_resume_titles,
+    has_senior_terms,
+    overqual_risk_for,
+)
+
+SCORE_KEYS = ["keyword_score", "title_score", "age_proxy_risk", "overqual_risk"]
+
+
+def _round2(values: np.ndarray) -> np.ndarray:
+    """Round like Python's round(x, 2), which np.round does not always match"""
+    unique, inverse = np.unique(values, return_inverse=True)
+    rounded = np.array([round(float(value), 2) for value in unique], dtype=np.float64)
+    return rounded[inverse].reshape(values.shape)
+
+
+def _keyword_scores(resume_texts: Sequence[str], jd_keywords: List[List[str]]) -> np.ndarray:
+    vocabulary = sorted({keyword.lower() for keywords in jd_keywords for keyword in keywords})
+    if not vocabulary:
+        return np.zeros((len(resume_texts), len(jd_keywords)))
+    column = {term: i for i, term in enumerate(vocabulary)}
+
+    # Resume x term presence, from one scan per resume
+    matcher = KeywordMatcher(vocabulary)
+    presence = np.zeros((len(resume_texts), len(vocabulary)), dtype=np.float32)
+    for i, resume_text in enumerate(resume_texts):
+        found = [column[term] for term in matcher.scan(resume_text)]
+        presence[i, found] = 1.0
+
+    # JD x term counts; repeated keywords count once per repetition, like
+    # the scalar scorer
+    counts = np.zeros((len(jd_keywords), len(vocabulary)), dtype=np.float32)
+    for j, keywords in enumerate(jd_keywords):
+        for keyword in keywords:
+            counts[j, column[keyword.lower()]] += 1.0
+
+    matches = (presence @ counts.T).astype(np.float64)
+    lengths = np.array([len(keywords) for keywords in jd_keywords], dtype=np.float64)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        scores = np.minimum(matches / lengths, 1.0)
+    scores[:, lengths == 0] = 0.0
+    return scores
+
+
+def _title_scores(resume_texts: Sequence[str], jd_texts: Sequence[str]) -> np.ndarray:
+    scores = np.empty((len(resume_texts), len(jd_texts)))
+
+    # JD title words as a word x JD presence matrix
+    jd_titles = [extract_jd_title(jd_text) for jd_text in jd_texts]
+    jd_words = [set(title.lower().split()) if title else set() for title in jd_titles]
+    vocabulary = {word: i for i, word in enumerate(sorted(set().union(*jd_words)))}
+    word_presence = np.zeros((len(vocabulary), len(jd_texts)), dtype=np.int32)
+    for j, words in enumerate(jd_words):
+        word_presence[[vocabulary[word] for word in words], j] = 1
+    no_jd_title = np.array([not title for title in jd_titles])
+
+    for i, resume_text in enumerate(resume_texts):
+        row = np.full(len(jd_texts), 0.3)
+        undecided = np.ones(len(jd_texts), dtype=bool)
+        # The first resume title sharing any word with the JD title decides
+        for title in extract_resume_titles(resume_text):
+            ids = [vocabulary[word] for word in set(title.lower().split()) if word in vocabulary]
+            if not ids:
+                continue
+            common = word_presence[ids].sum(axis=0)
+            hit = undecided & (common >= 1)
+            row[hit] = np.where(common[hit] >= 2, 0.8, 0.5)
+            undecided &= ~hit
+            if not undecided.any():
+                break
+        scores[i] = row
+
+    scores[:, no_jd_title] = 0.5
+    return scores
+
+
+def score_matrix(
+    resume_texts: Sequence[str],
+    jd_texts: Sequence[str],
+    jd_signals: Optional[Sequence[Dict[str, Any]]] = None,
+    platforms: Optional[Sequence[str]] = None
+) -> Dict[str, Any]:
+    """
+    Score every resume against every JD.
+
+    Returns a dict with the same keys as calculate_survivability_score, each
+    holding a (len(resume_texts), len(jd_texts)) array, except
+    "survivability" which maps each platform to such an array.
+    """
+    if jd_signals is None:
+        jd_signals = [extract_jd_signals(jd_text) for jd_text in jd_texts]
+    registry = platform_registry()
+    if platforms is None:
+        platforms = list(registry.platforms)
+    shape = (len(resume_texts), len(jd_texts))
+
+    keyword = _keyword_scores(resume_texts, [s.get("top_terms", []) for s in jd_signals])
+    title = _title_scores(resume_texts, jd_texts)
+    age = np.broadcast_to(
+        np.array([calculate_age_proxy_risk(text) for text in resume_texts])[:, None], shape
+    )
+
+    # Overqualification risk only depends on two per-side features
+    resume_senior = [has_senior_terms(text) for text in resume_texts]
+    jd_seniority = [s.get("seniority", "unspecified") for s in jd_signals]
+    risk_table = {
+        (senior, seniority): overqual_risk_for(senior, seniority)
+        for senior in (False, True)
+        for seniority in set(jd_seniority)
+    }
+    overqual = np.array([
+        [risk_table[(senior, seniority)] for seniority in jd_seniority]
+        for senior in resume_senior
+    ]).reshape(shape)
+
+    # Same operation order as the scalar formula so results are bit-identical
+    weights = np.array([
+        [registry.profiles[p]["keyword_weight"], registry.profiles[p]["title_weight"],
+         registry.profiles[p]["recency_weight"]]
+        for p in platforms
+    ])
+    wk, wt, wr = (weights[:, k, None, None] for k in range(3))
+    survivability = (
+        (keyword * wk) +
+        (title * wt) +
+        (DEFAULT_RECENCY_SCORE * wr) -
+        (age * AGE_RISK_WEIGHT) -
+        (overqual * OVERQUAL_RISK_WEIGHT)
+    )
+    survivability = np.clip(survivability, 0.0, 1.0)
+
+    return {
+        "keyword_score": _round2(keyword),
+        "title_score": _round2(title),
+        "age_proxy_risk": _round2(np.asarray(age)),
+        "overqual_risk": _round2(overqual),
+        "survivability": {
+            platform: _round2(survivability[k]) for k, platform in enumerate(platforms)
+        },
+    }
+
+
+def pair_scores(matrix: Dict[str, Any], resume_index: int, jd_index: int, platform: str) -> Dict[str, float]:
+    """Pull one pair's scores out of a score_matrix result"""
+    scores = {key: float(matrix[key][resume_index, jd_index]) for key in SCORE_KEYS}
+    scores["survivability"] = float(matrix["survivability"][platform][resume_index, jd_index])
+    return scores
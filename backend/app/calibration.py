@@ -0,0 +1,149 @@
+"""
+Outcome-driven calibration of platform weights.
+
+Fits, per platform, a least-squares model of interview (1) vs rejected
+(0) outcomes on the stored variant scores: keyword, title, age risk and
+overqualification risk. Ghosted outcomes say nothing either way and are
+left out. Rows are streamed from the database in chunks and only the
+normal-equation sums X'X and X'y are kept, so memory stays flat however
+many outcomes there are.
+
+Outcomes only show how keyword and title matches trade off against each
+other, not how survivability should be scaled, and recency is not scored
+per resume yet. So the fitted slopes split the platform's current
+keyword + title weight between the two, recency keeps its weight, and the
+result is blended with the current weights in proportion to the number of
+outcomes (CALIBRATION_PRIOR_OUTCOMES). Platforms with fewer than
+CALIBRATION_MIN_OUTCOMES outcomes, or no positive slope, keep their
+weights.
+
+The newest version in the profiles directory (or the built-in weights) is
+the starting point, and the result is written as the next
+profiles-v<version>.json there, which platform_profiles hot-loads.
+"""
+from datetime import datetime, timezone
+from typing import Any, Dict, Mapping, Optional, Tuple
+
+import numpy as np
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from .models import ApplicationOutcome, ResumeVariant
+from .platform_profiles import latest_profile_version, load_latest_registry, write_profile_version
+
+FEATURES = ("keyword_score", "title_score", "age_proxy_risk", "overqual_risk")
+LABELS = {"interview": 1.0, "rejected": 0.0}
+
+
+class PlatformFit:
+    """Running least-squares sums over rows [1, *FEATURES] for one platform"""
+
+    def __init__(self):
+        size = len(FEATURES) + 1
+        self.xtx = np.zeros((size, size))
+        self.xty = np.zeros(size)
+        self.outcomes = 0
+        self.interviews = 0
+
+    def add(self, features: np.ndarray, labels: np.ndarray) -> None:
+        x = np.hstack([np.ones((len(features), 1)), features])
+        self.xtx += x.T @ x
+        self.xty += x.T @ labels
+        self.outcomes += len(labels)
+        self.interviews += int(labels.sum())
+
+    def coefficients(self) -> Dict[str, float]:
+        """Intercept and per-feature slopes; the minimum-norm solution if features are collinear"""
+        solution = np.linalg.lstsq(self.xtx, self.xty, rcond=None)[0]
+        return dict(zip(("intercept", *FEATURES), (float(value) for value in solution)))
+
+
+def accumulate_outcomes(db: Session, batch_size: int = 10000) -> Dict[str, PlatformFit]:
+    """Stream interview/rejected outcomes with their variant's scores into per-platform fits"""
+    fits: Dict[str, PlatformFit] = {}
+    query = (
+        select(ResumeVariant.platform, ResumeVariant.scores, ApplicationOutcome.status)
+        .select_from(ApplicationOutcome)
+        .join(ResumeVariant, ResumeVariant.id == ApplicationOutcome.variant_id)
+        .where(ApplicationOutcome.status.in_(list(LABELS)))
+        .execution_options(yield_per=batch_size)
+    )
+    for partition in db.execute(query).partitions():
+        rows: Dict[str, Tuple[list, list]] = {}
+        for platform, scores, status in partition:
+            if not scores or any(scores.get(feature) is None for feature in FEATURES):
+                continue
+            features, labels = rows.setdefault(platform, ([], []))
+            features.append([scores[feature] for feature in FEATURES])
+            labels.append(LABELS[status])
+        for platform, (features, labels) in rows.items():
+            fits.setdefault(platform, PlatformFit()).add(
+                np.array(features, dtype=float), np.array(labels, dtype=float)
+            )
+    return fits
+
+
+def calibrated_weights(
+    current: Mapping[str, float],
+    fit: Optional[PlatformFit],
+    min_outcomes: int,
+    prior_outcomes: int
+) -> Tuple[Dict[str, float], Dict[str, Any]]:
+    """New weights for one platform plus a report of how they were derived"""
+    if fit is None or fit.outcomes < min_outcomes:
+        outcomes = fit.outcomes if fit else 0
+        return dict(current), {"calibrated": False, "outcomes": outcomes, "reason": "too few outcomes"}
+
+    coefficients = fit.coefficients()
+    report = {
+        "calibrated": False,
+        "outcomes": fit.outcomes,
+        "interview_rate": round(fit.interviews / fit.outcomes, 4),
+        "coefficients": {name: round(value, 6) for name, value in coefficients.items()},
+    }
+    keyword_slope = max(coefficients["keyword_score"], 0.0)
+    title_slope = max(coefficients["title_score"], 0.0)
+    if keyword_slope + title_slope == 0:
+        report["reason"] = "no positive keyword or title slope"
+        return dict(current), report
+
+    match_weight = current["keyword_weight"] + current["title_weight"]
+    fitted_keyword = match_weight * keyword_slope / (keyword_slope + title_slope)
+    blend = fit.outcomes / (fit.outcomes + prior_outcomes)
+    keyword_weight = round(blend * fitted_keyword + (1 - blend) * current["keyword_weight"], 4)
+    report.update({"calibrated": True, "blend": round(blend, 4)})
+    return {
+        "keyword_weight": keyword_weight,
+        "title_weight": round(match_weight - keyword_weight, 4),
+        "recency_weight": current["recency_weight"],
+    }, report
+
+
+def calibrate_profiles(
+    db: Session,
+    directory: str,
+    min_outcomes: int,
+    prior_outcomes: int,
+    batch_size: int = 10000,
+    dry_run: bool = False
+) -> Dict[str, Any]:
+    """Fit weights to stored outcomes and write them as the next profile version unless dry_run"""
+    current = load_latest_registry(directory)
+    fits = accumulate_outcomes(db, batch_size=batch_size)
+    profiles, calibration = {}, {}
+    for platform, weights in current.profiles.items():
+        profiles[platform], calibration[platform] = calibrated_weights(
+            weights, fits.get(platform), min_outcomes, prior_outcomes
+        )
+
+    payload = {
+        "version": latest_profile_version(directory) + 1,
+        "created_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "based_on_version": current.version,
+        "default_platform": current.default_platform,
+        "profiles": profiles,
+        "calibration": calibration,
+    }
+    if not dry_run:
+        payload["path"] = write_profile_version(directory, payload)
+    return payload
@@ -0,0 +1,325 @@
+"""
+Maintenance commands.
+
+Usage (from the backend directory):
+    python -m app.cli rebuild-index
+    python -m app.cli backfill-parsed
+    python -m app.cli backfill-jd-hashes
+    python -m app.cli rebuild-idf
+    python -m app.cli rebuild-outcome-rollups
+    python -m app.cli calibrate-profiles [--dry-run]
+    python -m app.cli set-platform-profile workday --keyword 0.6 --title 0.25 --recency 0.15
+    python -m app.cli compile resumes/ jds/ --output variants.jsonl
+"""
+import argparse
+import sys
+
+from . import models  # noqa: F401 - registers tables with Base
+from .config import settings
+from .db import Base, SessionLocal, engine
+
+
+def rebuild_index(args: argparse.Namespace) -> None:
+    """Rebuild the resume inverted index from stored resumes"""
+    from .resume_index import rebuild_resume_index
+
+    db = SessionLocal()
+    try:
+        count = rebuild_resume_index(db, batch_size=args.batch_size)
+    finally:
+        db.close()
+    print(f"Indexed {count} resumes")
+
+
+def rebuild_idf(args: argparse.Namespace) -> None:
+    """Recount JD keyword document frequencies from stored JDs"""
+    from .jd_idf import rebuild_document_frequencies
+
+    db = SessionLocal()
+    try:
+        count = rebuild_document_frequencies(db, batch_size=args.batch_size)
+    finally:
+        db.close()
+    print(f"Counted terms in {count} job descriptions")
+
+
+def rebuild_outcome_rollups(args: argparse.Namespace) -> None:
+    """Recount the outcome analytics rollups from stored outcomes"""
+    from .outcome_rollups import rebuild_outcome_rollups as rebuild
+
+    db = SessionLocal()
+    try:
+        count = rebuild(db, batch_size=args.batch_size)
+    finally:
+        db.close()
+    print(f"Counted {count} outcomes")
+
+
+def profiles_directory(args: argparse.Namespace) -> str:
+    directory = args.dir or settings.PLATFORM_PROFILES_DIR
+    if directory is None:
+        sys.exit("Set PLATFORM_PROFILES_DIR or pass --dir")
+    return directory
+
+
+def calibrate_profiles(args: argparse.Namespace) -> None:
+    """Fit platform weights to interview/rejected outcomes and write the next profile version"""
+    from .calibration import calibrate_profiles as calibrate
+
+    directory = profiles_directory(args)
+    db = SessionLocal()
+    try:
+        result = calibrate(
+            db,
+            directory,
+            min_outcomes=args.min_outcomes,
+            prior_outcomes=args.prior_outcomes,
+            batch_size=args.batch_size,
+            dry_run=args.dry_run
+        )
+    finally:
+        db.close()
+    for platform, weights in result["profiles"].items():
+        report = result["calibration"][platform]
+        status = f"blend {report['blend']:.2f}" if report["calibrated"] else f"unchanged ({report['reason']})"
+        print(
+            f"{platform:<10} {report['outcomes']:>9} outcomes  keyword {weights['keyword_weight']:.4f}"
+            f"  title {weights['title_weight']:.4f}  recency {weights['recency_weight']:.4f}  {status}"
+        )
+    if args.dry_run:
+        print(f"Dry run; would write profiles v{result['version']}")
+    else:
+        print(f"Wrote profiles v{result['version']} to {result['path']}")
+
+
+def backfill_parsed(args: argparse.Namespace) -> None:
+    """Build parsed_json for stored resumes whose parse is missing or stale"""
+    from sqlalchemy import select, update
+    from sqlalchemy.orm import Session
+
+    from .models import Resume
+    from .parsing import build_parsed_json, parsed_resume_is_current
+
+    db = SessionLocal()
+    scanned = updated = 0
+    try:
+        query = select(Resume.id, Resume.raw_text, Resume.parsed_json).execution_options(
+            yield_per=args.batch_size
+        )
+        for partition in db.execute(query).partitions():
+            rows = [
+                {"id": resume_id, "parsed_json": build_parsed_json(raw_text)}
+                for resume_id, raw_text, parsed_json in partition
+                if not parsed_resume_is_current(parsed_json)
+            ]
+            if rows:
+                with Session(bind=db.get_bind()) as writer:
+                    writer.execute(update(Resume), rows)
+                    writer.commit()
+            scanned += len(partition)
+            updated += len(rows)
+    finally:
+        db.close()
+    print(f"Updated {updated} of {scanned} resumes")
+
+
+def backfill_jd_hashes(args: argparse.Namespace) -> None:
+    """Set text_hash on JDs stored before bulk ingestion, so re-ingesting them is deduplicated"""
+    from sqlalchemy import select, update
+    from sqlalchemy.orm import Session
+
+    from .jd_extract import jd_text_hash
+    from .models import JobDescription
+
+    db = SessionLocal()
+    updated = 0
+    try:
+        query = select(JobDescription.id, JobDescription.raw_text).where(
+            JobDescription.text_hash.is_(None)
+        ).execution_options(yield_per=args.batch_size)
+        for partition in db.execute(query).partitions():
+            rows = [{"id": jd_id, "text_hash": jd_text_hash(raw_text)} for jd_id, raw_text in partition]
+            with Session(bind=db.get_bind()) as writer:
+                writer.execute(update(JobDescription), rows)
+                writer.commit()
+            updated += len(rows)
+    finally:
+        db.close()
+    print(f"Hashed {updated} job descriptions")
+
+
+def set_platform_profile(args: argparse.Namespace) -> None:
+    """Add, change or remove a platform and write the next profile version"""
+    from datetime import datetime, timezone
+    from .platform_profiles import WEIGHT_KEYS, latest_profile_version, load_latest_registry, write_profile_version
+
+    directory = profiles_directory(args)
+    try:
+        current = load_latest_registry(directory)
+    except (OSError, ValueError) as e:
+        sys.exit(f"Cannot read the latest profiles version: {e}")
+    profiles = {platform: dict(weights) for platform, weights in current.profiles.items()}
+    default_platform = current.default_platform
+    platform = args.platform.lower()
+
+    if args.remove:
+        if platform not in profiles:
+            sys.exit(f"{platform} is not a platform")
+        if platform == default_platform:
+            sys.exit(f"{platform} is the default platform; make another one the default first")
+        del profiles[platform]
+    else:
+        weights = profiles.setdefault(platform, {})
+        for key, value in (("keyword_weight", args.keyword), ("title_weight", args.title),
+                           ("recency_weight", args.recency)):
+            if value is not None:
+                weights[key] = value
+        if any(key not in weights for key in WEIGHT_KEYS):
+            sys.exit("New platforms need --keyword, --title and --recency")
+        if args.default:
+            default_platform = platform
+
+    payload = {
+        "version": latest_profile_version(directory) + 1,
+        "created_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "based_on_version": current.version,
+        "default_platform": default_platform,
+        "profiles": profiles,
+    }
+    try:
+        path = write_profile_version(directory, payload)
+    except ValueError as e:
+        sys.exit(str(e))
+    print(f"Wrote profiles v{payload['version']} to {path}: {', '.join(profiles)}")
+
+
+def load_document_frequencies() -> None:
+    """Rank JD keywords against the stored corpus, as the API does, when the database is reachable"""
+    from sqlalchemy.exc import SQLAlchemyError
+    from .jd_idf import refresh_document_frequencies
+
+    db = SessionLocal()
+    try:
+        refresh_document_frequencies(db)
+    except SQLAlchemyError as e:
+        print(
+            f"Could not load JD term frequencies ({e.__class__.__name__}); keywords are ranked without "
+            "the stored corpus, so scores may differ from the API's",
+            file=sys.stderr
+        )
+    finally:
+        db.close()
+
+
+def compile_directories(args: argparse.Namespace) -> None:
+    """Compile and score every resume x JD in two directories without the HTTP server"""
+    from .offline_compile import PERSONAS, OfflineCompileOptions, run_offline_compile
+    from .platform_profiles import platform_names
+
+    if (args.output is None) == (not args.db):
+        sys.exit("Pass either --output FILE or --db")
+    options = OfflineCompileOptions(
+        resume_dir=args.resumes,
+        jd_dir=args.jds,
+        personas=args.personas or list(PERSONAS),
+        platforms=args.platforms or list(platform_names()),
+        output=args.output,
+        output_format=args.format,
+        checkpoint=args.checkpoint,
+        chunk_size=args.chunk_size,
+        workers=args.workers,
+        scores_only=args.scores_only,
+        user_id=args.user_id,
+        jd_platform=args.jd_platform,
+        restart=args.restart
+    )
+    db = SessionLocal() if args.db else None
+    if db is None:
+        load_document_frequencies()
+    try:
+        result = run_offline_compile(options, db=db, progress=not args.quiet)
+    except ValueError as e:
+        sys.exit(str(e))
+    except KeyboardInterrupt:
+        sys.exit("Interrupted; run the same command again to resume")
+    finally:
+        if db is not None:
+            db.close()
+    for failure in result["failed"]:
+        print(f"Skipped {failure['kind']} {failure['name']}: {failure['error']}", file=sys.stderr)
+    print(
+        f"Compiled {result['resumes']} resumes x {result['jds']} JDs: {result['variants']} variants "
+        f"compiled in {result['seconds']:.1f}s ({result['chunks_resumed']}/{result['chunks']} chunks "
+        f"done before this run; checkpoint {result['checkpoint']})"
+    )
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(prog="python -m app.cli", description=__doc__.strip().splitlines()[0])
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    index_parser = subparsers.add_parser("rebuild-index", help=rebuild_index.__doc__)
+    index_parser.add_argument("--batch-size", type=int, default=500)
+    index_parser.set_defaults(func=rebuild_index)
+
+    backfill_parser = subparsers.add_parser("backfill-parsed", help=backfill_parsed.__doc__)
+    backfill_parser.add_argument("--batch-size", type=int, default=500)
+    backfill_parser.set_defaults(func=backfill_parsed)
+
+    hashes_parser = subparsers.add_parser("backfill-jd-hashes", help=backfill_jd_hashes.__doc__)
+    hashes_parser.add_argument("--batch-size", type=int, default=500)
+    hashes_parser.set_defaults(func=backfill_jd_hashes)
+
+    idf_parser = subparsers.add_parser("rebuild-idf", help=rebuild_idf.__doc__)
+    idf_parser.add_argument("--batch-size", type=int, default=500)
+    idf_parser.set_defaults(func=rebuild_idf)
+
+    rollups_parser = subparsers.add_parser("rebuild-outcome-rollups", help=rebuild_outcome_rollups.__doc__)
+    rollups_parser.add_argument("--batch-size", type=int, default=5000)
+    rollups_parser.set_defaults(func=rebuild_outcome_rollups)
+
+    calibrate_parser = subparsers.add_parser("calibrate-profiles", help=calibrate_profiles.__doc__)
+    calibrate_parser.add_argument("--dir", help="Profiles directory (default: PLATFORM_PROFILES_DIR)")
+    calibrate_parser.add_argument("--batch-size", type=int, default=10000)
+    calibrate_parser.add_argument("--min-outcomes", type=int, default=settings.CALIBRATION_MIN_OUTCOMES)
+    calibrate_parser.add_argument("--prior-outcomes", type=int, default=settings.CALIBRATION_PRIOR_OUTCOMES)
+    calibrate_parser.add_argument("--dry-run", action="store_true", help="Print the weights without writing them")
+    calibrate_parser.set_defaults(func=calibrate_profiles)
+
+    platform_parser = subparsers.add_parser("set-platform-profile", help=set_platform_profile.__doc__)
+    platform_parser.add_argument("platform")
+    platform_parser.add_argument("--dir", help="Profiles directory (default: PLATFORM_PROFILES_DIR)")
+    platform_parser.add_argument("--keyword", type=float, help="Keyword weight")
+    platform_parser.add_argument("--title", type=float, help="Title weight")
+    platform_parser.add_argument("--recency", type=float, help="Recency weight")
+    platform_parser.add_argument("--default", action="store_true", help="Score unknown platforms with this one")
+    platform_parser.add_argument("--remove", action="store_true", help="Remove the platform")
+    platform_parser.set_defaults(func=set_platform_profile)
+
+    compile_parser = subparsers.add_parser("compile", help=compile_directories.__doc__)
+    compile_parser.add_argument("resumes", help="Directory of PDF, DOCX and TXT resumes")
+    compile_parser.add_argument("jds", help="Directory of PDF, DOCX and TXT job descriptions")
+    compile_parser.add_argument("--output", help="JSONL or CSV file to write variants and scores to")
+    compile_parser.add_argument("--db", action="store_true", help="Store resumes, JDs and variants in the database")
+    compile_parser.add_argument("--format", choices=["jsonl", "csv"], help="Output format (default: from --output)")
+    compile_parser.add_argument("--checkpoint", help="Checkpoint file (default: OUTPUT.checkpoint; required with --db)")
+    compile_parser.add_argument("--personas", nargs="+", help="Personas (default: all)")
+    compile_parser.add_argument("--platforms", nargs="+", help="Platforms (default: all in the registry)")
+    compile_parser.add_argument("--chunk-size", type=int, default=25, help="JDs per scheduled chunk")
+    compile_parser.add_argument("--workers", type=int, help="Processes (default: BATCH_MAX_WORKERS or one per CPU)")
+    compile_parser.add_argument("--scores-only", action="store_true", help="Write scores without compiled text")
+    compile_parser.add_argument("--user-id", default="batch", help="Owner of resumes stored with --db")
+    compile_parser.add_argument("--jd-platform", help="Platform of JDs stored with --db (default: the default platform)")
+    compile_parser.add_argument("--restart", action="store_true", help="Ignore an existing checkpoint and output")
+    compile_parser.add_argument("--quiet", action="store_true", help="No progress lines")
+    compile_parser.set_defaults(func=compile_directories)
+
+    args = parser.parse_args(argv)
+    # Writing profile files, or compiling to a file, works without a database
+    if args.func is not set_platform_profile and getattr(args, "db", True):
+        Base.metadata.create_all(bind=engine)
+    args.func(args)
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
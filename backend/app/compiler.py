@@ -1,57 +1,62 @@
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional
 import re
 from .jd_extract import extract_jd_signals
 from .platform_profiles import get_platform_profile
+from .matcher import get_keyword_matcher
+
+# Bump when compiled output changes, so stored variants are not reused
+# for new compiles (see variant_store.variant_input_hash)
+COMPILER_VERSION = 1
+
+# Header terms per section, in priority order: a line naming terms from
+# several sections belongs to the first one listed
+SECTION_HEADERS = {
+    "summary": ["summary", "profile", "objective", "overview"],
+    "skills": ["skills", "technical skills", "competencies"],
+    "experience": ["experience", "work history", "employment", "professional experience"],
+    "education": ["education", "academic", "qualifications"],
+}
+
+# Any header term; only lines it finds need classifying
+_SECTION_TERM_RE = re.compile("|".join(
+    re.escape(term) for terms in SECTION_HEADERS.values() for term in terms
+))
+
+
+def _classify_header(line_lower: str) -> Optional[str]:
+    """Section whose header terms the line names first in priority order, or None"""
+    if not _SECTION_TERM_RE.search(line_lower):
+        return None
+    for section, terms in SECTION_HEADERS.items():
+        if any(term in line_lower for term in terms):
+            return section
+    return None
 
 
 def extract_resume_sections(resume_text: str) -> Dict[str, str]:
     """Extract basic sections from resume text"""
-    sections = {
-        "summary": "",
-        "skills": "",
-        "experience": "",
-        "education": ""
-    }
-    
-    # Simple section detection (can be enhanced)
-    text_lower = resume_text.lower()
-    
-    # Look for common section headers
-    summary_patterns = [r'summary', r'profile', r'objective', r'overview']
-    skills_patterns = [r'skills', r'technical skills', r'competencies']
-    experience_patterns = [r'experience', r'work history', r'employment', r'professional experience']
-    education_patterns = [r'education', r'academic', r'qualifications']
+    section_lines: Dict[str, List[str]] = {section: [] for section in SECTION_HEADERS}
+    current_lines = None
     
+    # Lowercasing never adds or removes newlines, so lines pair up
     lines = resume_text.split('\n')
-    current_section = None
-    
-    for i, line in enumerate(lines):
-        line_lower = line.lower().strip()
-        
-        if any(re.search(pattern, line_lower) for pattern in summary_patterns):
-            current_section = "summary"
-        elif any(re.search(pattern, line_lower) for pattern in skills_patterns):
-            current_section = "skills"
-        elif any(re.search(pattern, line_lower) for pattern in experience_patterns):
-            current_section = "experience"
-        elif any(re.search(pattern, line_lower) for pattern in education_patterns):
-            current_section = "education"
-        elif current_section and line.strip():
-            sections[current_section] += line + "\n"
-    
-    return sections
+    for line, line_lower in zip(lines, resume_text.lower().split('\n')):
+        section = _classify_header(line_lower)
+        if section is not None:
+            current_lines = section_lines[section]
+        elif current_lines is not None and line.strip():
+            current_lines.append(line)
+    
+    return {
+        section: "".join(line + "\n" for line in kept)
+        for section, kept in section_lines.items()
+    }
 
 
 def find_matching_skills(resume_text: str, jd_keywords: List[str]) -> List[str]:
-    """Find skills in resume that match JD keywords"""
-    resume_lower = resume_text.lower()
-    matching = []
-    
-    for keyword in jd_keywords:
-        if keyword.lower() in resume_lower:
-            matching.append(keyword)
-    
-    return matching
+    """Find skills in resume that match JD keywords (whole words only)"""
+    found = get_keyword_matcher(jd_keywords).scan(resume_text)
+    return [keyword for keyword in jd_keywords if keyword.lower() in found]
 
 
 def create_persona_summary(persona: str, resume_sections: Dict[str, str], jd_signals: Dict[str, Any]) -> str:
@@ -78,7 +83,10 @@ def compile_resume_variant(
     resume_text: str,
     jd_text: str,
     persona: str,
-    platform: str
+    platform: str,
+    jd_signals: Optional[Dict[str, Any]] = None,
+    resume_sections: Optional[Dict[str, str]] = None,
+    matching_skills: Optional[List[str]] = None
 ) -> str:
     """
     Compile ATS-optimized resume variant.
@@ -87,16 +95,25 @@ def compile_resume_variant(
     - Never invent skills
     - Only reuse content already present
     - Emphasize JD-matching terms only if found in resume
+    
+    Pass jd_signals when they are already known (e.g. stored on the
+    JobDescription row) to skip re-extracting them from jd_text, and
+    resume_sections when compiling the same resume many times. Callers
+    compiling several variants of one resume and JD pass the
+    find_matching_skills result too, so the resume is scanned once.
     """
     # Extract JD signals
-    jd_signals = extract_jd_signals(jd_text)
+    if jd_signals is None:
+        jd_signals = extract_jd_signals(jd_text)
     jd_keywords = jd_signals.get("top_terms", [])
     
     # Extract resume sections
-    resume_sections = extract_resume_sections(resume_text)
+    if resume_sections is None:
+        resume_sections = extract_resume_sections(resume_text)
     
     # Find matching skills
-    matching_skills = find_matching_skills(resume_text, jd_keywords)
+    if matching_skills is None:
+        matching_skills = find_matching_skills(resume_text, jd_keywords)
     
     # Create persona-based summary
     summary = create_persona_summary(persona, resume_sections, jd_signals)
@@ -0,0 +1,228 @@
+"""
+Eager compilation: precompute variants when a JD is created.
+
+With EAGER_COMPILE enabled, creating a JD for a user queues every
+persona x platform variant of their most recent resumes. Each resume/JD
+pair is one task: a thread does the database work and the compile runs
+in a bounded process pool, so precompiling never blocks the event loop.
+/variants/compile then finds the stored variant by its input hash instead
+of compiling again.
+
+in_flight is the deduplication guard. Whoever compiles a variant, the
+eager worker or a request, first claims its key; anyone else asking for
+the same key while it is claimed waits for that compile instead of
+repeating it. The guard is per process, so separate API processes can
+still compile the same variant once each.
+"""
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Dict, List, Optional, Tuple
+import logging
+import multiprocessing
+import threading
+import uuid
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from .batch import compile_for_jd
+from .config import settings
+from .db import SessionLocal
+from .jd_extract import extract_jd_signals, signals_are_current
+from .metrics import timed
+from .models import JobDescription, Resume, ResumeVariant
+from .parsing import build_parsed_json, parsed_resume_is_current
+from .variant_store import insert_variants, store_compiled_texts, variant_input_hash
+
+logger = logging.getLogger(__name__)
+
+# (resume_id, jd_id, persona, platform)
+VariantKey = Tuple[uuid.UUID, uuid.UUID, str, str]
+
+
+class InFlightVariants:
+    """Variant keys being compiled in this process, each with a future for the stored variant's id"""
+
+    def __init__(self):
+        self._futures: Dict[VariantKey, Future] = {}
+        self._lock = threading.Lock()
+
+    def claim(self, key: VariantKey) -> Tuple[Future, bool]:
+        """
+        Return the key's future and whether the caller now owns the compile.
+
+        An owner must call finish(); everyone else waits on the future.
+        """
+        with self._lock:
+            future = self._futures.get(key)
+            if future is not None:
+                return future, False
+            future = self._futures[key] = Future()
+            return future, True
+
+    def finish(self, key: VariantKey, variant_id: Optional[uuid.UUID]) -> None:
+        """Release a claimed key; variant_id None tells waiters the compile failed"""
+        with self._lock:
+            future = self._futures.pop(key)
+        future.set_result(variant_id)
+
+    def __len__(self) -> int:
+        return len(self._futures)
+
+
+in_flight = InFlightVariants()
+
+
+def stored_variant_ids(
+    db: Session,
+    resume_id: uuid.UUID,
+    jd_id: uuid.UUID,
+    input_hashes: List[str]
+) -> Dict[str, uuid.UUID]:
+    """Stored variant id by input hash, among a resume and JD's variants compiled from input_hashes"""
+    rows = db.execute(
+        select(ResumeVariant.input_hash, ResumeVariant.id)
+        .where(
+            ResumeVariant.resume_id == resume_id,
+            ResumeVariant.jd_id == jd_id,
+            ResumeVariant.input_hash.in_(input_hashes)
+        )
+    )
+    return {input_hash: variant_id for input_hash, variant_id in rows}
+
+
+def materialize_variants(
+    resume_id: uuid.UUID,
+    jd_id: uuid.UUID,
+    personas: List[str],
+    platforms: List[str],
+    pool: Optional[ProcessPoolExecutor] = None
+) -> int:
+    """Compile and store the pair's variants that are neither stored nor being compiled; returns how many"""
+    owned = {}
+    for persona in personas:
+        for platform in platforms:
+            key = (resume_id, jd_id, persona, platform)
+            future, owner = in_flight.claim(key)
+            if owner:
+                owned[(persona, platform)] = key
+    if not owned:
+        return 0
+
+    variant_ids: Dict[Tuple[str, str], uuid.UUID] = {}
+    db = SessionLocal()
+    try:
+        resume = db.get(Resume, resume_id)
+        jd = db.get(JobDescription, jd_id)
+        if resume is None or jd is None:
+            return 0
+
+        # The signals are part of the input hash, so they are refreshed first
+        if not signals_are_current(jd.extracted_signals):
+            jd.extracted_signals = extract_jd_signals(jd.raw_text)
+
+        # Claimed before looking, so a variant committed after this query can't be compiled twice
+        input_hashes = {
+            pair: variant_input_hash(resume.raw_text, jd.raw_text, *pair, jd.extracted_signals)
+            for pair in owned
+        }
+        stored = stored_variant_ids(db, resume_id, jd_id, list(input_hashes.values()))
+        variant_ids.update({
+            pair: stored[input_hash] for pair, input_hash in input_hashes.items() if input_hash in stored
+        })
+        missing = [pair for pair in owned if pair not in variant_ids]
+        if not missing:
+            return 0
+
+        if not parsed_resume_is_current(resume.parsed_json):
+            resume.parsed_json = build_parsed_json(resume.raw_text)
+
+        # compile_for_jd covers a full persona x platform grid; keep only the missing pairs
+        grid = (
+            list(dict.fromkeys(persona for persona, _ in missing)),
+            list(dict.fromkeys(platform for _, platform in missing))
+        )
+        args = (resume.raw_text, resume.parsed_json, (jd_id, jd.raw_text, jd.extracted_signals), *grid)
+        with timed("compile", "eager"):
+            if pool is not None:
+                results = pool.submit(compile_for_jd, *args).result()
+            else:
+                results = compile_for_jd(*args)
+        results = [result for result in results if (result["persona"], result["platform"]) in missing]
+
+        text_hashes = store_compiled_texts(db, [result["compiled_text"] for result in results])
+        rows = [
+            {
+                "id": uuid.uuid4(),
+                "resume_id": resume_id,
+                "jd_id": jd_id,
+                "persona": result["persona"],
+                "platform": result["platform"],
+                "text_hash": digest,
+                "input_hash": input_hashes[(result["persona"], result["platform"])],
+                "scores": result["scores"],
+            }
+            for result, digest in zip(results, text_hashes)
+        ]
+        insert_variants(db, rows)
+        # Looked up again in case another process stored some of them first
+        stored = stored_variant_ids(db, resume_id, jd_id, [row["input_hash"] for row in rows])
+        db.commit()
+        variant_ids.update({
+            pair: stored[input_hash] for pair, input_hash in input_hashes.items() if input_hash in stored
+        })
+        return len(rows)
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        db.close()
+        for pair, key in owned.items():
+            in_flight.finish(key, variant_ids.get(pair))
+
+
+def _log_task_failure(future: Future) -> None:
+    if future.exception() is not None:
+        logger.error("Eager compile task failed", exc_info=future.exception())
+
+
+class EagerCompiler:
+    """Runs eager compile tasks: bookkeeping on threads, compiling in a process pool"""
+
+    def __init__(self, workers: int):
+        # Spawned compilers don't inherit the API's threads or DB connections
+        self._processes = ProcessPoolExecutor(
+            max_workers=workers,
+            mp_context=multiprocessing.get_context("spawn")
+        )
+        self._threads = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="eager-compile")
+
+    def submit(self, resume_id: uuid.UUID, jd_id: uuid.UUID, personas: List[str], platforms: List[str]) -> Future:
+        future = self._threads.submit(materialize_variants, resume_id, jd_id, personas, platforms, self._processes)
+        future.add_done_callback(_log_task_failure)
+        return future
+
+    def shutdown(self, wait: bool = True) -> None:
+        self._threads.shutdown(wait=wait, cancel_futures=not wait)
+        self._processes.shutdown(wait=wait)
+
+
+_eager_compiler: Optional[EagerCompiler] = None
+_eager_compiler_lock = threading.Lock()
+
+
+def get_eager_compiler() -> EagerCompiler:
+    """Return the process's eager compiler, starting it on first use"""
+    global _eager_compiler
+    with _eager_compiler_lock:
+        if _eager_compiler is None:
+            _eager_compiler = EagerCompiler(settings.EAGER_COMPILE_WORKERS)
+        return _eager_compiler
+
+
+def shutdown_eager_compiler() -> None:
+    """Stop the eager compiler if it was started; queued tasks are dropped"""
+    global _eager_compiler
+    with _eager_compiler_lock:
+        if _eager_compiler is not None:
+            _eager_compiler.shutdown(wait=False)
+            _eager_compiler = None
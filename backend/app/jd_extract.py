@@ -1,79 +1,287 @@
+import hashlib
 import json
+import math
+import os
 import re
-from typing import Dict, Any, List
+import threading
+from typing import Dict, Any, FrozenSet, Iterable, List, Optional, Tuple
 from collections import Counter
+from operator import itemgetter
 from .config import settings
 
+# Bump whenever the output of extract_jd_signals changes. Stored
+# JobDescription.extracted_signals rows carrying an older version are
+# recomputed lazily the next time they are used.
+SIGNALS_VERSION = 3
 
-def extract_keywords(text: str, top_n: int = 20) -> List[str]:
-    """Extract top keywords from job description"""
-    # Common technical terms (can be expanded)
-    tech_terms = [
-        'azure', 'aws', 'gcp', 'terraform', 'kubernetes', 'docker',
-        'python', 'java', 'javascript', 'typescript', 'react', 'node',
-        'sql', 'postgresql', 'mongodb', 'redis', 'elasticsearch',
-        'ci/cd', 'jenkins', 'gitlab', 'github', 'agile', 'scrum',
-        'microservices', 'api', 'rest', 'graphql', 'grpc',
-        'linux', 'bash', 'shell', 'ansible', 'puppet', 'chef',
-        'bgp', 'ospf', 'networking', 'security', 'firewall',
-        'ml', 'machine learning', 'ai', 'data science', 'analytics'
+TECH_TERMS_PATH = os.path.join(os.path.dirname(__file__), "data", "tech_terms.txt")
+
+# A word plus the non-letters up to the next word, in one findall
+_WORD_GAP_RE = re.compile(r'\b([a-z]+)\b([^a-z]*)')
+
+_WHITESPACE_RE = re.compile(r'\s+')
+
+
+def normalize_jd_text(raw_text: str) -> str:
+    """Lowercase and collapse whitespace, so reformatted copies of a posting compare equal"""
+    return _WHITESPACE_RE.sub(' ', raw_text.lower()).strip()
+
+
+def jd_text_hash(raw_text: str) -> str:
+    """SHA-256 of the normalized JD text, used to dedupe postings"""
+    return hashlib.sha256(normalize_jd_text(raw_text).encode("utf-8")).hexdigest()
+
+
+def _normalize_gap(gap: str) -> str:
+    """Any run of whitespace separates phrase words like a single space"""
+    return gap.strip() or (" " if gap else "")
+
+
+def load_tech_terms(path: str = TECH_TERMS_PATH) -> Tuple[FrozenSet[str], Dict[str, dict]]:
+    """
+    Read the term vocabulary, returning every term plus a trie of the
+    multi-word ones. The trie is keyed by first word, then by
+    (separator, next word); a "" key marks the end of a term.
+    """
+    with open(path, encoding="utf-8") as terms_file:
+        terms = [
+            line.strip().lower() for line in terms_file
+            if line.strip() and not line.lstrip().startswith("#")
+        ]
+    
+    phrases: Dict[str, dict] = {}
+    for term in terms:
+        words = _WORD_GAP_RE.findall(term)
+        if not re.fullmatch(r'[a-z](.*[a-z])?', term) or "".join(w + g for w, g in words) != term:
+            raise ValueError(f"Invalid term {term!r} in {path}: terms must start and end with a letter")
+        if len(words) < 2:
+            continue
+        node = phrases.setdefault(words[0][0], {})
+        for (_, gap), (word, _) in zip(words, words[1:]):
+            node = node.setdefault((_normalize_gap(gap), word), {})
+        node[""] = term
+    
+    return frozenset(terms), phrases
+
+
+def _phrase_pattern(node: Dict[Any, dict]) -> str:
+    """Regex for the rest of the phrases below a trie node, longest first"""
+    branches = []
+    for key, child in sorted((k, v) for k, v in node.items() if k):
+        separator, word = key
+        separator_re = r'\s+' if separator == " " else r'\s*' + re.escape(separator) + r'\s*'
+        rest = _phrase_pattern(child)
+        if rest:
+            rest = f"(?:{rest})?" if "" in child else rest
+        branches.append(separator_re + re.escape(word) + rest)
+    return "|".join(branches)
+
+
+def _build_term_regex(phrases: Dict[str, dict]) -> "re.Pattern[str]":
+    """A word, or a whole multi-word term where one occurs, per match"""
+    alternatives = [
+        re.escape(word) + f"(?:{_phrase_pattern(node)})"
+        for word, node in sorted(phrases.items())
     ]
+    return re.compile(r'\b(?:' + "|".join(alternatives + ['[a-z]+']) + r')\b')
+
+
+TECH_TERMS, _PHRASE_TRIE = load_tech_terms()
+_TERM_RE = _build_term_regex(_PHRASE_TRIE)
+
+
+def _canonical_phrase(matched: str) -> str:
+    """Map a phrase as written ("CI / CD", "machine\\nlearning") to its term"""
+    return "".join(word + _normalize_gap(gap) for word, gap in _WORD_GAP_RE.findall(matched))
+
+
+def count_terms(text: str) -> Counter:
+    """
+    Count the words in text, with each multi-word tech term occurrence
+    ("machine learning", "ci/cd") counted as one term in place of its
+    words. Words and phrases come from a single regex pass; keys keep
+    first-occurrence order.
+    """
+    return _count_lowered_terms(text.lower())
+
+
+def _count_lowered_terms(text_lower: str) -> Counter:
+    counts = Counter(_TERM_RE.findall(text_lower))
+    # Phrases are usually written the way the vocabulary spells them
+    if all(key in TECH_TERMS for key in counts if not key.isalpha()):
+        return counts
     
-    text_lower = text.lower()
-    words = re.findall(r'\b[a-z]+\b', text_lower)
+    merged: Counter = Counter()
+    for key, count in counts.items():
+        merged[key if key.isalpha() else _canonical_phrase(key)] += count
+    return merged
+
+
+def is_keyword_candidate(term: str) -> bool:
+    """Tech terms and longer words can be keywords"""
+    return term in TECH_TERMS or len(term) > 4
+
+
+class DocumentFrequencies:
+    """
+    In-memory snapshot of how many stored JDs contain each keyword
+    candidate, used to weight keywords by inverse document frequency.
+    Filled and kept current by jd_idf; reads never touch the database.
     
-    # Count occurrences
-    word_counts = Counter(words)
+    Alongside each count it keeps log(1 + count), so an IDF is one dict
+    lookup and a subtraction, and an insert only updates the terms it
+    touches.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.documents = 0
+        self._df: Dict[str, int] = {}
+        self._log_df: Dict[str, float] = {}
+        self._log_documents = 0.0
+
+    def __len__(self) -> int:
+        return len(self._df)
+
+    def replace(self, documents: int, df: Dict[str, int]) -> None:
+        """Swap in a full snapshot"""
+        log_df = {term: math.log1p(count) for term, count in df.items()}
+        with self._lock:
+            self.documents = documents
+            self._df = dict(df)
+            self._log_df = log_df
+            self._log_documents = math.log1p(documents)
+
+    def add_documents(self, documents: int, df: Dict[str, int]) -> None:
+        """Count newly stored JDs, given the number of them containing each term"""
+        with self._lock:
+            self.documents += documents
+            self._log_documents = math.log1p(self.documents)
+            for term, count in df.items():
+                count += self._df.get(term, 0)
+                self._df[term] = count
+                self._log_df[term] = math.log1p(count)
+
+    def state(self) -> Tuple[int, Dict[str, int]]:
+        """Snapshot contents, e.g. to hand to worker processes"""
+        with self._lock:
+            return self.documents, dict(self._df)
+
+    def is_ready(self) -> bool:
+        return self.documents >= settings.IDF_MIN_DOCUMENTS
+
+    def idf(self, term: str) -> float:
+        """Smoothed inverse document frequency, log((1 + N) / (1 + df)) + 1"""
+        return self._log_documents - self._log_df.get(term, 0.0) + 1
+
+    def idf_weights(self) -> Tuple[float, Dict[str, float]]:
+        """
+        (log(1 + N) + 1, {term: log(1 + df)}): a term's IDF is the first
+        minus its entry, or 0. For hot loops; the dict must not be modified.
+        """
+        return self._log_documents + 1, self._log_df
+
+
+document_frequencies = DocumentFrequencies()
+
+
+def document_terms(text: str) -> List[str]:
+    """The distinct keyword candidates in a JD, as counted for document frequency"""
+    return _candidate_terms(count_terms(text))
+
+
+def _candidate_terms(counts: Counter) -> List[str]:
+    return sorted(term for term in counts if is_keyword_candidate(term))
+
+
+def extract_keywords(
+    text: str,
+    top_n: int = 20,
+    frequencies: Optional[DocumentFrequencies] = None
+) -> List[str]:
+    """Extract top keywords from job description
     
-    # Filter for tech terms and common important words
-    important_words = []
-    for word in word_counts.most_common(100):
-        if word[0] in tech_terms or len(word[0]) > 4:
-            important_words.append(word[0])
+    Keywords are ranked by TF-IDF against the stored JD corpus, so words
+    every posting uses ("experience", "ability") sink below the terms
+    that set this one apart. Until the corpus has IDF_MIN_DOCUMENTS JDs,
+    they are ranked by raw frequency.
+    """
+    return _rank_keywords(count_terms(text), top_n, frequencies or document_frequencies)
+
+
+def _rank_keywords(counts: Counter, top_n: int, frequencies: DocumentFrequencies) -> List[str]:
+    if not frequencies.is_ready():
+        # Filter for tech terms and common important words
+        return [
+            word for word, _ in counts.most_common(100)
+            if is_keyword_candidate(word)
+        ][:top_n]
     
-    return important_words[:top_n]
+    base, log_df = frequencies.idf_weights()
+    candidates = [
+        (count * (base - log_df.get(word, 0.0)), word) for word, count in counts.items()
+        if is_keyword_candidate(word)
+    ]
+    # Stable sort: equal scores keep first-occurrence order
+    candidates.sort(key=itemgetter(0), reverse=True)
+    return [word for _, word in candidates[:top_n]]
+
+
+# Seniority levels in priority order: the first level with an indicator wins
+SENIORITY_INDICATORS = (
+    ("senior", ['senior', 'sr.', 'lead', 'principal', 'architect', 'staff', 'expert']),
+    ("mid", ['mid-level', 'mid level', 'intermediate', 'experienced']),
+    ("junior", ['junior', 'jr.', 'entry', 'associate', 'intern']),
+)
+HANDS_ON_TERMS = [
+    'hands-on', 'hands on', 'hands-on experience', 'coding', 'development',
+    'implement', 'build', 'develop', 'write code', 'programming'
+]
+FAST_PACED_TERMS = [
+    'fast-paced', 'fast paced', 'fast-moving', 'dynamic', 'startup',
+    'rapid growth', 'high growth', 'move fast'
+]
+
+
+def _minimal_terms(terms: Iterable[str]) -> Tuple[str, ...]:
+    """
+    Drop terms containing another term of the list ("hands-on experience"
+    holds "hands-on"): wherever they occur the shorter term does too, so
+    scanning for them never changes whether any term is present.
+    """
+    terms = list(terms)
+    return tuple(term for term in terms if not any(other != term and other in term for other in terms))
+
+
+_SENIORITY_SCANS = tuple((level, _minimal_terms(terms)) for level, terms in SENIORITY_INDICATORS)
+_HANDS_ON_SCANS = _minimal_terms(HANDS_ON_TERMS)
+_FAST_PACED_SCANS = _minimal_terms(FAST_PACED_TERMS)
+
+
+def _contains_any(text_lower: str, terms: Tuple[str, ...]) -> bool:
+    return any(term in text_lower for term in terms)
+
+
+def _detect_seniority(text_lower: str) -> str:
+    for level, terms in _SENIORITY_SCANS:
+        if _contains_any(text_lower, terms):
+            return level
+    return "unspecified"
 
 
 def detect_seniority(text: str) -> str:
     """Detect seniority level from job description"""
-    text_lower = text.lower()
-    
-    senior_indicators = ['senior', 'sr.', 'lead', 'principal', 'architect', 'staff', 'expert']
-    mid_indicators = ['mid-level', 'mid level', 'intermediate', 'experienced']
-    junior_indicators = ['junior', 'jr.', 'entry', 'associate', 'intern']
-    
-    senior_count = sum(1 for term in senior_indicators if term in text_lower)
-    mid_count = sum(1 for term in mid_indicators if term in text_lower)
-    junior_count = sum(1 for term in junior_indicators if term in text_lower)
-    
-    if senior_count > 0:
-        return "senior"
-    elif mid_count > 0:
-        return "mid"
-    elif junior_count > 0:
-        return "junior"
-    else:
-        return "unspecified"
+    return _detect_seniority(text.lower())
 
 
 def detect_hands_on_bias(text: str) -> bool:
     """Detect if job description emphasizes hands-on work"""
-    text_lower = text.lower()
-    hands_on_terms = [
-        'hands-on', 'hands on', 'hands-on experience', 'coding', 'development',
-        'implement', 'build', 'develop', 'write code', 'programming'
-    ]
-    return any(term in text_lower for term in hands_on_terms)
+    return _contains_any(text.lower(), _HANDS_ON_SCANS)
 
 
 def detect_fast_paced(text: str) -> bool:
     """Detect if job description mentions fast-paced environment"""
-    text_lower = text.lower()
-    fast_paced_terms = [
-        'fast-paced', 'fast paced', 'fast-moving', 'dynamic', 'startup',
-        'rapid growth', 'high growth', 'move fast'
-    ]
-    return any(term in text_lower for term in fast_paced_terms)
+    return _contains_any(text.lower(), _FAST_PACED_SCANS)
 
 
 def extract_jd_signals(raw_text: str) -> Dict[str, Any]:
@@ -81,16 +289,32 @@ def extract_jd_signals(raw_text: str) -> Dict[str, Any]:
     Extract intelligence signals from job description.
     Returns structured JSON with keywords, seniority, and bias flags.
     """
-    top_terms = extract_keywords(raw_text)
-    seniority = detect_seniority(raw_text)
-    hands_on = detect_hands_on_bias(raw_text)
-    fast_paced = detect_fast_paced(raw_text)
-    
-    return {
-        "top_terms": top_terms,
-        "seniority": seniority,
+    return _extract_signals(raw_text.lower())[0]
+
+
+def extract_jd_signals_and_terms(raw_text: str) -> Tuple[Dict[str, Any], List[str]]:
+    """extract_jd_signals and document_terms from a single pass over the text"""
+    signals, counts = _extract_signals(raw_text.lower())
+    return signals, _candidate_terms(counts)
+
+
+def _extract_signals(text_lower: str) -> Tuple[Dict[str, Any], Counter]:
+    # One lowercased copy serves every detector. Substring scans stop at
+    # the first indicator found, and lower seniority levels are only
+    # scanned when no higher level matched.
+    counts = _count_lowered_terms(text_lower)
+    signals = {
+        "version": SIGNALS_VERSION,
+        "top_terms": _rank_keywords(counts, 20, document_frequencies),
+        "seniority": _detect_seniority(text_lower),
         "signals": {
-            "hands_on": hands_on,
-            "fast_paced": fast_paced
+            "hands_on": _contains_any(text_lower, _HANDS_ON_SCANS),
+            "fast_paced": _contains_any(text_lower, _FAST_PACED_SCANS)
         }
     }
+    return signals, counts
+
+
+def signals_are_current(signals: Optional[Dict[str, Any]]) -> bool:
+    """Check whether stored signals were produced by the current extractor"""
+    return bool(signals) and signals.get("version") == SIGNALS_VERSION
@@ -0,0 +1,92 @@
+"""
+Corpus document frequencies for JD keyword ranking.
+
+The jd_term_frequencies table counts, for each keyword candidate, how many
+stored JDs contain it; the row for the empty term counts the JDs. Inserts
+bump the counts in the same transaction as the JDs. The API mirrors the
+table in jd_extract.document_frequencies, reloading it every
+IDF_REFRESH_SECONDS to pick up other workers' inserts.
+"""
+from collections import Counter
+from typing import Dict, Iterable, List
+
+from sqlalchemy import select
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session
+
+from .jd_extract import document_frequencies, document_terms
+from .models import JDTermFrequency, JobDescription
+
+# Term of the row holding the number of JDs counted
+DOCUMENTS_TERM = ""
+
+_UPSERTS = {"postgresql": postgresql.insert, "sqlite": sqlite.insert}
+
+
+def count_document_terms(term_lists: Iterable[List[str]]) -> Dict[str, int]:
+    """
+    Number of JDs containing each term, given each JD's document_terms,
+    plus the JD count under DOCUMENTS_TERM
+    """
+    counts: Counter = Counter()
+    documents = 0
+    for terms in term_lists:
+        counts.update(terms)
+        documents += 1
+    if documents:
+        counts[DOCUMENTS_TERM] = documents
+    return counts
+
+
+def _add_counts(db: Session, counts: Dict[str, int]) -> None:
+    if not counts:
+        return
+    upsert = _UPSERTS[db.get_bind().dialect.name](JDTermFrequency)
+    table = JDTermFrequency.__table__
+    statement = upsert.on_conflict_do_update(
+        index_elements=[table.c.term],
+        set_={"document_count": table.c.document_count + upsert.excluded.document_count}
+    )
+    # Sorted so concurrent writers lock rows in the same order
+    rows = [{"term": term, "document_count": count} for term, count in sorted(counts.items())]
+    for start in range(0, len(rows), 1000):
+        db.execute(statement, rows[start:start + 1000])
+
+
+def record_jd_terms(db: Session, term_lists: Iterable[List[str]]) -> Dict[str, int]:
+    """
+    Count newly stored JDs, given each one's document_terms, in the
+    document frequencies. The caller commits, then passes the returned
+    counts to apply_jd_terms.
+    """
+    counts = count_document_terms(term_lists)
+    _add_counts(db, counts)
+    return counts
+
+
+def apply_jd_terms(counts: Dict[str, int]) -> None:
+    """Mirror counts committed by record_jd_terms in this process's snapshot"""
+    counts = dict(counts)
+    documents = counts.pop(DOCUMENTS_TERM, 0)
+    document_frequencies.add_documents(documents, counts)
+
+
+def refresh_document_frequencies(db: Session) -> None:
+    """Reload this process's snapshot from the table"""
+    df = dict(db.execute(select(JDTermFrequency.term, JDTermFrequency.document_count)).all())
+    documents = df.pop(DOCUMENTS_TERM, 0)
+    document_frequencies.replace(documents, df)
+
+
+def rebuild_document_frequencies(db: Session, batch_size: int = 500) -> int:
+    """Recount document frequencies over every stored JD"""
+    counts: Counter = Counter()
+    query = select(JobDescription.raw_text).execution_options(yield_per=batch_size)
+    for partition in db.execute(query).partitions():
+        counts.update(count_document_terms(document_terms(raw_text) for (raw_text,) in partition))
+
+    db.query(JDTermFrequency).delete()
+    _add_counts(db, counts)
+    db.commit()
+    refresh_document_frequencies(db)
+    return counts.get(DOCUMENTS_TERM, 0)
@@ -0,0 +1,172 @@
+"""
+Bulk job description ingestion.
+
+A bulk request is a JSON array or NDJSON of {"platform", "raw_text"}
+objects. Each item is validated on its own, so a bad item is reported
+without failing the rest. Valid items are deduped by platform and
+normalized-text hash, both within the request and against stored JDs;
+signals for the remaining items are extracted across a process pool, and
+the rows are inserted in batches along with their document frequencies.
+"""
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
+import json
+import os
+import uuid
+
+from .config import settings
+from .jd_extract import document_frequencies, extract_jd_signals_and_terms, jd_text_hash
+from .platform_profiles import platform_registry
+
+# (text_hash, platform) -> id of the JD holding that text
+JDKey = Tuple[str, str]
+
+
+@dataclass
+class JDItem:
+    index: int
+    platform: Optional[str] = None
+    raw_text: Optional[str] = None
+    text_hash: Optional[str] = None
+    id: Optional[uuid.UUID] = None
+    status: str = "error"  # created, duplicate or error
+    error: Optional[str] = None
+
+    @property
+    def key(self) -> JDKey:
+        return self.text_hash, self.platform
+
+
+def validate_jd_item(index: int, data: Any) -> JDItem:
+    """Check one decoded item; failures are recorded on the returned JDItem"""
+    item = JDItem(index=index)
+    if not isinstance(data, dict):
+        item.error = "Item must be an object with platform and raw_text"
+        return item
+
+    platform, raw_text = data.get("platform"), data.get("raw_text")
+    registry = platform_registry()
+    if not isinstance(platform, str) or platform.lower() not in registry:
+        item.error = f"Platform must be one of: {', '.join(registry.platforms)}"
+    elif not isinstance(raw_text, str) or not raw_text.strip():
+        item.error = "raw_text must be a non-empty string"
+    else:
+        item.platform = platform.lower()
+        item.raw_text = raw_text
+        item.text_hash = jd_text_hash(raw_text)
+        item.status = "created"
+    return item
+
+
+def read_jd_items(body: bytes, ndjson: bool) -> List[JDItem]:
+    """
+    Decode a bulk request body into validated items.
+
+    NDJSON lines that are not valid JSON become per-item errors; a JSON
+    body that does not decode to an array raises ValueError.
+    """
+    if not ndjson:
+        try:
+            data = json.loads(body)
+        except ValueError:
+            raise ValueError("Body is not valid JSON")
+        if not isinstance(data, list):
+            raise ValueError("Body must be a JSON array of job descriptions")
+        return [validate_jd_item(index, entry) for index, entry in enumerate(data)]
+
+    items = []
+    for line in body.splitlines():
+        if not line.strip():
+            continue
+        try:
+            entry = json.loads(line)
+        except ValueError:
+            items.append(JDItem(index=len(items), error="Line is not valid JSON"))
+            continue
+        items.append(validate_jd_item(len(items), entry))
+    return items
+
+
+def dedupe_jd_items(items: Sequence[JDItem], existing: Dict[JDKey, uuid.UUID]) -> List[JDItem]:
+    """
+    Assign ids and mark repeats of a stored JD, or of an earlier item in
+    the request, as duplicates pointing at that JD. Returns the items to
+    insert.
+    """
+    seen = dict(existing)
+    new_items = []
+    for item in items:
+        if item.status != "created":
+            continue
+        if item.key in seen:
+            item.status = "duplicate"
+            item.id = seen[item.key]
+            continue
+        item.id = uuid.uuid4()
+        seen[item.key] = item.id
+        new_items.append(item)
+    return new_items
+
+
+def _load_document_frequencies(state: Tuple[int, Dict[str, int]]) -> None:
+    # Pool initializer: workers rank keywords against the parent's snapshot
+    document_frequencies.replace(*state)
+
+
+def extract_signals_bulk(
+    texts: Sequence[str],
+    max_workers: Optional[int] = None
+) -> Tuple[List[Dict[str, Any]], List[List[str]]]:
+    """
+    extract_jd_signals and document_terms for every text, across a process
+    pool for large batches
+    """
+    workers = max_workers or settings.JD_BULK_MAX_WORKERS or os.cpu_count() or 1
+    workers = min(workers, len(texts))
+    if len(texts) < settings.JD_BULK_POOL_THRESHOLD or workers < 2:
+        results = [extract_jd_signals_and_terms(text) for text in texts]
+    else:
+        chunksize = max(1, len(texts) // (workers * 4))
+        with ProcessPoolExecutor(
+            max_workers=workers,
+            initializer=_load_document_frequencies,
+            initargs=(document_frequencies.state(),)
+        ) as pool:
+            results = list(pool.map(extract_jd_signals_and_terms, texts, chunksize=chunksize))
+    return [signals for signals, _ in results], [terms for _, terms in results]
+
+
+def jd_rows(items: Sequence[JDItem], signals: Sequence[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Insert parameters for the new items"""
+    return [
+        {
+            "id": item.id,
+            "platform": item.platform,
+            "raw_text": item.raw_text,
+            "text_hash": item.text_hash,
+            "extracted_signals": item_signals,
+        }
+        for item, item_signals in zip(items, signals)
+    ]
+
+
+def chunked(values: Sequence[Any], size: int) -> Iterator[Sequence[Any]]:
+    for start in range(0, len(values), size):
+        yield values[start:start + size]
+
+
+def bulk_result(items: Sequence[JDItem]) -> Dict[str, Any]:
+    """Summary counts plus one result per item, in request order"""
+    counts = {"created": 0, "duplicate": 0, "error": 0}
+    for item in items:
+        counts[item.status] += 1
+    return {
+        "created": counts["created"],
+        "duplicates": counts["duplicate"],
+        "errors": counts["error"],
+        "items": [
+            {"index": item.index, "status": item.status, "id": item.id, "error": item.error}
+            for item in items
+        ],
+    }
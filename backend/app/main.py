@@ -1,27 +1,79 @@
-from fastapi import FastAPI, Depends, HTTPException, UploadFile, File, Form
+from fastapi import FastAPI, Depends, HTTPException, UploadFile, File, Form, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
-from sqlalchemy.orm import Session
-from typing import List
+from fastapi.responses import StreamingResponse
+from sqlalchemy import insert, select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+from starlette.concurrency import iterate_in_threadpool, run_in_threadpool
+from typing import List, Optional
+import asyncio
+import json
+import logging
 import uuid
 
-from .db import Base, engine, get_db
-from .models import Resume, JobDescription, ResumeVariant, ApplicationOutcome
+from .db import AsyncSessionLocal, Base, SessionLocal, async_engine, engine, get_async_db
+from .models import Resume, JobDescription, ResumeVariant, ApplicationOutcome, ParseJob
 from .schemas import (
     ResumeResponse,
+    ResumeListItem,
     ResumeUpload,
+    ParseStatusResponse,
+    ParseCacheStatsResponse,
     JobDescriptionCreate,
     JobDescriptionResponse,
+    JDBulkResponse,
     CompileVariantRequest,
+    CompileBatchRequest,
     ResumeVariantResponse,
+    ResumeVariantListItem,
+    ScoreResponse,
+    ScoreCacheStatsResponse,
+    RankedResumeResponse,
     OutcomeCreate,
-    OutcomeResponse
+    OutcomeResponse,
+    OutcomeRateResponse,
+    PlatformProfileResponse
 )
-from .parsing import parse_resume
-from .jd_extract import extract_jd_signals
+from .parsing import build_parsed_json, get_file_type, is_supported_file, parsed_resume_is_current
+from .parse_queue import (
+    ParseTask,
+    fail_stale_parse_jobs,
+    get_parse_queue,
+    heartbeat_parse_jobs,
+    store_parsed_resume
+)
+from .parse_cache import get_cached_parse, get_parse_cache_stats
+from .uploads import UploadTooLargeError, remove_spool_file, spool_upload
+from .jd_extract import extract_jd_signals, extract_jd_signals_and_terms, jd_text_hash, signals_are_current
+from .jd_idf import apply_jd_terms, record_jd_terms, refresh_document_frequencies
+from .jd_ingest import bulk_result, chunked, dedupe_jd_items, extract_signals_bulk, jd_rows, read_jd_items
 from .compiler import compile_resume_variant
-from .scoring import calculate_survivability_score
+from .batch import iter_compiled_variants
+from .eager_compile import get_eager_compiler, in_flight, shutdown_eager_compiler
+from .variant_store import (
+    fill_compiled_text,
+    fill_compiled_text_rows,
+    find_variant,
+    insert_variants,
+    store_compiled_texts,
+    stored_variant_ids_by_jd,
+    variant_input_hash
+)
+from .score_cache import cached_survivability_score, get_score_cache, score_with_cache
+from .resume_index import resume_index
+from .outcome_rollups import outcome_rates, record_outcome_rollup
+from .platform_profiles import platform_names, platform_registry
+from .pagination import keyset_rows, keyset_statement, select_columns
+from .metrics import CONTENT_TYPE, MetricsMiddleware, count_pipeline_request, instrument_database, render_metrics, timed
 from .config import settings
 
+logger = logging.getLogger(__name__)
+
+VALID_PERSONAS = ["ic", "architect", "hybrid"]
+
+# List endpoints return the cursor for the next page in this header
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
 # Create database tables
 Base.metadata.create_all(bind=engine)
 
@@ -38,8 +90,188 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=[NEXT_CURSOR_HEADER],
 )
 
+# Request metrics; outermost, so they include time spent in other middleware
+if settings.METRICS_ENABLED:
+    app.add_middleware(MetricsMiddleware, server_timing_header=settings.METRICS_SERVER_TIMING)
+    instrument_database(engine, async_engine.sync_engine)
+
+
+async def load_document_frequencies() -> None:
+    async with AsyncSessionLocal() as db:
+        await db.run_sync(refresh_document_frequencies)
+
+
+async def refresh_document_frequencies_forever() -> None:
+    """Pick up JDs stored by other API processes"""
+    while True:
+        await asyncio.sleep(settings.IDF_REFRESH_SECONDS)
+        try:
+            await load_document_frequencies()
+        except Exception:
+            logger.exception("Failed to refresh JD document frequencies")
+
+
+@app.on_event("startup")
+async def start_document_frequencies():
+    """Load the JD corpus statistics keyword extraction ranks against"""
+    await load_document_frequencies()
+    app.state.idf_refresh = asyncio.create_task(refresh_document_frequencies_forever())
+
+
+@app.on_event("shutdown")
+async def stop_document_frequencies():
+    app.state.idf_refresh.cancel()
+
+
+def load_resume_index() -> None:
+    db = SessionLocal()
+    try:
+        resume_index.refresh(db)
+    finally:
+        db.close()
+
+
+async def refresh_resume_index_forever() -> None:
+    """Pick up resumes indexed by other API processes and workers"""
+    while True:
+        await asyncio.sleep(settings.RESUME_INDEX_REFRESH_SECONDS)
+        try:
+            await run_in_threadpool(load_resume_index)
+        except Exception:
+            logger.exception("Failed to refresh the resume index")
+
+
+@app.on_event("startup")
+async def start_resume_index():
+    """Build the resume index rank requests read, on a thread so the loop stays free"""
+    await run_in_threadpool(load_resume_index)
+    app.state.resume_index_refresh = asyncio.create_task(refresh_resume_index_forever())
+
+
+@app.on_event("shutdown")
+async def stop_resume_index():
+    app.state.resume_index_refresh.cancel()
+
+
+async def heartbeat_parse_jobs_forever() -> None:
+    """
+    Keep this process's in-process parse jobs alive, and fail the jobs of
+    API processes that exited before finishing theirs
+    """
+    owner_id = get_parse_queue().owner_id
+    while True:
+        try:
+            async with AsyncSessionLocal() as db:
+                await db.run_sync(heartbeat_parse_jobs, owner_id)
+                await db.run_sync(fail_stale_parse_jobs)
+        except Exception:
+            logger.exception("Failed to sweep stale parse jobs")
+        await asyncio.sleep(settings.PARSE_SWEEP_SECONDS)
+
+
+@app.on_event("startup")
+async def start_parse_job_sweep():
+    # Redis consumers sweep for themselves (parse_queue.RedisParseQueue)
+    app.state.parse_sweep = None
+    if settings.PARSE_QUEUE_BACKEND == "inprocess":
+        app.state.parse_sweep = asyncio.create_task(heartbeat_parse_jobs_forever())
+
+
+@app.on_event("shutdown")
+async def stop_parse_job_sweep():
+    if app.state.parse_sweep is not None:
+        app.state.parse_sweep.cancel()
+
+
+@app.on_event("shutdown")
+async def stop_eager_compiler():
+    shutdown_eager_compiler()
+
+
+def load_jd_signals(jd: JobDescription) -> dict:
+    """Return the JD's stored signals, re-extracting them if missing or stale.
+    
+    Refreshed signals are assigned back to the row so they are persisted
+    with the caller's next commit.
+    """
+    if not signals_are_current(jd.extracted_signals):
+        with timed("extract", "jd"):
+            jd.extracted_signals = extract_jd_signals(jd.raw_text)
+    return jd.extracted_signals
+
+
+def load_parsed_resume(resume: Resume) -> dict:
+    """Return the resume's structured parse, rebuilding it if missing or stale.
+    
+    Rebuilt data is assigned back to the row so it is persisted with the
+    caller's next commit.
+    """
+    if not parsed_resume_is_current(resume.parsed_json):
+        with timed("extract", "resume"):
+            resume.parsed_json = build_parsed_json(resume.raw_text)
+    return resume.parsed_json
+
+
+def score_resumes(resumes: List[Resume], jd_text: str, platform: str, jd_signals: dict) -> List[dict]:
+    """Scores of each resume against one JD, from the score cache when available"""
+    return [
+        cached_survivability_score(
+            resume.raw_text,
+            jd_text,
+            platform,
+            jd_signals=jd_signals,
+            parsed_resume=load_parsed_resume(resume)
+        )
+        for resume in resumes
+    ]
+
+
+def validate_platforms(*platforms: str) -> None:
+    """400 unless every platform is in the platform registry"""
+    registry = platform_registry()
+    if not platforms or any(platform not in registry for platform in platforms):
+        raise HTTPException(
+            status_code=400,
+            detail=f"Platform must be one of: {', '.join(registry.platforms)}"
+        )
+
+
+def validate_list_limit(limit: int) -> None:
+    if limit < 1 or limit > settings.LIST_MAX_LIMIT:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Limit must be between 1 and {settings.LIST_MAX_LIMIT}"
+        )
+
+
+async def list_page(
+    db: AsyncSession,
+    response: Response,
+    statement,
+    sort_key,
+    cursor: Optional[str],
+    limit: int
+) -> List[dict]:
+    """Fetch one keyset page and set the next-page cursor header"""
+    try:
+        statement = keyset_statement(statement, sort_key, cursor, limit)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    rows, next_cursor = keyset_rows((await db.execute(statement)).all(), sort_key, limit)
+    if next_cursor:
+        response.headers[NEXT_CURSOR_HEADER] = next_cursor
+    return rows
+
+
+def list_columns(model, fields: Optional[str], sort_key, large_fields=()) -> list:
+    try:
+        return select_columns(model, fields, sort_key, large_fields)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
 
 @app.get("/")
 async def root():
@@ -50,205 +282,700 @@ async def root():
     }
 
 
-@app.post("/resumes/upload", response_model=ResumeResponse)
+@app.post("/resumes/upload", response_model=ParseStatusResponse, status_code=202)
 async def upload_resume(
     file: UploadFile = File(...),
     user_id: str = Form("default_user"),  # TODO: Get from auth
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
-    """Upload and parse a resume file"""
+    """
+    Upload a resume file and queue it for parsing.
+    
+    Returns 202 with the id the parsed resume will have; poll
+    /resumes/{resume_id}/status until parsing is done.
+    """
     # Validate file
     if not file.filename:
         raise HTTPException(status_code=400, detail="No file provided")
+    if not is_supported_file(file.filename):
+        raise HTTPException(status_code=400, detail=f"Unsupported file format: {file.filename}")
     
-    # Read file content
+    # Spool the upload to disk in chunks
     try:
-        file_content = await file.read()
-        if not file_content or len(file_content) == 0:
-            raise HTTPException(status_code=400, detail="File is empty")
-    except HTTPException:
-        raise
+        upload = await spool_upload(file, settings.UPLOAD_MAX_BYTES)
+    except UploadTooLargeError as e:
+        raise HTTPException(status_code=413, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=400, detail=f"Error reading file: {str(e)}")
+    if upload.size == 0:
+        remove_spool_file(upload.path)
+        raise HTTPException(status_code=400, detail="File is empty")
+    content_hash = upload.content_hash
+    count_pipeline_request("upload")
     
-    # Parse resume
+    # Files parsed before are served from the parse cache without queueing
+    cached_parse = await db.run_sync(get_cached_parse, content_hash, get_file_type(file.filename))
+    if cached_parse is not None:
+        remove_spool_file(upload.path)
+        existing = (await db.execute(
+            select(ParseJob)
+            .join(Resume, Resume.id == ParseJob.resume_id)
+            .where(
+                ParseJob.user_id == user_id,
+                ParseJob.content_hash == content_hash,
+                ParseJob.status == "done"
+            )
+            .limit(1)
+        )).scalars().first()
+        if existing:
+            # Same user, same file: hand back the resume they already have
+            await db.commit()
+            return ParseStatusResponse.model_validate(existing).model_copy(update={"cached": True})
+        
+        job = ParseJob(
+            resume_id=uuid.uuid4(),
+            user_id=user_id,
+            filename=file.filename,
+            status="done",
+            progress=1.0,
+            content_hash=content_hash,
+            cached=True
+        )
+        db.add(job)
+        terms = await db.run_sync(store_parsed_resume, job.resume_id, user_id, {
+            "raw_text": cached_parse.raw_text,
+            "parsed_json": cached_parse.parsed_json
+        })
+        await db.commit()
+        await db.refresh(job)
+        resume_index.add(job.resume_id, user_id, terms)
+        return job
+    
+    # Record the job before queueing so its status can always be polled
+    job = ParseJob(
+        resume_id=uuid.uuid4(),
+        user_id=user_id,
+        filename=file.filename,
+        status="queued",
+        progress=0.0,
+        content_hash=content_hash
+    )
     try:
-        parsed_data = parse_resume(file_content, file.filename or "unknown")
-        if not parsed_data.get("raw_text") or len(parsed_data["raw_text"].strip()) == 0:
-            raise HTTPException(status_code=400, detail="Could not extract text from file. Please ensure the file is a valid PDF, DOCX, or TXT file.")
-    except ValueError as e:
-        raise HTTPException(status_code=400, detail=str(e))
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Error parsing resume: {str(e)}")
+        db.add(job)
+        await db.commit()
+        await db.refresh(job)
+    except Exception:
+        remove_spool_file(upload.path)
+        raise
     
-    # Save to database
+    # The queue takes ownership of the spool file. Enqueueing does blocking
+    # I/O (Redis, reading the spool file), so keep it off the event loop.
     try:
-        resume = Resume(
-            user_id=user_id,
-            raw_text=parsed_data["raw_text"],
-            parsed_json=parsed_data.get("parsed_json")
+        await run_in_threadpool(
+            get_parse_queue().enqueue,
+            ParseTask(job.resume_id, user_id, file.filename, upload.path, content_hash)
         )
-        db.add(resume)
-        db.commit()
-        db.refresh(resume)
-        return resume
     except Exception as e:
-        db.rollback()
-        raise HTTPException(status_code=500, detail=f"Error saving resume: {str(e)}")
+        remove_spool_file(upload.path)
+        job.status = "failed"
+        job.error = f"Error queueing resume: {str(e)}"
+        await db.commit()
+        raise HTTPException(status_code=503, detail=job.error)
+    
+    return job
+
+
+@app.get("/resumes/{resume_id}/status", response_model=ParseStatusResponse)
+async def get_parse_status(resume_id: uuid.UUID, db: AsyncSession = Depends(get_async_db)):
+    """Get the parse status of an uploaded resume"""
+    job = await db.get(ParseJob, resume_id)
+    if job:
+        return job
+    
+    # Resumes stored before background parsing existed have no job
+    resume = await db.get(Resume, resume_id)
+    if not resume:
+        raise HTTPException(status_code=404, detail="Resume not found")
+    return ParseStatusResponse(
+        resume_id=resume.id,
+        user_id=resume.user_id,
+        filename="",
+        status="done",
+        progress=1.0,
+        created_at=resume.created_at,
+        updated_at=resume.created_at
+    )
+
+
+@app.get("/metrics")
+async def metrics():
+    """Request and pipeline stage metrics in the Prometheus text format"""
+    if not settings.METRICS_ENABLED:
+        raise HTTPException(status_code=404, detail="Metrics are disabled")
+    return Response(render_metrics(), media_type=CONTENT_TYPE)
+
+
+@app.get("/parse-cache/stats", response_model=ParseCacheStatsResponse)
+async def parse_cache_stats(db: AsyncSession = Depends(get_async_db)):
+    """Parse cache hit rate for this API process and the cache's current size"""
+    return await db.run_sync(get_parse_cache_stats)
+
+
+@app.get("/score-cache/stats", response_model=ScoreCacheStatsResponse)
+async def score_cache_stats():
+    """Score cache hit rate and size for this API process"""
+    return get_score_cache().stats()
 
 
 @app.get("/resumes/{resume_id}", response_model=ResumeResponse)
-async def get_resume(resume_id: uuid.UUID, db: Session = Depends(get_db)):
+async def get_resume(resume_id: uuid.UUID, db: AsyncSession = Depends(get_async_db)):
     """Get a resume by ID"""
-    resume = db.query(Resume).filter(Resume.id == resume_id).first()
+    resume = await db.get(Resume, resume_id)
     if not resume:
         raise HTTPException(status_code=404, detail="Resume not found")
     return resume
 
 
-@app.get("/resumes", response_model=List[ResumeResponse])
+@app.get("/resumes", response_model=List[ResumeListItem], response_model_exclude_unset=True)
 async def list_resumes(
+    response: Response,
     user_id: str = "default_user",  # TODO: Get from auth
-    db: Session = Depends(get_db)
+    limit: int = settings.LIST_DEFAULT_LIMIT,
+    cursor: Optional[str] = None,
+    fields: Optional[str] = None,
+    db: AsyncSession = Depends(get_async_db)
 ):
-    """List all resumes for a user"""
-    resumes = db.query(Resume).filter(Resume.user_id == user_id).all()
-    return resumes
+    """
+    List a user's resumes, oldest first, one page at a time.
+    
+    Pass the X-Next-Cursor header of a page as cursor to get the next one.
+    raw_text and parsed_json are left out unless named in fields
+    (comma-separated column names).
+    """
+    validate_list_limit(limit)
+    sort_key = (Resume.created_at, Resume.id)
+    columns = list_columns(Resume, fields, sort_key, large_fields=("raw_text", "parsed_json"))
+    statement = select(*columns).where(Resume.user_id == user_id)
+    return await list_page(db, response, statement, sort_key, cursor, limit)
+
+
+@app.get("/platforms", response_model=List[PlatformProfileResponse])
+async def list_platforms():
+    """Platforms accepted by the other endpoints, with their weights, from the platform registry"""
+    registry = platform_registry()
+    return [
+        {"platform": platform, "version": registry.version, "default": platform == registry.default_platform, **weights}
+        for platform, weights in registry.profiles.items()
+    ]
 
 
 @app.post("/jds", response_model=JobDescriptionResponse)
 async def create_job_description(
     jd: JobDescriptionCreate,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Create a job description and extract signals"""
     # Validate platform
-    valid_platforms = ["linkedin", "indeed", "dice"]
-    if jd.platform.lower() not in valid_platforms:
-        raise HTTPException(
-            status_code=400,
-            detail=f"Platform must be one of: {', '.join(valid_platforms)}"
-        )
+    validate_platforms(jd.platform.lower())
+    
+    count_pipeline_request("jds", jd.platform.lower())
     
     # Extract signals
-    extracted_signals = extract_jd_signals(jd.raw_text)
+    with timed("extract", "jd"):
+        extracted_signals, terms = extract_jd_signals_and_terms(jd.raw_text)
     
     # Save to database
     job_desc = JobDescription(
         platform=jd.platform.lower(),
         raw_text=jd.raw_text,
+        text_hash=jd_text_hash(jd.raw_text),
         extracted_signals=extracted_signals
     )
     db.add(job_desc)
-    db.commit()
-    db.refresh(job_desc)
+    term_counts = await db.run_sync(record_jd_terms, [terms])
+    await db.commit()
+    apply_jd_terms(term_counts)
+    await db.refresh(job_desc)
+    
+    # Precompute the user's variants in the background
+    if settings.EAGER_COMPILE and jd.user_id:
+        resume_ids = (await db.execute(
+            select(Resume.id)
+            .where(Resume.user_id == jd.user_id)
+            .order_by(Resume.created_at.desc(), Resume.id.desc())
+            .limit(settings.EAGER_COMPILE_MAX_RESUMES)
+        )).scalars().all()
+        eager_compiler = get_eager_compiler()
+        for resume_id in resume_ids:
+            eager_compiler.submit(resume_id, job_desc.id, VALID_PERSONAS, list(platform_names()))
     
     return job_desc
 
 
+@app.post("/jds:bulk", response_model=JDBulkResponse)
+async def bulk_create_job_descriptions(request: Request, db: AsyncSession = Depends(get_async_db)):
+    """
+    Create many job descriptions from a JSON array or NDJSON body
+    (Content-Type: application/x-ndjson) of {"platform", "raw_text"} objects.
+    
+    Items repeating a stored JD (same platform and normalized text), or an
+    earlier item in the request, are reported as duplicates of it. Invalid
+    items are reported without failing the rest of the batch.
+    """
+    body = await request.body()
+    if len(body) > settings.JD_BULK_MAX_BYTES:
+        raise HTTPException(
+            status_code=413,
+            detail=f"Body exceeds the {settings.JD_BULK_MAX_BYTES // (1024 * 1024)} MB bulk limit"
+        )
+    
+    content_type = request.headers.get("content-type", "")
+    try:
+        items = read_jd_items(body, ndjson="ndjson" in content_type or "jsonl" in content_type)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    if len(items) > settings.JD_BULK_MAX_ITEMS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"At most {settings.JD_BULK_MAX_ITEMS} job descriptions per request"
+        )
+    
+    # Stored JDs with any of the incoming hashes
+    hashes = list({item.text_hash for item in items if item.text_hash})
+    existing = {}
+    for chunk in chunked(hashes, 1000):
+        rows = await db.execute(
+            select(JobDescription.text_hash, JobDescription.platform, JobDescription.id)
+            .where(JobDescription.text_hash.in_(chunk))
+        )
+        for text_hash, platform, jd_id in rows:
+            existing.setdefault((text_hash, platform), jd_id)
+    
+    new_items = dedupe_jd_items(items, existing)
+    
+    # Extraction is CPU-bound and may wait on a process pool
+    with timed("extract", "jd_bulk"):
+        signals, term_lists = await run_in_threadpool(extract_signals_bulk, [item.raw_text for item in new_items])
+    for chunk in chunked(jd_rows(new_items, signals), 1000):
+        await db.execute(insert(JobDescription), chunk)
+    term_counts = await db.run_sync(record_jd_terms, term_lists)
+    await db.commit()
+    apply_jd_terms(term_counts)
+    
+    return bulk_result(items)
+
+
 @app.get("/jds/{jd_id}", response_model=JobDescriptionResponse)
-async def get_job_description(jd_id: uuid.UUID, db: Session = Depends(get_db)):
+async def get_job_description(jd_id: uuid.UUID, db: AsyncSession = Depends(get_async_db)):
     """Get a job description by ID"""
-    jd = db.query(JobDescription).filter(JobDescription.id == jd_id).first()
+    jd = await db.get(JobDescription, jd_id)
     if not jd:
         raise HTTPException(status_code=404, detail="Job description not found")
     return jd
 
 
+@app.get("/jds/{jd_id}/rank-resumes", response_model=List[RankedResumeResponse])
+async def rank_resumes(
+    jd_id: uuid.UUID,
+    user_id: Optional[str] = None,
+    platform: Optional[str] = None,
+    limit: int = 10,
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Rank stored resumes against a job description.
+    
+    The resume index narrows the field to resumes sharing the most JD top
+    terms; only those candidates are fully scored.
+    """
+    if limit < 1 or limit > settings.RANK_MAX_RESULTS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Limit must be between 1 and {settings.RANK_MAX_RESULTS}"
+        )
+    
+    jd = await db.get(JobDescription, jd_id)
+    if not jd:
+        raise HTTPException(status_code=404, detail="Job description not found")
+    
+    platform = (platform or jd.platform).lower()
+    validate_platforms(platform)
+    
+    count_pipeline_request("rank-resumes", platform)
+    jd_signals = load_jd_signals(jd)
+    # The index is refreshed in the background (refresh_resume_index_forever)
+    candidates = resume_index.candidates(
+        jd_signals.get("top_terms", []),
+        limit * settings.RANK_CANDIDATE_MULTIPLIER,
+        user_id=user_id
+    )
+    
+    resumes = {
+        resume.id: resume
+        for resume in (await db.execute(
+            select(Resume).where(Resume.id.in_([resume_id for resume_id, _ in candidates]))
+        )).scalars()
+    } if candidates else {}
+    
+    found = [(resumes[resume_id], matched_terms) for resume_id, matched_terms in candidates if resume_id in resumes]
+    scores = await run_in_threadpool(
+        score_resumes, [resume for resume, _ in found], jd.raw_text, platform, jd_signals
+    )
+    ranked = [
+        {
+            "resume_id": resume.id,
+            "user_id": resume.user_id,
+            "matched_terms": matched_terms,
+            "scores": resume_scores
+        }
+        for (resume, matched_terms), resume_scores in zip(found, scores)
+    ]
+    ranked.sort(key=lambda r: (-r["scores"]["survivability"], -r["matched_terms"]))
+    
+    # Persist signals and parses refreshed above
+    if db.dirty:
+        await db.commit()
+    
+    return ranked[:limit]
+
+
+@app.get("/scores", response_model=ScoreResponse)
+async def get_scores(
+    resume_id: uuid.UUID,
+    jd_id: uuid.UUID,
+    platform: Optional[str] = None,
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Score a resume against a job description without compiling a variant.
+    
+    Scores come from the score cache when available. platform defaults to
+    the JD's platform.
+    """
+    resume = await db.get(Resume, resume_id)
+    if not resume:
+        raise HTTPException(status_code=404, detail="Resume not found")
+    
+    jd = await db.get(JobDescription, jd_id)
+    if not jd:
+        raise HTTPException(status_code=404, detail="Job description not found")
+    
+    platform = (platform or jd.platform).lower()
+    validate_platforms(platform)
+    
+    count_pipeline_request("scores", platform)
+    scores, cached = await run_in_threadpool(
+        score_with_cache,
+        resume.raw_text,
+        jd.raw_text,
+        platform,
+        jd_signals=load_jd_signals(jd),
+        parsed_resume=load_parsed_resume(resume)
+    )
+    
+    # Persist signals and parses refreshed above
+    if db.dirty:
+        await db.commit()
+    
+    return {
+        "resume_id": resume_id,
+        "jd_id": jd_id,
+        "platform": platform,
+        "scores": scores,
+        "cached": cached
+    }
+
+
 @app.post("/variants/compile", response_model=ResumeVariantResponse)
 async def compile_variant(
     request: CompileVariantRequest,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
-    """Compile a resume variant for a specific JD and persona"""
+    """
+    Compile a resume variant for a specific JD and persona.
+    
+    If a stored variant was compiled from the same inputs, it is returned
+    instead of storing an identical one. With EAGER_COMPILE, a variant
+    already being compiled is also waited for rather than compiled again.
+    """
     # Validate persona
-    valid_personas = ["ic", "architect", "hybrid"]
-    if request.persona.lower() not in valid_personas:
+    if request.persona.lower() not in VALID_PERSONAS:
         raise HTTPException(
             status_code=400,
-            detail=f"Persona must be one of: {', '.join(valid_personas)}"
+            detail=f"Persona must be one of: {', '.join(VALID_PERSONAS)}"
         )
     
     # Validate platform
-    valid_platforms = ["linkedin", "indeed", "dice"]
-    if request.platform.lower() not in valid_platforms:
-        raise HTTPException(
-            status_code=400,
-            detail=f"Platform must be one of: {', '.join(valid_platforms)}"
-        )
+    validate_platforms(request.platform.lower())
     
+    if not settings.EAGER_COMPILE:
+        return await compile_and_store_variant(request, db)
+    
+    key = (request.resume_id, request.jd_id, request.persona.lower(), request.platform.lower())
+    while True:
+        future, owner = in_flight.claim(key)
+        if owner:
+            break
+        # Someone else is compiling it; if they failed, try ourselves
+        variant_id = await asyncio.wrap_future(future)
+        if variant_id is not None:
+            variant = await db.get(ResumeVariant, variant_id)
+            await db.run_sync(fill_compiled_text, [variant])
+            return variant
+    
+    variant = None
+    try:
+        variant = await compile_and_store_variant(request, db)
+    finally:
+        in_flight.finish(key, variant.id if variant is not None else None)
+    return variant
+
+
+async def compile_and_store_variant(request: CompileVariantRequest, db: AsyncSession) -> ResumeVariant:
+    """Compile, score and store one variant, unless one with the same inputs is stored"""
     # Get resume
-    resume = db.query(Resume).filter(Resume.id == request.resume_id).first()
+    resume = await db.get(Resume, request.resume_id)
     if not resume:
         raise HTTPException(status_code=404, detail="Resume not found")
     
     # Get job description
-    jd = db.query(JobDescription).filter(JobDescription.id == request.jd_id).first()
+    jd = await db.get(JobDescription, request.jd_id)
     if not jd:
         raise HTTPException(status_code=404, detail="Job description not found")
     
-    # Compile variant
-    compiled_text = compile_resume_variant(
-        resume.raw_text,
-        jd.raw_text,
-        request.persona.lower(),
-        request.platform.lower()
+    # Reuse the signals computed when the JD was stored; they are part of the inputs
+    jd_signals = load_jd_signals(jd)
+    input_hash = variant_input_hash(
+        resume.raw_text, jd.raw_text, request.persona.lower(), request.platform.lower(), jd_signals
     )
+    existing = await db.run_sync(find_variant, request.resume_id, request.jd_id, input_hash)
+    if existing is not None:
+        return existing
+    
+    # Reuse the parse computed when the resume was stored
+    parsed_resume = load_parsed_resume(resume)
     
-    # Calculate scores
-    scores = calculate_survivability_score(
+    count_pipeline_request("compile", request.platform.lower(), request.persona.lower())
+    
+    # Compile and score in worker threads so the event loop keeps serving requests
+    with timed("compile"):
+        compiled_text = await run_in_threadpool(
+            compile_resume_variant,
+            resume.raw_text,
+            jd.raw_text,
+            request.persona.lower(),
+            request.platform.lower(),
+            jd_signals=jd_signals,
+            resume_sections=parsed_resume["sections"]
+        )
+    
+    scores = await run_in_threadpool(
+        cached_survivability_score,
         resume.raw_text,
         jd.raw_text,
-        request.platform.lower()
+        request.platform.lower(),
+        jd_signals=jd_signals,
+        parsed_resume=parsed_resume
     )
     
-    # Save variant
+    # Save variant, its text stored once however many variants share it
+    text_hashes = await db.run_sync(store_compiled_texts, [compiled_text])
     variant = ResumeVariant(
         resume_id=request.resume_id,
         jd_id=request.jd_id,
         persona=request.persona.lower(),
         platform=request.platform.lower(),
-        compiled_text=compiled_text,
+        text_hash=text_hashes[0],
+        input_hash=input_hash,
         scores=scores
     )
     db.add(variant)
-    db.commit()
-    db.refresh(variant)
+    try:
+        await db.commit()
+    except IntegrityError:
+        # Another process stored the same variant first
+        await db.rollback()
+        existing = await db.run_sync(find_variant, request.resume_id, request.jd_id, input_hash)
+        if existing is None:
+            raise
+        return existing
+    await db.refresh(variant)
+    await db.run_sync(fill_compiled_text, [variant])
     
     return variant
 
 
+@app.post("/variants/compile:batch")
+async def compile_variants_batch(
+    request: CompileBatchRequest,
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Compile one resume against many JDs x personas x platforms.
+    
+    Streams NDJSON: one line per compiled variant as soon as it is ready,
+    followed by a final status line once the variants not already stored
+    have been written with a single bulk insert. Variants compiled from
+    the same inputs before keep their stored ids and are not inserted
+    again. If a concurrent compile stored one of the new variants first,
+    the status line's "replaced" maps the streamed id to the stored one.
+    """
+    personas = list(dict.fromkeys(p.lower() for p in request.personas))
+    requested_platforms = platform_names() if request.platforms is None else request.platforms
+    platforms = list(dict.fromkeys(p.lower() for p in requested_platforms))
+    jd_ids = list(dict.fromkeys(request.jd_ids))
+    
+    invalid_personas = [p for p in personas if p not in VALID_PERSONAS]
+    if not personas or invalid_personas:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Persona must be one of: {', '.join(VALID_PERSONAS)}"
+        )
+    validate_platforms(*platforms)
+    if not jd_ids:
+        raise HTTPException(status_code=400, detail="At least one jd_id is required")
+    
+    total = len(jd_ids) * len(personas) * len(platforms)
+    if total > settings.BATCH_MAX_VARIANTS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Batch would compile {total} variants; the limit is {settings.BATCH_MAX_VARIANTS}"
+        )
+    
+    # Get resume
+    resume = await db.get(Resume, request.resume_id)
+    if not resume:
+        raise HTTPException(status_code=404, detail="Resume not found")
+    
+    # Load all job descriptions in one query
+    jds_by_id = {
+        jd.id: jd
+        for jd in (await db.execute(
+            select(JobDescription).where(JobDescription.id.in_(jd_ids))
+        )).scalars()
+    }
+    missing = [str(jd_id) for jd_id in jd_ids if jd_id not in jds_by_id]
+    if missing:
+        raise HTTPException(
+            status_code=404,
+            detail=f"Job description not found: {', '.join(missing)}"
+        )
+    
+    for platform in platforms:
+        for persona in personas:
+            count_pipeline_request("compile:batch", platform, persona)
+    
+    jd_inputs = [
+        (jd_id, jds_by_id[jd_id].raw_text, load_jd_signals(jds_by_id[jd_id]))
+        for jd_id in jd_ids
+    ]
+    resume_id = resume.id
+    resume_text = resume.raw_text
+    parsed_resume = load_parsed_resume(resume)
+    input_hashes = {
+        (jd_id, persona, platform): variant_input_hash(resume_text, jd_text, persona, platform, jd_signals)
+        for jd_id, jd_text, jd_signals in jd_inputs
+        for persona in personas
+        for platform in platforms
+    }
+    # Variants stored by an earlier compile keep their ids and are not inserted again
+    stored = await db.run_sync(stored_variant_ids_by_jd, resume_id, jd_ids, input_hashes.values())
+    
+    async def stream_variants():
+        count = 0
+        rows = []
+        # Compiling blocks (CPU work or waiting on the process pool), so
+        # results are pulled from a worker thread
+        variants = iter_compiled_variants(
+            resume_text, jd_inputs, personas, platforms, parsed_resume=parsed_resume
+        )
+        async for result in iterate_in_threadpool(variants):
+            input_hash = input_hashes[(result["jd_id"], result["persona"], result["platform"])]
+            stored_id = stored.get((result["jd_id"], input_hash))
+            row = {"id": stored_id or uuid.uuid4(), "resume_id": resume_id, **result}
+            count += 1
+            if stored_id is None:
+                rows.append({**row, "input_hash": input_hash})
+            yield json.dumps(row, default=str) + "\n"
+
+        # Persist the new variants (and any refreshed JD signals or parse) in one commit
+        try:
+            text_hashes = await db.run_sync(store_compiled_texts, [row["compiled_text"] for row in rows])
+            await db.run_sync(insert_variants, [
+                {**row, "compiled_text": None, "text_hash": digest}
+                for row, digest in zip(rows, text_hashes)
+            ])
+            # Rows a concurrent compile stored first were skipped; their ids are the stored ones
+            now_stored = await db.run_sync(
+                stored_variant_ids_by_jd, resume_id, jd_ids, [row["input_hash"] for row in rows]
+            )
+            replaced = {
+                str(row["id"]): str(now_stored[(row["jd_id"], row["input_hash"])])
+                for row in rows
+                if now_stored.get((row["jd_id"], row["input_hash"]), row["id"]) != row["id"]
+            }
+            await db.commit()
+            yield json.dumps({
+                "status": "committed", "count": count, "new": len(rows) - len(replaced), "replaced": replaced
+            }) + "\n"
+        except Exception as e:
+            await db.rollback()
+            yield json.dumps({"status": "failed", "detail": f"Error saving variants: {str(e)}"}) + "\n"
+    
+    return StreamingResponse(stream_variants(), media_type="application/x-ndjson")
+
+
 @app.get("/variants/{variant_id}", response_model=ResumeVariantResponse)
-async def get_variant(variant_id: uuid.UUID, db: Session = Depends(get_db)):
+async def get_variant(variant_id: uuid.UUID, db: AsyncSession = Depends(get_async_db)):
     """Get a resume variant by ID"""
-    variant = db.query(ResumeVariant).filter(ResumeVariant.id == variant_id).first()
+    variant = await db.get(ResumeVariant, variant_id)
     if not variant:
         raise HTTPException(status_code=404, detail="Variant not found")
+    await db.run_sync(fill_compiled_text, [variant])
     return variant
 
 
-@app.get("/variants", response_model=List[ResumeVariantResponse])
+@app.get("/variants", response_model=List[ResumeVariantListItem], response_model_exclude_unset=True)
 async def list_variants(
+    response: Response,
     resume_id: uuid.UUID = None,
     jd_id: uuid.UUID = None,
-    db: Session = Depends(get_db)
+    limit: int = settings.LIST_DEFAULT_LIMIT,
+    cursor: Optional[str] = None,
+    fields: Optional[str] = None,
+    db: AsyncSession = Depends(get_async_db)
 ):
-    """List resume variants with optional filters"""
-    query = db.query(ResumeVariant)
+    """
+    List resume variants with optional filters, oldest first, one page at a time.
+    
+    Pass the X-Next-Cursor header of a page as cursor to get the next one.
+    compiled_text is left out unless named in fields (comma-separated
+    column names).
+    """
+    validate_list_limit(limit)
+    sort_key = (ResumeVariant.created_at, ResumeVariant.id)
+    columns = list_columns(ResumeVariant, fields, sort_key, large_fields=("compiled_text",))
+    # Texts stored by hash are loaded after the page is fetched
+    with_text = any(column.key == "compiled_text" for column in columns)
+    if with_text and not any(column.key == "text_hash" for column in columns):
+        columns.append(ResumeVariant.text_hash)
+    statement = select(*columns)
     
     if resume_id:
-        query = query.filter(ResumeVariant.resume_id == resume_id)
+        statement = statement.where(ResumeVariant.resume_id == resume_id)
     if jd_id:
-        query = query.filter(ResumeVariant.jd_id == jd_id)
+        statement = statement.where(ResumeVariant.jd_id == jd_id)
     
-    variants = query.all()
-    return variants
+    rows = await list_page(db, response, statement, sort_key, cursor, limit)
+    if with_text:
+        await db.run_sync(fill_compiled_text_rows, rows)
+    return rows
 
 
 @app.post("/outcomes", response_model=OutcomeResponse)
 async def record_outcome(
     outcome: OutcomeCreate,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Record application outcome (Phase 2)"""
     # Validate status
@@ -260,32 +987,59 @@ async def record_outcome(
         )
     
     # Verify variant exists
-    variant = db.query(ResumeVariant).filter(ResumeVariant.id == outcome.variant_id).first()
+    variant = await db.get(ResumeVariant, outcome.variant_id)
     if not variant:
         raise HTTPException(status_code=404, detail="Variant not found")
     
-    # Create outcome
+    # Create outcome, counted in the analytics rollups in the same transaction
     application_outcome = ApplicationOutcome(
         variant_id=outcome.variant_id,
         status=outcome.status.lower()
     )
     db.add(application_outcome)
-    db.commit()
-    db.refresh(application_outcome)
+    await db.run_sync(record_outcome_rollup, variant, application_outcome.status)
+    await db.commit()
+    await db.refresh(application_outcome)
     
     return application_outcome
 
 
 @app.get("/outcomes", response_model=List[OutcomeResponse])
 async def list_outcomes(
+    response: Response,
     variant_id: uuid.UUID = None,
-    db: Session = Depends(get_db)
+    limit: int = settings.LIST_DEFAULT_LIMIT,
+    cursor: Optional[str] = None,
+    db: AsyncSession = Depends(get_async_db)
 ):
-    """List application outcomes with optional filter"""
-    query = db.query(ApplicationOutcome)
+    """
+    List application outcomes with optional filter, oldest first, one page
+    at a time. Pass the X-Next-Cursor header of a page as cursor to get the
+    next one.
+    """
+    validate_list_limit(limit)
+    sort_key = (ApplicationOutcome.recorded_at, ApplicationOutcome.id)
+    statement = select(*list_columns(ApplicationOutcome, None, sort_key))
     
     if variant_id:
-        query = query.filter(ApplicationOutcome.variant_id == variant_id)
+        statement = statement.where(ApplicationOutcome.variant_id == variant_id)
     
-    outcomes = query.all()
-    return outcomes
+    return await list_page(db, response, statement, sort_key, cursor, limit)
+
+
+@app.get("/outcomes/analytics", response_model=List[OutcomeRateResponse])
+async def outcome_analytics(
+    platform: Optional[str] = None,
+    persona: Optional[str] = None,
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Interview rate and outcome counts per platform x persona x survivability
+    bucket, optionally for one platform or persona. Read from rollups kept
+    up to date as outcomes are recorded.
+    """
+    return await db.run_sync(
+        outcome_rates,
+        platform.lower() if platform else None,
+        persona.lower() if persona else None
+    )
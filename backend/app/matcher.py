@@ -0,0 +1,134 @@
+"""
+Compiled keyword matcher.
+Finds every JD keyword in a resume with one regex pass instead of one
+substring scan per keyword. Matches respect word boundaries, so "java"
+does not match inside "javascript".
+"""
+from functools import lru_cache
+from typing import Dict, Iterable, List, Sequence, Set, Tuple
+import re
+
+# Characters that make up a word for boundary checks
+WORD_CHARS = "a-z0-9"
+_WORD_CHAR_RE = re.compile(f"[{WORD_CHARS}]")
+_TOKEN_RE = re.compile(f"[{WORD_CHARS}]+")
+
+
+def tokenize(text: str) -> Set[str]:
+    """Return the distinct lowercase words in text.
+
+    Uses the same word definition as KeywordMatcher, so a single-word term
+    matches a text exactly when it is in the text's token set.
+    """
+    return set(_TOKEN_RE.findall(text.lower()))
+
+
+def is_single_word(term: str) -> bool:
+    """True if term is one lowercase word, so it matches a text exactly
+    when it is in the text's tokenize() set"""
+    return _TOKEN_RE.fullmatch(term) is not None
+
+
+def _build_trie(terms: Iterable[str]) -> Dict[str, dict]:
+    trie: Dict[str, dict] = {}
+    for term in terms:
+        node = trie
+        for char in term:
+            node = node.setdefault(char, {})
+        node[""] = {}  # End-of-term marker
+    return trie
+
+
+def _trie_to_regex(node: Dict[str, dict]) -> str:
+    """Turn a character trie into a regex that shares common prefixes.
+
+    Longer terms are tried first; optional tails let the engine fall back
+    to a shorter term that ends at a word boundary.
+    """
+    is_end = "" in node
+    branches = [
+        re.escape(char) + _trie_to_regex(child)
+        for char, child in sorted(node.items())
+        if char
+    ]
+    if not branches:
+        return ""
+    if len(branches) == 1 and not is_end:
+        return branches[0]
+    pattern = "(?:" + "|".join(branches) + ")"
+    return pattern + "?" if is_end else pattern
+
+
+class KeywordMatcher:
+    """Match a fixed set of keywords against text in a single pass"""
+
+    def __init__(self, terms: Iterable[str]):
+        self.terms: Tuple[str, ...] = tuple(
+            dict.fromkeys(term.lower() for term in terms if term)
+        )
+
+        if self.terms:
+            self._pattern = re.compile(
+                rf"(?<![{WORD_CHARS}])({_trie_to_regex(_build_trie(self.terms))})(?![{WORD_CHARS}])"
+            )
+        else:
+            self._pattern = None
+
+        # The regex reports the longest term at each offset; terms that are
+        # whole-word prefixes of it ("machine" in "machine learning") match
+        # at the same offset too.
+        term_set = set(self.terms)
+        self._prefix_terms: Dict[str, List[str]] = {}
+        # After a match, resume searching at the first offset inside it where
+        # another term could start ("learning" in "machine learning").
+        self._resume_offset: Dict[str, int] = {}
+        for term in self.terms:
+            prefixes = [
+                term[:i] for i in range(1, len(term))
+                if term[:i] in term_set and not _WORD_CHAR_RE.match(term[i])
+            ]
+            if prefixes:
+                self._prefix_terms[term] = prefixes
+            self._resume_offset[term] = next(
+                (i for i in range(1, len(term)) if not _WORD_CHAR_RE.match(term[i - 1])),
+                len(term)
+            )
+
+    def scan(self, text: str) -> Dict[str, List[int]]:
+        """Map each matched term to its start offsets in text.lower()"""
+        positions: Dict[str, List[int]] = {}
+        if self._pattern is not None:
+            text_lower = text.lower()
+            search = self._pattern.search
+            pos = 0
+            while True:
+                match = search(text_lower, pos)
+                if match is None:
+                    break
+                term = match.group(1)
+                start = match.start()
+                positions.setdefault(term, []).append(start)
+                for prefix in self._prefix_terms.get(term, ()):
+                    positions.setdefault(prefix, []).append(start)
+                pos = start + self._resume_offset[term]
+
+        return positions
+
+    def count(self, text: str) -> Dict[str, int]:
+        """Map each matched term to its number of occurrences"""
+        return {term: len(starts) for term, starts in self.scan(text).items()}
+
+    def matched_terms(self, text: str) -> List[str]:
+        """Return the matched terms in dictionary order"""
+        found = self.scan(text)
+        return [term for term in self.terms if term in found]
+
+
+@lru_cache(maxsize=512)
+def _cached_matcher(terms: Tuple[str, ...]) -> KeywordMatcher:
+    return KeywordMatcher(terms)
+
+
+def get_keyword_matcher(terms: Sequence[str]) -> KeywordMatcher:
+    """Return a compiled matcher for terms, reusing one built earlier"""
+    return _cached_matcher(tuple(terms))
@@ -0,0 +1,248 @@
+"""
+Request and pipeline metrics, exposed in the Prometheus text format.
+
+MetricsMiddleware counts and times every HTTP request by endpoint (the
+route path, so ids do not multiply label values). Handlers and helpers
+time their stages with timed(); database statements and commits are
+timed by engine and session event hooks. Each request's stage timings
+can be returned in a Server-Timing header.
+
+Metrics live in this process only: a Redis parse worker records its own
+parse timings, which the API's /metrics does not include.
+"""
+from bisect import bisect_left
+from contextlib import contextmanager
+from contextvars import ContextVar
+from time import perf_counter
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+import threading
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
+from starlette.datastructures import MutableHeaders
+
+CONTENT_TYPE = "text/plain; version=0.0.4"
+
+# Seconds; stages range from sub-millisecond cache hits to multi-second PDF parses
+STAGE_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+# Every Counter and Histogram, in the order /metrics renders them
+_REGISTRY: list = []
+
+
+def _labels(names: Sequence[str], values: Sequence[str]) -> str:
+    pairs = ",".join(
+        '{}="{}"'.format(name, str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n"))
+        for name, value in zip(names, values)
+    )
+    return "{" + pairs + "}" if pairs else ""
+
+
+class Counter:
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._values: Dict[Tuple[str, ...], float] = {}
+        self._lock = threading.Lock()
+        _REGISTRY.append(self)
+
+    def inc(self, *labels: str, amount: float = 1) -> None:
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0) + amount
+
+    def value(self, *labels: str) -> float:
+        return self._values.get(labels, 0)
+
+    def render(self) -> List[str]:
+        with self._lock:
+            values = sorted(self._values.items())
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} counter"]
+        lines += [f"{self.name}{_labels(self.labelnames, labels)} {value}" for labels, value in values]
+        return lines
+
+
+class Histogram:
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = STAGE_BUCKETS
+    ):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(buckets)
+        # labels -> [per-bucket counts (last is +Inf), sum]; made cumulative when rendered
+        self._series: Dict[Tuple[str, ...], list] = {}
+        self._lock = threading.Lock()
+        _REGISTRY.append(self)
+
+    def observe(self, value: float, *labels: str) -> None:
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(labels)
+            if series is None:
+                series = self._series[labels] = [[0] * (len(self.buckets) + 1), 0.0]
+            series[0][index] += 1
+            series[1] += value
+
+    def count(self, *labels: str) -> int:
+        """Observations for one label set"""
+        series = self._series.get(labels)
+        return sum(series[0]) if series else 0
+
+    def total_count(self) -> int:
+        """Observations across every label set"""
+        with self._lock:
+            return sum(sum(counts) for counts, _ in self._series.values())
+
+    def render(self) -> List[str]:
+        with self._lock:
+            series = sorted((labels, (list(counts), total)) for labels, (counts, total) in self._series.items())
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} histogram"]
+        for labels, (counts, total) in series:
+            cumulative = 0
+            for bound, count in zip(self.buckets + ("+Inf",), counts):
+                cumulative += count
+                bucket_labels = _labels(self.labelnames + ("le",), labels + (str(bound),))
+                lines.append(f"{self.name}_bucket{bucket_labels} {cumulative}")
+            label_text = _labels(self.labelnames, labels)
+            lines.append(f"{self.name}_sum{label_text} {total}")
+            lines.append(f"{self.name}_count{label_text} {cumulative}")
+        return lines
+
+
+REQUESTS = Counter("ats_requests_total", "HTTP requests by endpoint, method and status.", ("endpoint", "method", "status"))
+REQUEST_SECONDS = Histogram("ats_request_duration_seconds", "HTTP request latency by endpoint.", ("endpoint",))
+STAGE_SECONDS = Histogram(
+    "ats_stage_duration_seconds",
+    "Time spent per pipeline stage; detail is e.g. the file type for parse or the statement for db.",
+    ("stage", "detail")
+)
+PIPELINE_REQUESTS = Counter(
+    "ats_pipeline_requests_total",
+    "Parse, JD, compile and score requests by platform and persona.",
+    ("endpoint", "platform", "persona")
+)
+
+# Stage timings of the request being handled, for the Server-Timing header
+_request_stages: ContextVar[Optional[List[Tuple[str, float]]]] = ContextVar("request_stages", default=None)
+
+
+def record_stage(stage: str, seconds: float, detail: str = "") -> None:
+    STAGE_SECONDS.observe(seconds, stage, detail)
+    stages = _request_stages.get()
+    if stages is not None:
+        stages.append((stage, seconds))
+
+
+@contextmanager
+def timed(stage: str, detail: str = "") -> Iterator[None]:
+    """Time the block as one occurrence of a pipeline stage"""
+    start = perf_counter()
+    try:
+        yield
+    finally:
+        record_stage(stage, perf_counter() - start, detail)
+
+
+def count_pipeline_request(endpoint: str, platform: str = "", persona: str = "") -> None:
+    PIPELINE_REQUESTS.inc(endpoint, platform, persona)
+
+
+def render_metrics() -> str:
+    lines: List[str] = []
+    for metric in _REGISTRY:
+        lines += metric.render()
+    return "\n".join(lines) + "\n"
+
+
+def server_timing(stages: Sequence[Tuple[str, float]], total: float) -> str:
+    """Server-Timing value with each stage's total milliseconds, in first-seen order"""
+    durations: Dict[str, float] = {}
+    for stage, seconds in stages:
+        durations[stage] = durations.get(stage, 0.0) + seconds
+    durations["total"] = total
+    return ", ".join(f"{stage};dur={seconds * 1000:.2f}" for stage, seconds in durations.items())
+
+
+def instrument_database(*engines: Engine) -> None:
+    """Time every statement on engines, and every session commit, as the db stage"""
+    for engine in engines:
+        event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+        event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+    if not event.contains(Session, "before_commit", _before_commit):
+        event.listen(Session, "before_commit", _before_commit)
+        event.listen(Session, "after_commit", _after_commit)
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info["query_started"] = perf_counter()
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    started = conn.info.pop("query_started", None)
+    if started is not None:
+        record_stage("db", perf_counter() - started, statement.lstrip().partition(" ")[0].lower())
+
+
+def _before_commit(session):
+    session.info["commit_started"] = perf_counter()
+
+
+def _after_commit(session):
+    started = session.info.pop("commit_started", None)
+    if started is not None:
+        record_stage("db", perf_counter() - started, "commit")
+
+
+class MetricsMiddleware:
+    """ASGI middleware counting and timing requests, optionally adding Server-Timing"""
+
+    def __init__(self, app, server_timing_header: bool = False):
+        self.app = app
+        self.server_timing_header = server_timing_header
+        self._route_paths: Dict[object, str] = {}
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        stages: List[Tuple[str, float]] = []
+        token = _request_stages.set(stages)
+        start = perf_counter()
+        status = 500
+
+        async def send_with_metrics(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                if self.server_timing_header:
+                    headers = MutableHeaders(scope=message)
+                    headers.append("Server-Timing", server_timing(stages, perf_counter() - start))
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_metrics)
+        finally:
+            _request_stages.reset(token)
+            elapsed = perf_counter() - start
+            endpoint = self._route_path(scope)
+            REQUESTS.inc(endpoint, scope["method"], str(status))
+            REQUEST_SECONDS.observe(elapsed, endpoint)
+
+    def _route_path(self, scope) -> str:
+        # The router records the matched endpoint function in the scope
+        endpoint = scope.get("endpoint")
+        if endpoint is None:
+            return "unmatched"
+        path = self._route_paths.get(endpoint)
+        if path is None:
+            routes = getattr(scope.get("app"), "routes", ())
+            path = next((route.path for route in routes if getattr(route, "endpoint", None) is endpoint), "unmatched")
+            self._route_paths[endpoint] = path
+        return path
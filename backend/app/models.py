@@ -1,5 +1,4 @@
-from sqlalchemy import Column, String, Text, JSON, DateTime, ForeignKey, Float
-from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy import Column, String, Text, JSON, DateTime, ForeignKey, Float, Integer, Boolean, Index, LargeBinary, Uuid
 from sqlalchemy.sql import func
 import uuid
 from .db import Base
@@ -7,41 +6,135 @@ from .db import Base
 
 class Resume(Base):
     __tablename__ = "resumes"
+    __table_args__ = (
+        # Keyset pagination of a user's resumes
+        Index("ix_resumes_user_id_created_at_id", "user_id", "created_at", "id"),
+    )
     
-    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    id = Column(Uuid, primary_key=True, default=uuid.uuid4)
+    user_id = Column(String, nullable=False)
+    raw_text = Column(Text, nullable=False)
+    parsed_json = Column(JSON, nullable=True)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+
+
+class ParseJob(Base):
+    """Background parse of an uploaded resume; resume_id is the id the parsed Resume gets"""
+    __tablename__ = "parse_jobs"
+    
+    resume_id = Column(Uuid, primary_key=True, default=uuid.uuid4)
     user_id = Column(String, nullable=False, index=True)
+    filename = Column(String, nullable=False)
+    status = Column(String, nullable=False, default="queued")  # queued, parsing, done, failed
+    progress = Column(Float, nullable=False, default=0.0)
+    error = Column(Text, nullable=True)
+    content_hash = Column(String(64), nullable=True, index=True)  # SHA-256 of the uploaded file
+    cached = Column(Boolean, nullable=False, default=False)  # Result came from the parse cache
+    owner_id = Column(String(32), nullable=True)  # Process holding the task (parse_queue.claim_parse_job)
+    heartbeat_at = Column(DateTime(timezone=True), nullable=True)  # Last sign of life from the owner
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+
+
+class ParseCacheEntry(Base):
+    """Parse result keyed by uploaded file hash, file type and parser version"""
+    __tablename__ = "parse_cache"
+    
+    content_hash = Column(String(64), primary_key=True)
+    file_type = Column(String, primary_key=True)
+    parser_version = Column(Integer, primary_key=True)
     raw_text = Column(Text, nullable=False)
     parsed_json = Column(JSON, nullable=True)
+    size_bytes = Column(Integer, nullable=False)
+    hits = Column(Integer, nullable=False, default=0)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
+    last_used_at = Column(DateTime(timezone=True), server_default=func.now(), index=True)
+
+
+class ResumeTerm(Base):
+    """Inverted index posting: one row per distinct token in a resume"""
+    __tablename__ = "resume_terms"
+    
+    term = Column(String, primary_key=True)
+    resume_id = Column(Uuid, ForeignKey("resumes.id"), primary_key=True, index=True)
+
+
+class JDTermFrequency(Base):
+    """Number of stored JDs containing a keyword candidate; the "" row counts the JDs"""
+    __tablename__ = "jd_term_frequencies"
+    
+    term = Column(String, primary_key=True)
+    document_count = Column(Integer, nullable=False, default=0)
 
 
 class JobDescription(Base):
     __tablename__ = "job_descriptions"
+    __table_args__ = (
+        # Bulk ingestion dedupes on the normalized text per platform
+        Index("ix_job_descriptions_text_hash_platform", "text_hash", "platform"),
+    )
     
-    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    id = Column(Uuid, primary_key=True, default=uuid.uuid4)
     platform = Column(String, nullable=False)  # linkedin, indeed, dice
     raw_text = Column(Text, nullable=False)
+    text_hash = Column(String(64), nullable=True)  # jd_text_hash(raw_text)
     extracted_signals = Column(JSON, nullable=True)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
 
 
 class ResumeVariant(Base):
     __tablename__ = "resume_variants"
+    __table_args__ = (
+        # Keyset pagination, unfiltered or by resume / JD
+        Index("ix_resume_variants_created_at_id", "created_at", "id"),
+        Index("ix_resume_variants_resume_id_created_at_id", "resume_id", "created_at", "id"),
+        Index("ix_resume_variants_jd_id_created_at_id", "jd_id", "created_at", "id"),
+        # One variant per set of compile inputs (variant_store.variant_input_hash)
+        Index("ix_resume_variants_resume_id_jd_id_input_hash", "resume_id", "jd_id", "input_hash", unique=True),
+    )
     
-    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
-    resume_id = Column(UUID(as_uuid=True), ForeignKey("resumes.id"), nullable=False, index=True)
-    jd_id = Column(UUID(as_uuid=True), ForeignKey("job_descriptions.id"), nullable=False, index=True)
+    id = Column(Uuid, primary_key=True, default=uuid.uuid4)
+    resume_id = Column(Uuid, ForeignKey("resumes.id"), nullable=False)
+    jd_id = Column(Uuid, ForeignKey("job_descriptions.id"), nullable=False)
     persona = Column(String, nullable=False)  # ic, architect, hybrid
     platform = Column(String, nullable=False)  # linkedin, indeed, dice
-    compiled_text = Column(Text, nullable=False)
+    compiled_text = Column(Text, nullable=True)  # Only on variants stored before text_hash
+    text_hash = Column(String(64), ForeignKey("variant_texts.text_hash"), nullable=True)
+    input_hash = Column(String(64), nullable=True)  # variant_store.variant_input_hash
     scores = Column(JSON, nullable=True)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
 
 
+class VariantText(Base):
+    """Compiled variant text, zlib-compressed and stored once however many variants share it"""
+    __tablename__ = "variant_texts"
+    
+    text_hash = Column(String(64), primary_key=True)  # SHA-256 of the text
+    compressed = Column(LargeBinary, nullable=False)
+    size_bytes = Column(Integer, nullable=False)  # Uncompressed UTF-8 size
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+
+
 class ApplicationOutcome(Base):
     __tablename__ = "application_outcomes"
+    __table_args__ = (
+        # Keyset pagination, unfiltered or by variant
+        Index("ix_application_outcomes_recorded_at_id", "recorded_at", "id"),
+        Index("ix_application_outcomes_variant_id_recorded_at_id", "variant_id", "recorded_at", "id"),
+    )
     
-    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
-    variant_id = Column(UUID(as_uuid=True), ForeignKey("resume_variants.id"), nullable=False, index=True)
+    id = Column(Uuid, primary_key=True, default=uuid.uuid4)
+    variant_id = Column(Uuid, ForeignKey("resume_variants.id"), nullable=False)
     status = Column(String, nullable=False)  # rejected, interview, ghosted
     recorded_at = Column(DateTime(timezone=True), server_default=func.now())
+
+
+class OutcomeRollup(Base):
+    """Number of outcomes per platform, persona, survivability bucket and status"""
+    __tablename__ = "outcome_rollups"
+    
+    platform = Column(String, primary_key=True)
+    persona = Column(String, primary_key=True)
+    survivability_bucket = Column(Integer, primary_key=True)  # outcome_rollups.survivability_bucket
+    status = Column(String, primary_key=True)
+    outcome_count = Column(Integer, nullable=False, default=0)
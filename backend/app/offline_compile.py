@@ -0,0 +1,642 @@
+"""
+Offline batch compilation of directories of resumes and job descriptions.
+
+`python -m app.cli compile` runs this without the HTTP server: every
+resume x JD x persona x platform variant and its scores are written to a
+JSONL or CSV file, or stored in the database as POST
+/variants/compile:batch would store them.
+
+Each file is parsed once, in a process pool. The work is then split into
+chunks of one resume x up to chunk_size JDs, whose scores come from a
+single score_matrix call. Chunks are spread across a process pool with at
+most CHUNKS_PER_WORKER per worker in flight, and written out in the order
+they finish.
+
+The checkpoint (JSONL) holds the run's settings and parsed inputs, then
+one line per finished chunk with the output's size once it was written.
+Running the same command again skips finished chunks, first truncating
+the output to the last checkpointed size so that a chunk cut off by a
+crash is written once, not twice. In the database, variants of the same
+resume and JD already stored with the same input hash are skipped too,
+which covers a crash between a chunk's commit and its checkpoint line,
+and resumes and JDs already stored are reused rather than inserted again.
+
+JD keywords are ranked against this process's document frequencies, so
+a file run scores like the API only if they were loaded from the stored
+corpus first; the compile command does that whenever the database is
+reachable, and a database run always does.
+"""
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from dataclasses import asdict, dataclass
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Set, Tuple
+import abc
+import csv
+import io
+import json
+import os
+import sys
+import time
+import uuid
+
+from sqlalchemy import insert, select
+from sqlalchemy.orm import Session
+
+from .bulk_scoring import SCORE_KEYS, pair_scores, score_matrix
+from .compiler import COMPILER_VERSION, compile_resume_variant, find_matching_skills
+from .config import settings
+from .jd_extract import SIGNALS_VERSION, jd_text_hash
+from .jd_idf import apply_jd_terms, record_jd_terms, refresh_document_frequencies
+from .jd_ingest import chunked, extract_signals_bulk
+from .models import JobDescription, Resume
+from .parse_queue import store_parsed_resume
+from .parsing import PARSER_VERSION, build_parsed_json, extract_text, is_supported_file
+from .platform_profiles import platform_registry
+from .score_cache import scorer_version
+from .variant_store import insert_variants, store_compiled_texts, stored_variant_ids_by_jd, variant_input_hash
+
+PERSONAS = ("ic", "architect", "hybrid")
+OUTPUT_FORMATS = {".jsonl": "jsonl", ".ndjson": "jsonl", ".csv": "csv"}
+CSV_FIELDS = ["resume", "jd", "persona", "platform", *SCORE_KEYS, "survivability", "compiled_text"]
+
+# Enough queued chunks to keep workers busy without piling up finished ones
+CHUNKS_PER_WORKER = 2
+PROGRESS_SECONDS = 2.0
+
+
+@dataclass
+class OfflineCompileOptions:
+    resume_dir: str
+    jd_dir: str
+    personas: List[str]
+    platforms: List[str]
+    output: Optional[str] = None  # .jsonl or .csv file; None stores variants in the database
+    output_format: Optional[str] = None  # jsonl or csv; None = from the output's extension
+    checkpoint: Optional[str] = None  # None = output + ".checkpoint"
+    chunk_size: int = 25  # JDs per chunk
+    workers: Optional[int] = None  # None = BATCH_MAX_WORKERS or one per CPU
+    scores_only: bool = False  # Skip compiling; write scores only
+    user_id: str = "batch"  # Owner of resumes stored in the database
+    jd_platform: Optional[str] = None  # Platform of JDs stored in the database; None = the default platform
+    restart: bool = False  # Ignore an existing checkpoint and output
+
+
+def list_input_files(directory: str) -> List[Dict[str, Any]]:
+    """Supported files under directory, sorted by their path relative to it"""
+    files = []
+    for root, dirs, names in os.walk(directory):
+        dirs[:] = [name for name in dirs if not name.startswith(".")]
+        for name in names:
+            if name.startswith(".") or not is_supported_file(name):
+                continue
+            path = os.path.join(root, name)
+            stat = os.stat(path)
+            files.append({
+                "name": os.path.relpath(path, directory),
+                "path": path,
+                "size": stat.st_size,
+                "mtime_ns": stat.st_mtime_ns,
+            })
+    return sorted(files, key=lambda f: f["name"])
+
+
+def _read_input(task: Tuple[str, str, bool]) -> Dict[str, Any]:
+    path, name, is_resume = task
+    try:
+        raw_text = extract_text(path, name, settings.PDF_MAX_PAGES)
+    except Exception as e:
+        return {"error": f"{type(e).__name__}: {e}"}
+    if not raw_text.strip():
+        return {"error": "No text could be extracted"}
+    if is_resume:
+        return {"raw_text": raw_text, "parsed_json": build_parsed_json(raw_text)}
+    return {"raw_text": raw_text}
+
+
+def parse_inputs(
+    resume_files: List[Dict[str, Any]],
+    jd_files: List[Dict[str, Any]],
+    workers: int
+) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
+    """Parse every file once; files that fail keep their error instead of text"""
+    tasks = [(f["path"], f["name"], True) for f in resume_files] + [(f["path"], f["name"], False) for f in jd_files]
+    if workers < 2 or len(tasks) < 2:
+        results = [_read_input(task) for task in tasks]
+    else:
+        with ProcessPoolExecutor(max_workers=min(workers, len(tasks))) as pool:
+            results = list(pool.map(_read_input, tasks, chunksize=max(1, len(tasks) // (workers * 4))))
+
+    def described(files, parsed):
+        return [
+            {"name": f["name"], "size": f["size"], "mtime_ns": f["mtime_ns"], **result}
+            for f, result in zip(files, parsed)
+        ]
+
+    resumes = described(resume_files, results[:len(resume_files)])
+    jds = described(jd_files, results[len(resume_files):])
+    parsed_jds = [jd for jd in jds if "error" not in jd]
+    if parsed_jds:
+        signals, terms = extract_signals_bulk([jd["raw_text"] for jd in parsed_jds], max_workers=workers)
+        for jd, jd_signals, jd_terms in zip(parsed_jds, signals, terms):
+            jd["signals"], jd["terms"] = jd_signals, jd_terms
+    return resumes, jds
+
+
+def compile_chunk(
+    resume: Dict[str, Any],
+    jds: Sequence[Dict[str, Any]],
+    personas: Sequence[str],
+    platforms: Sequence[str],
+    scores_only: bool = False
+) -> List[Dict[str, Any]]:
+    """Every persona x platform variant of resume against each of jds, with its scores"""
+    matrix = score_matrix(
+        [resume["raw_text"]], [jd["raw_text"] for jd in jds], [jd["signals"] for jd in jds], platforms
+    )
+    rows = []
+    for j, jd in enumerate(jds):
+        scores = {platform: pair_scores(matrix, 0, j, platform) for platform in platforms}
+        matching_skills = None
+        if not scores_only:
+            matching_skills = find_matching_skills(resume["raw_text"], jd["signals"].get("top_terms", []))
+        for persona in personas:
+            for platform in platforms:
+                row = {
+                    "resume": resume["name"],
+                    "jd": jd["name"],
+                    "persona": persona,
+                    "platform": platform,
+                    "scores": scores[platform],
+                }
+                if not scores_only:
+                    row["compiled_text"] = compile_resume_variant(
+                        resume["raw_text"],
+                        jd["raw_text"],
+                        persona,
+                        platform,
+                        jd_signals=jd["signals"],
+                        resume_sections=resume["parsed_json"]["sections"],
+                        matching_skills=matching_skills
+                    )
+                rows.append(row)
+    return rows
+
+
+# Per-process inputs, set once by the pool initializer so they are not
+# pickled into every task
+_worker_inputs: Dict[str, Any] = {}
+
+
+def _init_worker(resumes, jds, personas, platforms, scores_only) -> None:
+    _worker_inputs.update(resumes=resumes, jds=jds, personas=personas, platforms=platforms, scores_only=scores_only)
+
+
+def _compile_task(task: Tuple[int, int, int, int]) -> Tuple[int, List[Dict[str, Any]]]:
+    chunk_id, resume_index, jd_start, jd_end = task
+    inputs = _worker_inputs
+    return chunk_id, compile_chunk(
+        inputs["resumes"][resume_index],
+        inputs["jds"][jd_start:jd_end],
+        inputs["personas"],
+        inputs["platforms"],
+        inputs["scores_only"]
+    )
+
+
+def iter_chunk_results(
+    tasks: List[Tuple[int, int, int, int]],
+    resumes: List[Dict[str, Any]],
+    jds: List[Dict[str, Any]],
+    personas: List[str],
+    platforms: List[str],
+    scores_only: bool,
+    workers: int
+) -> Iterator[Tuple[int, List[Dict[str, Any]]]]:
+    """(chunk_id, rows) for each task, in the order the chunks finish"""
+    initargs = (resumes, jds, personas, platforms, scores_only)
+    if workers < 2 or len(tasks) < 2:
+        _init_worker(*initargs)
+        for task in tasks:
+            yield _compile_task(task)
+        return
+
+    queued = iter(tasks)
+    running: Set[Any] = set()
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=initargs) as pool:
+        try:
+            while True:
+                while len(running) < workers * CHUNKS_PER_WORKER:
+                    task = next(queued, None)
+                    if task is None:
+                        break
+                    running.add(pool.submit(_compile_task, task))
+                if not running:
+                    return
+                finished, running = wait(running, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    yield future.result()
+        finally:
+            for future in running:
+                future.cancel()
+
+
+class Checkpoint:
+    """Append-only JSONL record of a run's settings, parsed inputs and finished chunks"""
+
+    def __init__(self, path: str):
+        self.path = path
+        self.run: Optional[Dict[str, Any]] = None
+        self.resumes: List[Dict[str, Any]] = []
+        self.jds: List[Dict[str, Any]] = []
+        self.done: Set[int] = set()
+        self.offset = 0
+        self._file = None
+
+    def load(self) -> bool:
+        """Read an existing checkpoint; False if there is none or its inputs were never fully written"""
+        if not os.path.exists(self.path):
+            return False
+        complete, good_size = False, 0
+        with open(self.path, "rb") as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    break  # Cut off by a crash; everything after it is rewritten
+                good_size += len(line)
+                if "run" in entry:
+                    self.run = entry["run"]
+                elif "resume" in entry:
+                    self.resumes.append(entry["resume"])
+                elif "jd" in entry:
+                    self.jds.append(entry["jd"])
+                elif "inputs_complete" in entry:
+                    complete = True
+                elif "chunk" in entry:
+                    self.done.add(entry["chunk"])
+                    self.offset = entry["offset"]
+        if not complete:
+            return False
+        self._file = open(self.path, "r+b")
+        self._file.truncate(good_size)
+        self._file.seek(good_size)
+        return True
+
+    def start(self, run: Dict[str, Any], resumes: List[Dict[str, Any]], jds: List[Dict[str, Any]]) -> None:
+        """Write a new checkpoint, replacing any existing one"""
+        self.run, self.resumes, self.jds, self.done, self.offset = run, resumes, jds, set(), 0
+        self._file = open(self.path, "wb")
+        self._append({"run": run})
+        for resume in resumes:
+            self._append({"resume": resume})
+        for jd in jds:
+            self._append({"jd": jd})
+        self._append({"inputs_complete": True})
+
+    def chunk_done(self, chunk_id: int, offset: int) -> None:
+        self._append({"chunk": chunk_id, "offset": offset})
+        self.done.add(chunk_id)
+        self.offset = offset
+
+    def _append(self, entry: Dict[str, Any]) -> None:
+        self._file.write(json.dumps(entry).encode() + b"\n")
+        self._file.flush()
+        os.fsync(self._file.fileno())
+
+    def close(self) -> None:
+        if self._file is not None:
+            self._file.close()
+
+
+class FileSink(abc.ABC):
+    """Appends chunks to the output file; write returns the file's size after the chunk"""
+
+    def __init__(self, path: str, offset: int, scores_only: bool):
+        self.scores_only = scores_only
+        self._file = open(path, "r+b" if os.path.exists(path) else "w+b")
+        self._file.truncate(offset)
+        self._file.seek(offset)
+        if offset == 0:
+            self._file.write(self.preamble())
+
+    def preamble(self) -> bytes:
+        return b""
+
+    @abc.abstractmethod
+    def encode(self, rows: List[Dict[str, Any]]) -> bytes:
+        """The chunk's rows as they are appended to the file"""
+
+    def write(self, rows: List[Dict[str, Any]]) -> int:
+        self._file.write(self.encode(rows))
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        return self._file.tell()
+
+    def close(self) -> None:
+        self._file.close()
+
+
+class JSONLSink(FileSink):
+    def encode(self, rows: List[Dict[str, Any]]) -> bytes:
+        return "".join(json.dumps(row) + "\n" for row in rows).encode()
+
+
+class CSVSink(FileSink):
+    def _fields(self) -> List[str]:
+        return CSV_FIELDS[:-1] if self.scores_only else CSV_FIELDS
+
+    def _csv(self, rows: List[List[Any]]) -> bytes:
+        buffer = io.StringIO()
+        csv.writer(buffer).writerows(rows)
+        return buffer.getvalue().encode()
+
+    def preamble(self) -> bytes:
+        return self._csv([self._fields()])
+
+    def encode(self, rows: List[Dict[str, Any]]) -> bytes:
+        return self._csv([
+            [row["resume"], row["jd"], row["persona"], row["platform"],
+             *(row["scores"][key] for key in SCORE_KEYS), row["scores"]["survivability"],
+             *(() if self.scores_only else (row["compiled_text"],))]
+            for row in rows
+        ])
+
+
+class DatabaseSink:
+    """Stores each chunk's variants in one transaction, skipping ones already stored"""
+
+    def __init__(self, db: Session, resumes: List[Dict[str, Any]], jds: List[Dict[str, Any]]):
+        self.db = db
+        self.resumes = {resume["name"]: resume for resume in resumes}
+        self.jds = {jd["name"]: jd for jd in jds}
+
+    def write(self, rows: List[Dict[str, Any]]) -> int:
+        keys = [
+            (
+                uuid.UUID(self.resumes[row["resume"]]["id"]),
+                uuid.UUID(self.jds[row["jd"]]["id"]),
+                variant_input_hash(
+                    self.resumes[row["resume"]]["raw_text"], self.jds[row["jd"]]["raw_text"],
+                    row["persona"], row["platform"], self.jds[row["jd"]]["signals"]
+                )
+            )
+            for row in rows
+        ]
+        stored = set()
+        for resume_id in {key[0] for key in keys}:  # One per chunk
+            resume_keys = [key for key in keys if key[0] == resume_id]
+            stored.update(
+                (resume_id, jd_id, input_hash)
+                for jd_id, input_hash in stored_variant_ids_by_jd(
+                    self.db, resume_id, list({key[1] for key in resume_keys}), [key[2] for key in resume_keys]
+                )
+            )
+        new = [(row, key) for row, key in zip(rows, keys) if key not in stored]
+        if new:
+            text_hashes = store_compiled_texts(self.db, [row["compiled_text"] for row, _ in new])
+            insert_variants(self.db, [
+                {
+                    "id": uuid.uuid4(),
+                    "resume_id": resume_id,
+                    "jd_id": jd_id,
+                    "persona": row["persona"],
+                    "platform": row["platform"],
+                    "text_hash": text_hash,
+                    "input_hash": input_hash,
+                    "scores": row["scores"],
+                }
+                for (row, (resume_id, jd_id, input_hash)), text_hash in zip(new, text_hashes)
+            ])
+        self.db.commit()
+        return 0
+
+    def close(self) -> None:
+        pass
+
+
+def assign_database_ids(
+    db: Session,
+    resumes: List[Dict[str, Any]],
+    jds: List[Dict[str, Any]],
+    user_id: str,
+    jd_platform: str
+) -> None:
+    """
+    Give each input the id of its row. Resumes the user already stored with
+    the same text, and JDs stored with the same text and platform, are
+    reused, so a restarted run adds no duplicate rows.
+    """
+    for resume in resumes:
+        existing = db.execute(
+            select(Resume.id)
+            .where(Resume.user_id == user_id, Resume.raw_text == resume["raw_text"])
+            .limit(1)
+        ).scalar()
+        resume["id"] = str(existing or uuid.uuid4())
+    for jd in jds:
+        jd["text_hash"] = jd_text_hash(jd["raw_text"])
+        existing = db.execute(
+            select(JobDescription.id)
+            .where(JobDescription.text_hash == jd["text_hash"], JobDescription.platform == jd_platform)
+            .limit(1)
+        ).scalar()
+        jd["id"] = str(existing or uuid.uuid4())
+
+
+def store_inputs(
+    db: Session,
+    resumes: List[Dict[str, Any]],
+    jds: List[Dict[str, Any]],
+    user_id: str,
+    jd_platform: str
+) -> None:
+    """Insert the resumes and JDs whose rows do not exist yet, as the upload and JD endpoints would"""
+    def existing(model, ids):
+        found = set()
+        for batch in chunked(ids, 500):
+            found.update(str(row_id) for row_id in db.execute(
+                select(model.id).where(model.id.in_([uuid.UUID(row_id) for row_id in batch]))
+            ).scalars())
+        return found
+
+    stored_resumes = existing(Resume, [resume["id"] for resume in resumes])
+    for resume in resumes:
+        if resume["id"] not in stored_resumes:
+            store_parsed_resume(db, uuid.UUID(resume["id"]), user_id, resume)
+    stored_jds = existing(JobDescription, [jd["id"] for jd in jds])
+    new_jds = [jd for jd in jds if jd["id"] not in stored_jds]
+    if new_jds:
+        db.execute(insert(JobDescription), [
+            {
+                "id": uuid.UUID(jd["id"]),
+                "platform": jd_platform,
+                "raw_text": jd["raw_text"],
+                "text_hash": jd["text_hash"],
+                "extracted_signals": jd["signals"],
+            }
+            for jd in new_jds
+        ])
+    term_counts = record_jd_terms(db, [jd["terms"] for jd in new_jds])
+    db.commit()
+    apply_jd_terms(term_counts)
+
+
+class Progress:
+    """Prints pairs done, rate and ETA to stream at most every PROGRESS_SECONDS; None prints nothing"""
+
+    def __init__(self, total_pairs: int, done_pairs: int, stream=sys.stderr):
+        self.total_pairs = total_pairs
+        self.pairs = done_pairs
+        self.variants = 0
+        self.stream = stream
+        self._start_pairs = done_pairs
+        self._start = self._last = time.monotonic()
+
+    def add(self, pairs: int, variants: int) -> None:
+        self.pairs += pairs
+        self.variants += variants
+        if self.stream is not None and (
+            time.monotonic() - self._last >= PROGRESS_SECONDS or self.pairs == self.total_pairs
+        ):
+            self.report()
+
+    def report(self) -> None:
+        self._last = time.monotonic()
+        elapsed = self._last - self._start
+        rate = (self.pairs - self._start_pairs) / elapsed if elapsed > 0 else 0.0
+        eta = f"{(self.total_pairs - self.pairs) / rate:.0f}s" if rate > 0 else "?"
+        print(
+            f"{self.pairs}/{self.total_pairs} pairs  {self.variants} variants  "
+            f"{rate:.1f} pairs/s  ETA {eta}",
+            file=self.stream,
+            flush=True
+        )
+
+
+def run_signature(options: OfflineCompileOptions, output_format: Optional[str]) -> Dict[str, Any]:
+    """Everything a checkpoint's results depend on; resuming requires an exact match"""
+    run = asdict(options)
+    for key in ("workers", "restart", "checkpoint"):
+        run.pop(key)
+    for key in ("resume_dir", "jd_dir", "output"):
+        run[key] = os.path.abspath(run[key]) if run[key] else None
+    run["output_format"] = output_format
+    run["versions"] = [PARSER_VERSION, SIGNALS_VERSION, COMPILER_VERSION, scorer_version()]
+    return run
+
+
+def _file_key(entry: Dict[str, Any]) -> Tuple[str, int, int]:
+    return entry["name"], entry["size"], entry["mtime_ns"]
+
+
+def run_offline_compile(options: OfflineCompileOptions, db=None, progress: bool = True) -> Dict[str, Any]:
+    """
+    Compile and score every resume x JD x persona x platform in the input
+    directories, resuming from the checkpoint if there is one. db is
+    required when options.output is None. Raises ValueError for invalid
+    options or a checkpoint from a different run.
+    """
+    personas = [persona.lower() for persona in options.personas]
+    platforms = [platform.lower() for platform in options.platforms]
+    registry = platform_registry()
+    if not personas or any(persona not in PERSONAS for persona in personas):
+        raise ValueError(f"Personas must be among: {', '.join(PERSONAS)}")
+    if not platforms or any(platform not in registry for platform in platforms):
+        raise ValueError(f"Platforms must be among: {', '.join(registry.platforms)}")
+    if options.chunk_size < 1:
+        raise ValueError("chunk_size must be at least 1")
+    options.personas, options.platforms = personas, platforms
+
+    output_format = None
+    if options.output is not None:
+        output_format = options.output_format or OUTPUT_FORMATS.get(os.path.splitext(options.output)[1].lower())
+        if output_format not in OUTPUT_FORMATS.values():
+            raise ValueError("Output must be a .jsonl or .csv file, or pass the format")
+        checkpoint_path = options.checkpoint or options.output + ".checkpoint"
+    elif db is None:
+        raise ValueError("Pass an output file or a database session")
+    elif options.checkpoint is None:
+        raise ValueError("Storing in the database needs a checkpoint path")
+    elif options.scores_only:
+        raise ValueError("Stored variants need their compiled text; scores_only needs an output file")
+    else:
+        checkpoint_path = options.checkpoint
+        options.jd_platform = (options.jd_platform or registry.default_platform).lower()
+        if options.jd_platform not in registry:
+            raise ValueError(f"JD platform must be one of: {', '.join(registry.platforms)}")
+    workers = options.workers or settings.BATCH_MAX_WORKERS or os.cpu_count() or 1
+    run = run_signature(options, output_format)
+
+    resume_files, jd_files = list_input_files(options.resume_dir), list_input_files(options.jd_dir)
+    checkpoint = Checkpoint(checkpoint_path)
+    resumed = not options.restart and checkpoint.load()
+    if resumed:
+        if checkpoint.run != run:
+            raise ValueError(f"{checkpoint_path} is from a run with different settings; pass --restart to start over")
+        if (list(map(_file_key, checkpoint.resumes)) != list(map(_file_key, resume_files))
+                or list(map(_file_key, checkpoint.jds)) != list(map(_file_key, jd_files))):
+            raise ValueError(f"Input files changed since {checkpoint_path} was written; pass --restart to start over")
+        resumes, jds = checkpoint.resumes, checkpoint.jds
+    else:
+        checkpoint.close()
+        if options.output is None:
+            # Rank JD keywords against the stored corpus, as the JD endpoints do
+            refresh_document_frequencies(db)
+        resumes, jds = parse_inputs(resume_files, jd_files, workers)
+        if options.output is None:
+            assign_database_ids(
+                db,
+                [r for r in resumes if "error" not in r],
+                [j for j in jds if "error" not in j],
+                options.user_id,
+                options.jd_platform
+            )
+        checkpoint.start(run, resumes, jds)
+
+    failed = [
+        {"kind": kind, "name": entry["name"], "error": entry["error"]}
+        for kind, entries in (("resume", resumes), ("jd", jds))
+        for entry in entries if "error" in entry
+    ]
+    resumes = [resume for resume in resumes if "error" not in resume]
+    jds = [jd for jd in jds if "error" not in jd]
+    if options.output is None:
+        store_inputs(db, resumes, jds, options.user_id, options.jd_platform)
+        sink = DatabaseSink(db, resumes, jds)
+    else:
+        sink_class = CSVSink if output_format == "csv" else JSONLSink
+        sink = sink_class(options.output, checkpoint.offset, options.scores_only)
+
+    tasks = []
+    for resume_index in range(len(resumes)):
+        for jd_start in range(0, len(jds), options.chunk_size):
+            chunk_id = len(tasks)
+            tasks.append((chunk_id, resume_index, jd_start, min(jd_start + options.chunk_size, len(jds))))
+    pending = [task for task in tasks if task[0] not in checkpoint.done]
+    done_pairs = sum(end - start for chunk_id, _, start, end in tasks if chunk_id in checkpoint.done)
+    tracker = Progress(len(resumes) * len(jds), done_pairs, stream=sys.stderr if progress else None)
+    if progress and resumed:
+        print(f"Resuming from {checkpoint_path}: {len(tasks) - len(pending)}/{len(tasks)} chunks done", file=sys.stderr)
+
+    start = time.perf_counter()
+    chunk_pairs = {task[0]: task[3] - task[2] for task in tasks}
+    try:
+        for chunk_id, rows in iter_chunk_results(
+            pending, resumes, jds, personas, platforms, options.scores_only, workers
+        ):
+            checkpoint.chunk_done(chunk_id, sink.write(rows))
+            tracker.add(chunk_pairs[chunk_id], len(rows))
+    finally:
+        sink.close()
+        checkpoint.close()
+
+    return {
+        "resumes": len(resumes),
+        "jds": len(jds),
+        "failed": failed,
+        "chunks": len(tasks),
+        "chunks_resumed": len(tasks) - len(pending),
+        "pairs": tracker.pairs,
+        "variants": tracker.variants,
+        "seconds": time.perf_counter() - start,
+        "checkpoint": checkpoint_path,
+    }
@@ -0,0 +1,131 @@
+"""
+Outcome counts rolled up for analytics.
+
+The outcome_rollups table counts application outcomes per platform,
+persona, survivability bucket and status. Each insert bumps its row in
+the same transaction as the outcome, so grouped conversion rates are read
+from a few hundred rows at most, however many outcomes are stored.
+Survivability is bucketed into SURVIVABILITY_BUCKETS equal-width ranges
+of the variant's score; variants without one fall in UNSCORED_BUCKET.
+
+`python -m app.cli rebuild-outcome-rollups` recounts the table from the
+stored outcomes, e.g. after changing the bucket count; run it while no
+outcomes are being recorded.
+"""
+from collections import Counter
+from typing import Any, Dict, List, Optional, Tuple
+
+from sqlalchemy import delete, select
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session
+
+from .models import ApplicationOutcome, OutcomeRollup, ResumeVariant
+
+SURVIVABILITY_BUCKETS = 10
+UNSCORED_BUCKET = -1
+
+_UPSERTS = {"postgresql": postgresql.insert, "sqlite": sqlite.insert}
+
+# (platform, persona, survivability_bucket, status)
+RollupKey = Tuple[str, str, int, str]
+
+
+def survivability_bucket(scores: Optional[Dict[str, Any]]) -> int:
+    """Bucket index of a variant's survivability score, 0 to SURVIVABILITY_BUCKETS - 1"""
+    survivability = (scores or {}).get("survivability")
+    if survivability is None:
+        return UNSCORED_BUCKET
+    return min(max(int(survivability * SURVIVABILITY_BUCKETS), 0), SURVIVABILITY_BUCKETS - 1)
+
+
+def rollup_key(variant: ResumeVariant, status: str) -> RollupKey:
+    return (variant.platform, variant.persona, survivability_bucket(variant.scores), status)
+
+
+def add_rollup_counts(db: Session, counts: Dict[RollupKey, int]) -> None:
+    """Add outcome counts to the rollups. The caller commits."""
+    if not counts:
+        return
+    upsert = _UPSERTS[db.get_bind().dialect.name](OutcomeRollup)
+    table = OutcomeRollup.__table__
+    statement = upsert.on_conflict_do_update(
+        index_elements=[table.c.platform, table.c.persona, table.c.survivability_bucket, table.c.status],
+        set_={"outcome_count": table.c.outcome_count + upsert.excluded.outcome_count}
+    )
+    # Sorted so concurrent writers lock rows in the same order
+    rows = [
+        {"platform": platform, "persona": persona, "survivability_bucket": bucket, "status": status,
+         "outcome_count": count}
+        for (platform, persona, bucket, status), count in sorted(counts.items())
+    ]
+    for start in range(0, len(rows), 1000):
+        db.execute(statement, rows[start:start + 1000])
+
+
+def record_outcome_rollup(db: Session, variant: ResumeVariant, status: str) -> None:
+    """Count one new outcome of variant. The caller commits with the outcome."""
+    add_rollup_counts(db, {rollup_key(variant, status): 1})
+
+
+def bucket_range(bucket: int) -> Tuple[Optional[float], Optional[float]]:
+    if bucket == UNSCORED_BUCKET:
+        return None, None
+    return bucket / SURVIVABILITY_BUCKETS, (bucket + 1) / SURVIVABILITY_BUCKETS
+
+
+def outcome_rates(db: Session, platform: Optional[str] = None, persona: Optional[str] = None) -> List[Dict[str, Any]]:
+    """Outcome counts and interview rate per platform x persona x survivability bucket"""
+    statement = select(
+        OutcomeRollup.platform,
+        OutcomeRollup.persona,
+        OutcomeRollup.survivability_bucket,
+        OutcomeRollup.status,
+        OutcomeRollup.outcome_count
+    )
+    if platform:
+        statement = statement.where(OutcomeRollup.platform == platform)
+    if persona:
+        statement = statement.where(OutcomeRollup.persona == persona)
+
+    groups: Dict[Tuple[str, str, int], Dict[str, int]] = {}
+    for row_platform, row_persona, bucket, status, count in db.execute(statement):
+        groups.setdefault((row_platform, row_persona, bucket), {})[status] = count
+
+    rates = []
+    for (row_platform, row_persona, bucket), statuses in sorted(groups.items()):
+        outcomes = sum(statuses.values())
+        if not outcomes:
+            continue
+        survivability_min, survivability_max = bucket_range(bucket)
+        rates.append({
+            "platform": row_platform,
+            "persona": row_persona,
+            "survivability_min": survivability_min,
+            "survivability_max": survivability_max,
+            "outcomes": outcomes,
+            "interviews": statuses.get("interview", 0),
+            "interview_rate": round(statuses.get("interview", 0) / outcomes, 4),
+            "statuses": statuses,
+        })
+    return rates
+
+
+def rebuild_outcome_rollups(db: Session, batch_size: int = 5000) -> int:
+    """Recount the rollups from every stored outcome in one transaction; returns the outcomes counted"""
+    counts: Counter = Counter()
+    outcomes = 0
+    query = (
+        select(ResumeVariant.platform, ResumeVariant.persona, ResumeVariant.scores, ApplicationOutcome.status)
+        .select_from(ApplicationOutcome)
+        .join(ResumeVariant, ResumeVariant.id == ApplicationOutcome.variant_id)
+        .execution_options(yield_per=batch_size)
+    )
+    for partition in db.execute(query).partitions():
+        for platform, persona, scores, status in partition:
+            counts[(platform, persona, survivability_bucket(scores), status)] += 1
+        outcomes += len(partition)
+
+    db.execute(delete(OutcomeRollup))
+    add_rollup_counts(db, counts)
+    db.commit()
+    return outcomes
@@ -0,0 +1,108 @@
+"""
+Keyset pagination and column projection for list endpoints.
+
+Pages are ordered by (created_at, id) and continue from an opaque cursor
+naming the last row of the previous page, so every page is an index range
+scan no matter how deep the client pages. Only the requested columns are
+selected, and rows come back as plain dicts without ORM hydration. The
+helpers only build statements and shape rows, so they work with sync and
+async sessions alike.
+"""
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+import base64
+import json
+import uuid
+
+from sqlalchemy import Column, Row, Select, func, literal, select, tuple_
+
+
+def encode_cursor(created_at: datetime, row_id: uuid.UUID) -> str:
+    """Opaque cursor pointing just after the given row"""
+    payload = json.dumps([created_at.isoformat(), str(row_id)])
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, uuid.UUID]:
+    """Inverse of encode_cursor; raises ValueError for malformed cursors"""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        created_at, row_id = json.loads(base64.urlsafe_b64decode(padded))
+        return datetime.fromisoformat(created_at), uuid.UUID(row_id)
+    except (ValueError, TypeError):
+        raise ValueError("Invalid cursor")
+
+
+def select_columns(
+    model,
+    fields: Optional[str],
+    sort_key: Tuple[Column, Column],
+    large_fields: Sequence[str] = ()
+) -> List[Column]:
+    """
+    Resolve a comma-separated fields parameter to the columns to select.
+
+    Without fields, every column except large_fields is returned. The sort
+    key columns are always included since the cursor is built from them.
+    Raises ValueError for unknown field names.
+    """
+    available = list(model.__table__.columns.keys())
+    if fields is None:
+        names = [name for name in available if name not in large_fields]
+    else:
+        names = [name.strip() for name in fields.split(",") if name.strip()]
+        unknown = [name for name in names if name not in available]
+        if unknown:
+            raise ValueError(
+                f"Unknown field(s): {', '.join(unknown)}. Available: {', '.join(available)}"
+            )
+
+    names = list(dict.fromkeys([*names, *(column.key for column in sort_key)]))
+    return [getattr(model, name) for name in names]
+
+
+def keyset_statement(
+    statement: Select,
+    sort_key: Tuple[Column, Column],
+    cursor: Optional[str],
+    limit: int
+) -> Select:
+    """
+    Restrict statement to the page after cursor. One extra row is fetched
+    to tell whether another page follows; pass the result rows to
+    keyset_rows. Raises ValueError for malformed cursors.
+    """
+    created_column, id_column = sort_key
+    if cursor:
+        created_at, row_id = decode_cursor(cursor)
+        # Compare against the cursor row's stored timestamp rather than its
+        # round-tripped text, which backends may store at another precision
+        stored_created_at = (
+            select(created_column).where(id_column == literal(row_id, id_column.type)).scalar_subquery()
+        )
+        statement = statement.where(
+            tuple_(created_column, id_column) > tuple_(
+                func.coalesce(stored_created_at, literal(created_at, created_column.type)),
+                literal(row_id, id_column.type)
+            )
+        )
+    return statement.order_by(created_column, id_column).limit(limit + 1)
+
+
+def keyset_rows(
+    rows: Sequence[Row],
+    sort_key: Tuple[Column, Column],
+    limit: int
+) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+    """
+    Turn the rows of a keyset_statement into one page of dicts plus the
+    cursor for the next page (None on the last page).
+    """
+    created_column, id_column = sort_key
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        last = rows[-1]
+        next_cursor = encode_cursor(getattr(last, created_column.key), getattr(last, id_column.key))
+
+    return [row._asdict() for row in rows], next_cursor
@@ -0,0 +1,134 @@
+"""
+Content-addressed cache of resume parse results.
+
+Entries are keyed by the SHA-256 of the uploaded bytes, the file type and
+PARSER_VERSION, so re-uploading a file skips parsing entirely. The table is
+kept within PARSE_CACHE_MAX_ENTRIES / PARSE_CACHE_MAX_BYTES by evicting the
+least recently used entries.
+"""
+from typing import Any, Dict, Optional
+import logging
+import threading
+
+from sqlalchemy import func, tuple_
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from .config import settings
+from .models import ParseCacheEntry
+from .parsing import PARSER_VERSION
+
+logger = logging.getLogger(__name__)
+
+
+class ParseCacheStats:
+    """Hit/miss/eviction counters for this process"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def record(self, hits: int = 0, misses: int = 0, evictions: int = 0) -> None:
+        with self._lock:
+            self.hits += hits
+            self.misses += misses
+            self.evictions += evictions
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+            }
+
+
+parse_cache_stats = ParseCacheStats()
+
+
+def get_cached_parse(db: Session, content_hash: str, file_type: str) -> Optional[ParseCacheEntry]:
+    """Look up a cached parse and mark it as recently used. The caller commits."""
+    entry = db.get(ParseCacheEntry, (content_hash, file_type, PARSER_VERSION))
+    if entry is None:
+        parse_cache_stats.record(misses=1)
+        return None
+
+    parse_cache_stats.record(hits=1)
+    entry.hits = ParseCacheEntry.hits + 1
+    entry.last_used_at = func.now()
+    return entry
+
+
+def store_parse_result(db: Session, content_hash: str, file_type: str, parsed_data: Dict[str, Any]) -> None:
+    """Cache a parse result, then evict old entries if the cache is over its bounds"""
+    raw_text = parsed_data["raw_text"]
+    db.add(ParseCacheEntry(
+        content_hash=content_hash,
+        file_type=file_type,
+        parser_version=PARSER_VERSION,
+        raw_text=raw_text,
+        parsed_json=parsed_data.get("parsed_json"),
+        size_bytes=len(raw_text.encode("utf-8")),
+        hits=0
+    ))
+    try:
+        db.commit()
+    except IntegrityError:
+        # Another worker cached the same file first
+        db.rollback()
+        return
+
+    evict_parse_cache(db)
+
+
+def evict_parse_cache(
+    db: Session,
+    max_entries: Optional[int] = None,
+    max_bytes: Optional[int] = None
+) -> int:
+    """Delete least recently used entries until the cache is within bounds"""
+    max_entries = settings.PARSE_CACHE_MAX_ENTRIES if max_entries is None else max_entries
+    max_bytes = settings.PARSE_CACHE_MAX_BYTES if max_bytes is None else max_bytes
+
+    entries, total_bytes = db.query(
+        func.count(ParseCacheEntry.content_hash),
+        func.coalesce(func.sum(ParseCacheEntry.size_bytes), 0)
+    ).one()
+    if entries <= max_entries and total_bytes <= max_bytes:
+        return 0
+
+    victims = []
+    oldest_first = db.query(
+        ParseCacheEntry.content_hash,
+        ParseCacheEntry.file_type,
+        ParseCacheEntry.parser_version,
+        ParseCacheEntry.size_bytes
+    ).order_by(ParseCacheEntry.last_used_at).yield_per(500)
+    for content_hash, file_type, parser_version, size_bytes in oldest_first:
+        if entries <= max_entries and total_bytes <= max_bytes:
+            break
+        victims.append((content_hash, file_type, parser_version))
+        entries -= 1
+        total_bytes -= size_bytes
+
+    key = tuple_(ParseCacheEntry.content_hash, ParseCacheEntry.file_type, ParseCacheEntry.parser_version)
+    for start in range(0, len(victims), 500):
+        db.query(ParseCacheEntry).filter(key.in_(victims[start:start + 500])).delete(synchronize_session=False)
+    db.commit()
+
+    parse_cache_stats.record(evictions=len(victims))
+    logger.info("Evicted %d parse cache entries", len(victims))
+    return len(victims)
+
+
+def get_parse_cache_stats(db: Session) -> Dict[str, Any]:
+    """Counters for this process plus the cache's current size"""
+    entries, total_bytes = db.query(
+        func.count(ParseCacheEntry.content_hash),
+        func.coalesce(func.sum(ParseCacheEntry.size_bytes), 0)
+    ).one()
+    return {**parse_cache_stats.snapshot(), "entries": entries, "total_bytes": int(total_bytes)}
@@ -0,0 +1,426 @@
+"""
+Background resume parsing.
+
+Uploads are recorded as ParseJob rows and handed to a queue. A consumer
+parses them in a process pool, so PDF/DOCX extraction never blocks the
+API's event loop. Two queue backends are available:
+
+- Redis, shared by the API and one or more `python -m app.worker` processes
+- In-process, for tests and single-process setups without Redis
+
+The process holding a task in memory (the in-process API that queued
+it, or the Redis consumer that took it) claims its job and heartbeats it
+every PARSE_SWEEP_SECONDS. fail_stale_parse_jobs fails only jobs whose
+owner has stopped heartbeating, i.e. exited without finishing them; jobs
+waiting in a Redis queue have no owner and are failed by the consumer
+that finds their upload expired.
+"""
+from concurrent.futures import Executor, Future, ProcessPoolExecutor, ThreadPoolExecutor
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List, Optional
+import functools
+import json
+import logging
+import multiprocessing
+import threading
+import time
+import uuid
+
+import redis
+from sqlalchemy.orm import Session
+
+from .config import settings
+from .db import SessionLocal
+from .metrics import timed
+from .models import ParseJob, Resume
+from .parse_cache import store_parse_result
+from .parsing import get_file_type, parse_resume
+from .resume_index import add_resume_terms, resume_index
+from .uploads import remove_spool_file, write_spool_file
+
+logger = logging.getLogger(__name__)
+
+PARSE_QUEUE_KEY = "parse:jobs"
+PARSE_PAYLOAD_KEY = "parse:payload:{}"
+PARSE_PROCESSING_KEY = "parse:processing:{}"  # Messages a consumer has taken and not finished
+PARSE_CONSUMER_KEY = "parse:consumer:{}"  # Consumer heartbeat; expires when it stops
+
+UNFINISHED_STATUSES = ("queued", "parsing")
+
+
+@dataclass
+class ParseTask:
+    resume_id: uuid.UUID
+    user_id: str
+    filename: str
+    path: str  # Spool file holding the upload; removed once the task finishes
+    content_hash: Optional[str] = None
+
+
+def update_parse_job(db: Session, resume_id: uuid.UUID, **fields) -> None:
+    """Update a parse job's status fields and commit"""
+    db.query(ParseJob).filter(ParseJob.resume_id == resume_id).update(fields)
+    db.commit()
+
+
+def claim_parse_job(db: Session, resume_id: uuid.UUID, owner_id: str) -> None:
+    """Record that owner_id holds the job's task; its heartbeats keep the job from being failed"""
+    update_parse_job(db, resume_id, owner_id=owner_id, heartbeat_at=datetime.now(timezone.utc))
+
+
+def heartbeat_parse_jobs(db: Session, owner_id: str) -> None:
+    """Mark owner_id's unfinished jobs as still held"""
+    db.query(ParseJob).filter(
+        ParseJob.owner_id == owner_id,
+        ParseJob.status.in_(UNFINISHED_STATUSES)
+    ).update({"heartbeat_at": datetime.now(timezone.utc)}, synchronize_session=False)
+    db.commit()
+
+
+def release_parse_jobs(db: Session, resume_ids: List[uuid.UUID]) -> None:
+    """Clear the owner of jobs whose tasks went back on the queue"""
+    if resume_ids:
+        db.query(ParseJob).filter(ParseJob.resume_id.in_(resume_ids)).update(
+            {"owner_id": None, "heartbeat_at": None}, synchronize_session=False
+        )
+        db.commit()
+
+
+def fail_stale_parse_jobs(db: Session, older_than_seconds: Optional[int] = None) -> int:
+    """
+    Mark unfinished jobs whose owner has not heartbeated for
+    PARSE_JOB_OWNER_TIMEOUT_SECONDS as failed, returning how many there
+    were. The owner exited, so nothing will finish them.
+    """
+    cutoff = datetime.now(timezone.utc) - timedelta(
+        seconds=older_than_seconds if older_than_seconds is not None else settings.PARSE_JOB_OWNER_TIMEOUT_SECONDS
+    )
+    stale = db.query(ParseJob).filter(
+        ParseJob.status.in_(UNFINISHED_STATUSES),
+        ParseJob.owner_id.is_not(None),
+        ParseJob.heartbeat_at < cutoff
+    ).update(
+        {"status": "failed", "error": "Parsing did not finish; please upload the resume again"},
+        synchronize_session=False
+    )
+    db.commit()
+    if stale:
+        logger.warning("Marked %d stale parse jobs as failed", stale)
+    return stale
+
+
+def store_parsed_resume(
+    db: Session,
+    resume_id: uuid.UUID,
+    user_id: str,
+    parsed_data: Dict[str, Any]
+) -> List[str]:
+    """Add a parsed Resume and its index terms, returning the terms. The caller commits."""
+    resume = Resume(
+        id=resume_id,
+        user_id=user_id,
+        raw_text=parsed_data["raw_text"],
+        parsed_json=parsed_data.get("parsed_json")
+    )
+    db.add(resume)
+    db.flush()
+    return add_resume_terms(db, resume.id, resume.raw_text)
+
+
+def run_parse_task(task: ParseTask, pool: Optional[Executor] = None) -> None:
+    """Parse one upload and store the resulting Resume, recording progress on its job"""
+    db = SessionLocal()
+    try:
+        update_parse_job(db, task.resume_id, status="parsing", progress=0.1)
+
+        # Parse resume
+        try:
+            with timed("parse", get_file_type(task.filename).lstrip(".")):
+                if pool is not None:
+                    parsed_data = pool.submit(
+                        parse_resume, task.path, task.filename, settings.PDF_MAX_PAGES
+                    ).result()
+                else:
+                    parsed_data = parse_resume(task.path, task.filename, settings.PDF_MAX_PAGES)
+            if not parsed_data.get("raw_text") or len(parsed_data["raw_text"].strip()) == 0:
+                raise ValueError("Could not extract text from file. Please ensure the file is a valid PDF, DOCX, or TXT file.")
+        except ValueError as e:
+            update_parse_job(db, task.resume_id, status="failed", error=str(e))
+            return
+        except Exception as e:
+            logger.exception("Error parsing resume %s", task.resume_id)
+            update_parse_job(db, task.resume_id, status="failed", error=f"Error parsing resume: {str(e)}")
+            return
+
+        update_parse_job(db, task.resume_id, progress=0.8)
+
+        # Save resume, its index terms and the finished job in one transaction
+        try:
+            terms = store_parsed_resume(db, task.resume_id, task.user_id, parsed_data)
+            db.query(ParseJob).filter(ParseJob.resume_id == task.resume_id).update(
+                {"status": "done", "progress": 1.0}
+            )
+            db.commit()
+        except Exception as e:
+            db.rollback()
+            logger.exception("Error saving resume %s", task.resume_id)
+            update_parse_job(db, task.resume_id, status="failed", error=f"Error saving resume: {str(e)}")
+            return
+
+        resume_index.add(task.resume_id, task.user_id, terms)
+
+        # The resume is saved either way; a cache failure only costs a re-parse later
+        if task.content_hash:
+            try:
+                store_parse_result(db, task.content_hash, get_file_type(task.filename), parsed_data)
+            except Exception:
+                db.rollback()
+                logger.exception("Error caching parse result for resume %s", task.resume_id)
+    finally:
+        db.close()
+        remove_spool_file(task.path)
+
+
+def _log_task_failure(future: Future) -> None:
+    if future.exception() is not None:
+        logger.error("Parse task failed", exc_info=future.exception())
+
+
+class ParseWorker:
+    """Runs parse tasks: bookkeeping on threads, parsing in a process pool"""
+
+    def __init__(self, workers: int):
+        # Spawned parsers don't inherit the API's threads or DB connections
+        self._processes = ProcessPoolExecutor(
+            max_workers=workers,
+            mp_context=multiprocessing.get_context("spawn")
+        )
+        self._threads = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="parse")
+
+    def submit(self, task: ParseTask) -> Future:
+        future = self._threads.submit(run_parse_task, task, self._processes)
+        future.add_done_callback(_log_task_failure)
+        return future
+
+    def shutdown(self, wait: bool = True) -> None:
+        self._threads.shutdown(wait=wait)
+        self._processes.shutdown(wait=wait)
+
+
+class InProcessParseQueue:
+    """
+    Parse uploads inside the API process; no Redis needed. The process owns
+    the jobs it queues, and main.heartbeat_parse_jobs_forever keeps them
+    alive until they finish.
+    """
+
+    def __init__(self, workers: int):
+        self._workers = workers
+        self._worker: Optional[ParseWorker] = None
+        self._lock = threading.Lock()
+        self.owner_id = uuid.uuid4().hex
+
+    def enqueue(self, task: ParseTask) -> Future:
+        with self._lock:
+            if self._worker is None:
+                self._worker = ParseWorker(self._workers)
+        db = SessionLocal()
+        try:
+            claim_parse_job(db, task.resume_id, self.owner_id)
+        finally:
+            db.close()
+        return self._worker.submit(task)
+
+
+class RedisParseQueue:
+    """
+    Parse queue shared through Redis with `python -m app.worker` consumers.
+
+    A consumer moves each message from the queue onto its own processing
+    list and only removes it, with the upload, once the task has finished,
+    i.e. the Resume is stored or the job marked failed. Consumers keep a
+    heartbeat key alive; any consumer finding a processing list whose
+    owner's heartbeat has expired puts its messages back on the queue, so
+    uploads held by a crashed worker are parsed again rather than lost.
+    A message whose task raises is retried with an attempt count in the
+    message, up to PARSE_MAX_ATTEMPTS.
+    """
+
+    def __init__(self, url: str):
+        self._client = redis.Redis.from_url(url)
+        self.consumer_id = uuid.uuid4().hex
+        self._processing_key = PARSE_PROCESSING_KEY.format(self.consumer_id)
+
+    def enqueue(self, task: ParseTask) -> None:
+        # Consumers may run on other hosts, so the upload travels through
+        # Redis rather than as a path; it is bounded by UPLOAD_MAX_BYTES
+        try:
+            with open(task.path, "rb") as spool:
+                content = spool.read()
+        finally:
+            remove_spool_file(task.path)
+        message = json.dumps({
+            "resume_id": str(task.resume_id),
+            "user_id": task.user_id,
+            "filename": task.filename,
+            "content_hash": task.content_hash,
+        })
+        pipe = self._client.pipeline()
+        pipe.set(
+            PARSE_PAYLOAD_KEY.format(task.resume_id),
+            content,
+            ex=settings.PARSE_PAYLOAD_TTL_SECONDS
+        )
+        pipe.lpush(PARSE_QUEUE_KEY, message)
+        pipe.execute()
+
+    def _heartbeat(self) -> None:
+        self._client.set(
+            PARSE_CONSUMER_KEY.format(self.consumer_id), 1, ex=settings.PARSE_CONSUMER_HEARTBEAT_SECONDS
+        )
+
+    def _ack(self, message: bytes) -> None:
+        """Forget a finished message and its upload"""
+        data = json.loads(message)
+        pipe = self._client.pipeline()
+        pipe.lrem(self._processing_key, 1, message)
+        pipe.delete(PARSE_PAYLOAD_KEY.format(data["resume_id"]))
+        pipe.execute()
+
+    def _retry(self, message: bytes) -> None:
+        """
+        Put a message whose task raised back at the end of the queue with
+        its attempt counted, or fail its job once it has had
+        PARSE_MAX_ATTEMPTS, so a poison upload cannot loop forever
+        """
+        data = json.loads(message)
+        data["attempts"] = data.get("attempts", 0) + 1
+        if data["attempts"] >= settings.PARSE_MAX_ATTEMPTS:
+            db = SessionLocal()
+            try:
+                update_parse_job(
+                    db,
+                    uuid.UUID(data["resume_id"]),
+                    status="failed",
+                    error=f"Parsing failed {data['attempts']} times; please upload the resume again"
+                )
+            except Exception:
+                # Likely the database itself; keep the message and try again later
+                logger.exception("Error failing parse job %s; it will be retried", data["resume_id"])
+            else:
+                logger.error("Giving up on resume %s after %d attempts", data["resume_id"], data["attempts"])
+                self._ack(message)
+                return
+            finally:
+                db.close()
+        pipe = self._client.pipeline()
+        pipe.lrem(self._processing_key, 1, message)
+        pipe.lpush(PARSE_QUEUE_KEY, json.dumps(data))
+        pipe.execute()
+
+    def requeue_abandoned(self) -> List[uuid.UUID]:
+        """Move messages held by consumers whose heartbeat expired back onto the queue; returns their resume ids"""
+        requeued = []
+        for key in self._client.scan_iter(match=PARSE_PROCESSING_KEY.format("*")):
+            consumer_id = key.decode().rsplit(":", 1)[1]
+            if consumer_id == self.consumer_id or self._client.exists(PARSE_CONSUMER_KEY.format(consumer_id)):
+                continue
+            # Oldest first, to the end the queue is consumed from
+            while True:
+                message = self._client.lmove(key, PARSE_QUEUE_KEY, "RIGHT", "RIGHT")
+                if message is None:
+                    break
+                requeued.append(uuid.UUID(json.loads(message)["resume_id"]))
+        if requeued:
+            logger.warning("Requeued %d uploads held by stopped parse workers", len(requeued))
+        return requeued
+
+    def _load_task(self, message: bytes) -> Optional[ParseTask]:
+        """The task for a message, or None (after acknowledging it) if there is nothing to parse"""
+        data = json.loads(message)
+        resume_id = uuid.UUID(data["resume_id"])
+        db = SessionLocal()
+        try:
+            job = db.get(ParseJob, resume_id)
+            if job is not None and job.status in ("done", "failed"):
+                # Finished by a consumer that stopped before acknowledging it
+                self._ack(message)
+                return None
+            content = self._client.get(PARSE_PAYLOAD_KEY.format(resume_id))
+            if content is None:
+                update_parse_job(db, resume_id, status="failed", error="Upload expired before it could be parsed")
+                self._ack(message)
+                return None
+            claim_parse_job(db, resume_id, self.consumer_id)
+        finally:
+            db.close()
+        path = write_spool_file(content, data["filename"])
+        return ParseTask(resume_id, data["user_id"], data["filename"], path, data.get("content_hash"))
+
+    def _sweep(self) -> None:
+        requeued = self.requeue_abandoned()
+        db = SessionLocal()
+        try:
+            # Requeued jobs are unowned again, so they are not failed below
+            release_parse_jobs(db, requeued)
+            heartbeat_parse_jobs(db, self.consumer_id)
+            fail_stale_parse_jobs(db)
+        finally:
+            db.close()
+
+    def consume(self, worker: ParseWorker, max_in_flight: int) -> None:
+        """Feed queued uploads to worker forever, never holding more than max_in_flight"""
+        slots = threading.BoundedSemaphore(max_in_flight)
+        next_sweep = 0.0
+
+        def finished(message: bytes, future: Future) -> None:
+            try:
+                if future.exception() is None:
+                    self._ack(message)
+                else:
+                    self._retry(message)
+            except Exception:
+                logger.exception("Error acknowledging parse task; it will be retried")
+            finally:
+                slots.release()
+
+        while True:
+            self._heartbeat()
+            if time.monotonic() >= next_sweep:
+                try:
+                    self._sweep()
+                except Exception:
+                    logger.exception("Error sweeping parse jobs")
+                next_sweep = time.monotonic() + settings.PARSE_SWEEP_SECONDS
+            if not slots.acquire(timeout=5):
+                continue
+            message = self._client.blmove(PARSE_QUEUE_KEY, self._processing_key, 5, "RIGHT", "LEFT")
+            try:
+                task = self._load_task(message) if message else None
+            except Exception:
+                logger.exception("Error loading parse task; it will be retried")
+                self._retry(message)
+                time.sleep(1)  # Don't spin on a message while the database is down
+                task = None
+            if task is None:
+                slots.release()
+                continue
+            logger.info("Parsing resume %s (%s)", task.resume_id, task.filename)
+            worker.submit(task).add_done_callback(functools.partial(finished, message))
+
+
+_parse_queue = None
+_parse_queue_lock = threading.Lock()
+
+
+def get_parse_queue():
+    """Return the configured parse queue"""
+    global _parse_queue
+    with _parse_queue_lock:
+        if _parse_queue is None:
+            if settings.PARSE_QUEUE_BACKEND == "inprocess":
+                _parse_queue = InProcessParseQueue(settings.PARSE_WORKERS)
+            else:
+                _parse_queue = RedisParseQueue(settings.REDIS_URL)
+        return _parse_queue
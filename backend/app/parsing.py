@@ -1,56 +1,129 @@
 import io
-from typing import Dict, Any, Optional
+import os
+from typing import Dict, Any, Iterator, Optional, Union
 import pypdf
 from docx import Document
 
+from .compiler import extract_resume_sections
+from .matcher import tokenize
+from .scoring import extract_resume_titles, extract_years, has_senior_terms
 
-def parse_pdf(file_content: bytes) -> str:
-    """Extract plain text from PDF"""
-    pdf_file = io.BytesIO(file_content)
-    reader = pypdf.PdfReader(pdf_file)
-    text_parts = []
-    
-    for page in reader.pages:
-        text_parts.append(page.extract_text())
+SUPPORTED_EXTENSIONS = ('.pdf', '.docx', '.txt')
+
+# Bump whenever parse_resume output changes so cached parses are not reused
+PARSER_VERSION = 2
+
+# parse_resume accepts the file's bytes or a path to it; paths let large
+# uploads be parsed from disk without holding the whole file in memory
+ResumeSource = Union[bytes, str, os.PathLike]
+
+
+def is_supported_file(filename: str) -> bool:
+    """Check whether the parser handles this file type"""
+    return filename.lower().endswith(SUPPORTED_EXTENSIONS)
+
+
+def get_file_type(filename: str) -> str:
+    """Return the lowercase extension the parser dispatches on, e.g. ".pdf" """
+    return os.path.splitext(filename.lower())[1]
+
+
+def _open_source(source: ResumeSource):
+    if isinstance(source, bytes):
+        return io.BytesIO(source)
+    return open(source, "rb")
+
+
+def iter_pdf_pages(source: ResumeSource, max_pages: Optional[int] = None) -> Iterator[str]:
+    """
+    Yield the text of each PDF page in order.
     
-    return "\n".join(text_parts)
+    Pages are read from the file as they are extracted, so only one page's
+    content is decoded at a time. Raises ValueError if the PDF has more
+    than max_pages pages.
+    """
+    with _open_source(source) as pdf_file:
+        reader = pypdf.PdfReader(pdf_file)
+        page_count = len(reader.pages)
+        if max_pages is not None and page_count > max_pages:
+            raise ValueError(f"PDF has {page_count} pages; at most {max_pages} are supported")
+        # pypdf caches every object it resolves (content streams, images,
+        # fonts); dropping the cache keeps memory at about one page. The
+        # cache is private to pypdf, so versions without it just keep it.
+        resolved_objects = getattr(reader, "resolved_objects", None)
+        for page in reader.pages:
+            text = page.extract_text()
+            if isinstance(resolved_objects, dict):
+                resolved_objects.clear()
+            yield text
 
 
-def parse_docx(file_content: bytes) -> str:
+def parse_pdf(source: ResumeSource, max_pages: Optional[int] = None) -> str:
+    """Extract plain text from PDF"""
+    return "\n".join(iter_pdf_pages(source, max_pages))
+
+
+def parse_docx(source: ResumeSource) -> str:
     """Extract plain text from DOCX"""
-    docx_file = io.BytesIO(file_content)
-    doc = Document(docx_file)
-    text_parts = []
-    
-    for paragraph in doc.paragraphs:
-        text_parts.append(paragraph.text)
-    
-    return "\n".join(text_parts)
+    with _open_source(source) as docx_file:
+        doc = Document(docx_file)
+        return "\n".join(paragraph.text for paragraph in doc.paragraphs)
 
 
-def parse_txt(file_content: bytes) -> str:
+def parse_txt(source: ResumeSource) -> str:
     """Extract plain text from TXT"""
-    return file_content.decode('utf-8', errors='ignore')
+    if not isinstance(source, bytes):
+        with open(source, "rb") as txt_file:
+            source = txt_file.read()
+    return source.decode('utf-8', errors='ignore')
 
 
-def parse_resume(file_content: bytes, filename: str) -> Dict[str, Any]:
+def build_parsed_json(raw_text: str) -> Dict[str, Any]:
     """
-    Parse resume file and return structured data.
-    Returns plain text for MVP - structured parsing can be added later.
+    Derive the structured resume data the compiler and scorer reuse.
+    
+    Stored as Resume.parsed_json so sections, title lines, years and
+    tokens are computed once per upload instead of on every compile.
     """
+    return {
+        "version": PARSER_VERSION,
+        "sections": extract_resume_sections(raw_text),
+        "title_lines": extract_resume_titles(raw_text),
+        "years": extract_years(raw_text),
+        "has_senior_terms": has_senior_terms(raw_text),
+        "tokens": sorted(tokenize(raw_text)),
+    }
+
+
+def parsed_resume_is_current(parsed_json: Optional[Dict[str, Any]]) -> bool:
+    """Check that parsed_json was built by the current parser"""
+    return bool(parsed_json) and parsed_json.get("version") == PARSER_VERSION
+
+
+def extract_text(source: ResumeSource, filename: str, max_pages: Optional[int] = None) -> str:
+    """Plain text of a PDF, DOCX or TXT file, dispatched on filename's extension"""
     filename_lower = filename.lower()
     
     if filename_lower.endswith('.pdf'):
-        raw_text = parse_pdf(file_content)
+        return parse_pdf(source, max_pages)
     elif filename_lower.endswith('.docx'):
-        raw_text = parse_docx(file_content)
+        return parse_docx(source)
     elif filename_lower.endswith('.txt'):
-        raw_text = parse_txt(file_content)
+        return parse_txt(source)
     else:
         raise ValueError(f"Unsupported file format: {filename}")
+
+
+def parse_resume(source: ResumeSource, filename: str, max_pages: Optional[int] = None) -> Dict[str, Any]:
+    """
+    Parse resume file and return its text plus structured data.
+    
+    source is the file's bytes or a path to it. PDFs with more than
+    max_pages pages are rejected with ValueError.
+    """
+    raw_text = extract_text(source, filename, max_pages)
     
-    # MVP: Return raw text, structured parsing can be added later
     return {
         "raw_text": raw_text,
-        "parsed_json": None  # Can be enhanced with structured extraction later
+        "parsed_json": build_parsed_json(raw_text)
     }
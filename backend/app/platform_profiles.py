@@ -1,8 +1,36 @@
 """
 Platform heuristic profiles for ATS optimization.
 These weights determine how different platforms prioritize resume elements.
+
+The platform registry starts as the built-in PLATFORM_PROFILES below
+(version 0). Versions written to PLATFORM_PROFILES_DIR as
+profiles-v<version>.json replace it without a restart: lookups check for a
+different newest version at most every PLATFORM_PROFILES_RELOAD_SECONDS.
+Versions come from `python -m app.cli calibrate-profiles` (calibration.py)
+or `python -m app.cli set-platform-profile`, which is how platforms are
+added or removed; deleting the newest file rolls back to the one before.
+
+A version is validated in full before it is used; one that fails is
+logged and the registry in use is kept. The registry is an immutable
+snapshot replaced by a single assignment, so lookups take no lock and
+never see part of a reload.
 """
-from typing import Dict, Any
+from dataclasses import dataclass
+from types import MappingProxyType
+from typing import Any, Dict, Mapping, Optional, Tuple
+import hashlib
+import json
+import logging
+import math
+import os
+import re
+import tempfile
+import threading
+import time
+
+from .config import settings
+
+logger = logging.getLogger(__name__)
 
 PLATFORM_PROFILES: Dict[str, Dict[str, float]] = {
     "linkedin": {
@@ -21,8 +49,166 @@ PLATFORM_PROFILES: Dict[str, Dict[str, float]] = {
         "keyword_weight": 0.75
     }
 }
+DEFAULT_PLATFORM = "indeed"
+
+WEIGHT_KEYS = ("keyword_weight", "title_weight", "recency_weight")
+PLATFORM_NAME_RE = re.compile(r"^[a-z][a-z0-9_-]{0,63}$")
+PROFILE_FILE_RE = re.compile(r"^profiles-v(\d+)\.json$")
+
+
+@dataclass(frozen=True)
+class PlatformRegistry:
+    """One version of the platforms and their weights; never modified once built"""
+    version: int
+    profiles: Mapping[str, Mapping[str, float]]
+    default_platform: str
+    fingerprint: str  # Digest of the profiles and default platform, computed once when built
+
+    @property
+    def platforms(self) -> Tuple[str, ...]:
+        return tuple(self.profiles)
+
+    def __contains__(self, platform: str) -> bool:
+        return platform in self.profiles
+
+    def get(self, platform: str) -> Mapping[str, float]:
+        """Weights of platform, or of the default platform if it is unknown"""
+        profile = self.profiles.get(platform)
+        return profile if profile is not None else self.profiles[self.default_platform]
+
+
+def build_registry(version: int, profiles: Any, default_platform: Optional[str] = None) -> PlatformRegistry:
+    """Validate profiles into a registry; raises ValueError if they are malformed"""
+    if not isinstance(profiles, dict) or not profiles:
+        raise ValueError("profiles must map at least one platform to its weights")
+    frozen = {}
+    for platform, weights in profiles.items():
+        if not isinstance(platform, str) or not PLATFORM_NAME_RE.match(platform):
+            raise ValueError(f"Platform names must be lowercase letters, digits, - or _: {platform!r}")
+        if not isinstance(weights, dict) or set(weights) != set(WEIGHT_KEYS) or not all(
+            isinstance(weights[key], (int, float)) and not isinstance(weights[key], bool)
+            and math.isfinite(weights[key]) and weights[key] >= 0
+            for key in WEIGHT_KEYS
+        ):
+            raise ValueError(f"{platform} needs non-negative {', '.join(WEIGHT_KEYS)}")
+        frozen[platform] = MappingProxyType({key: float(weights[key]) for key in WEIGHT_KEYS})
+    if default_platform is None:
+        default_platform = DEFAULT_PLATFORM if DEFAULT_PLATFORM in frozen else next(iter(frozen))
+    if default_platform not in frozen:
+        raise ValueError(f"default_platform {default_platform!r} is not one of the platforms")
+    fingerprint = hashlib.sha256(json.dumps(
+        {"profiles": {platform: dict(weights) for platform, weights in frozen.items()}, "default": default_platform},
+        sort_keys=True
+    ).encode()).hexdigest()[:16]
+    return PlatformRegistry(version, MappingProxyType(frozen), default_platform, fingerprint)
+
+
+BUILTIN_REGISTRY = build_registry(0, PLATFORM_PROFILES)
+
+_registry = BUILTIN_REGISTRY
+_reload = {"next_check": 0.0}
+_reload_lock = threading.Lock()
+
+
+def profile_path(directory: str, version: int) -> str:
+    return os.path.join(directory, f"profiles-v{version:04d}.json")
+
+
+def latest_profile_version(directory: str) -> int:
+    """Highest profile version in directory, 0 if there is none"""
+    try:
+        names = os.listdir(directory)
+    except FileNotFoundError:
+        return 0
+    versions = [int(match.group(1)) for match in map(PROFILE_FILE_RE.match, names) if match]
+    return max(versions, default=0)
 
 
-def get_platform_profile(platform: str) -> Dict[str, float]:
+def read_profile_version(path: str) -> PlatformRegistry:
+    """Load and validate a profiles file; raises ValueError if it is malformed"""
+    with open(path) as f:
+        data = json.load(f)
+    if not isinstance(data, dict) or not isinstance(data.get("version"), int):
+        raise ValueError(f"{path}: expected an object with an integer version")
+    try:
+        return build_registry(data["version"], data.get("profiles"), data.get("default_platform"))
+    except ValueError as e:
+        raise ValueError(f"{path}: {e}") from None
+
+
+def load_latest_registry(directory: str) -> PlatformRegistry:
+    """Newest version in directory, or the built-in profiles if there is none"""
+    version = latest_profile_version(directory)
+    return read_profile_version(profile_path(directory, version)) if version else BUILTIN_REGISTRY
+
+
+def write_profile_version(directory: str, payload: Dict[str, Any]) -> str:
+    """Validate payload and write it as its version's profiles file, atomically"""
+    build_registry(payload["version"], payload["profiles"], payload.get("default_platform"))
+    os.makedirs(directory, exist_ok=True)
+    path = profile_path(directory, payload["version"])
+    fd, temp_path = tempfile.mkstemp(dir=directory, prefix=".profiles-", suffix=".json")
+    try:
+        with os.fdopen(fd, "w") as f:
+            json.dump(payload, f, indent=2)
+            f.write("\n")
+        os.replace(temp_path, path)
+    except BaseException:
+        os.unlink(temp_path)
+        raise
+    return path
+
+
+def refresh_platform_profiles(force: bool = False) -> PlatformRegistry:
+    """Swap in the newest profiles version if it changed; returns the registry in use"""
+    global _registry
+    directory = settings.PLATFORM_PROFILES_DIR
+    if directory is None:
+        if _registry is not BUILTIN_REGISTRY:
+            _registry = BUILTIN_REGISTRY
+        return _registry
+    now = time.monotonic()
+    if not force and now < _reload["next_check"]:
+        return _registry
+    with _reload_lock:
+        if not force and now < _reload["next_check"]:
+            return _registry
+        _reload["next_check"] = now + settings.PLATFORM_PROFILES_RELOAD_SECONDS
+        version = latest_profile_version(directory)
+        if version != _registry.version:
+            try:
+                registry = read_profile_version(profile_path(directory, version)) if version else BUILTIN_REGISTRY
+            except (OSError, ValueError) as e:
+                logger.error("Keeping platform profiles v%d: %s", _registry.version, e)
+                return _registry
+            _registry = registry
+            logger.info("Loaded platform profiles v%d: %s", registry.version, ", ".join(registry.platforms))
+    return _registry
+
+
+def platform_registry() -> PlatformRegistry:
+    """The registry in use, after checking for a newer version"""
+    return refresh_platform_profiles()
+
+
+def platform_profiles_version() -> int:
+    """Version of the profiles in use, after checking for a newer one"""
+    return refresh_platform_profiles().version
+
+
+def platform_names() -> Tuple[str, ...]:
+    return refresh_platform_profiles().platforms
+
+
+def is_valid_platform(platform: str) -> bool:
+    return platform in refresh_platform_profiles()
+
+
+def get_platform_profile(platform: str) -> Mapping[str, float]:
     """Get platform-specific weight profile"""
-    return PLATFORM_PROFILES.get(platform.lower(), PLATFORM_PROFILES["indeed"])
+    return refresh_platform_profiles().get(platform.lower())
+
+
+def current_profiles() -> Dict[str, Dict[str, float]]:
+    """Copy of the weights in use, after checking for a newer version"""
+    return {platform: dict(weights) for platform, weights in refresh_platform_profiles().profiles.items()}
@@ -0,0 +1,158 @@
+"""
+Inverted index over resume tokens, used to rank stored resumes against a JD.
+
+Postings are persisted in the resume_terms table and mirrored in memory as
+compact int32 arrays, so a ranking query only touches the posting lists of
+the JD's top terms instead of scoring every resume.
+"""
+from array import array
+from datetime import timedelta
+from typing import Dict, Iterable, List, Optional, Tuple
+import threading
+import uuid
+
+import numpy as np
+from sqlalchemy import insert, select
+from sqlalchemy.orm import Session
+
+from .matcher import tokenize
+from .models import Resume, ResumeTerm
+
+# Re-read resumes created this long before the newest one already loaded, to
+# catch rows committed late by other workers
+_REFRESH_OVERLAP = timedelta(minutes=5)
+
+
+def index_terms(raw_text: str) -> List[str]:
+    """Return the tokens of a resume worth indexing"""
+    return sorted(
+        token for token in tokenize(raw_text)
+        if len(token) > 1 and not token.isdigit()
+    )
+
+
+def add_resume_terms(db: Session, resume_id: uuid.UUID, raw_text: str) -> List[str]:
+    """Insert index rows for a resume. The caller commits."""
+    terms = index_terms(raw_text)
+    if terms:
+        db.execute(
+            insert(ResumeTerm),
+            [{"term": term, "resume_id": resume_id} for term in terms]
+        )
+    return terms
+
+
+class ResumeIndex:
+    """In-memory mirror of the resume_terms table"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._postings: Dict[str, array] = {}
+        self._ordinals: Dict[uuid.UUID, int] = {}
+        self._resume_ids: List[uuid.UUID] = []
+        self._user_codes = array("i")
+        self._user_lookup: Dict[str, int] = {}
+        self._synced_until = None
+
+    def __len__(self) -> int:
+        return len(self._resume_ids)
+
+    def add(self, resume_id: uuid.UUID, user_id: str, terms: Iterable[str]) -> None:
+        """Add one resume's terms; resumes already indexed are ignored"""
+        with self._lock:
+            if resume_id in self._ordinals:
+                return
+            ordinal = len(self._resume_ids)
+            self._ordinals[resume_id] = ordinal
+            self._resume_ids.append(resume_id)
+            self._user_codes.append(
+                self._user_lookup.setdefault(user_id, len(self._user_lookup))
+            )
+            for term in terms:
+                postings = self._postings.get(term)
+                if postings is None:
+                    postings = self._postings[term] = array("i")
+                postings.append(ordinal)
+
+    def refresh(self, db: Session) -> None:
+        """
+        Load postings for resumes indexed since the last refresh. Runs off
+        the request path (see main.refresh_resume_index_forever); ranking
+        only reads what has been loaded.
+        """
+        query = (
+            select(Resume.id, Resume.user_id, Resume.created_at, ResumeTerm.term)
+            .join(ResumeTerm, ResumeTerm.resume_id == Resume.id)
+            .order_by(Resume.id)
+        )
+        if self._synced_until is not None:
+            query = query.where(Resume.created_at >= self._synced_until - _REFRESH_OVERLAP)
+
+        current_id, current_user, terms = None, None, []
+        newest = self._synced_until
+        for resume_id, user_id, created_at, term in db.execute(query).yield_per(10000):
+            if resume_id != current_id:
+                if current_id is not None:
+                    self.add(current_id, current_user, terms)
+                current_id, current_user, terms = resume_id, user_id, []
+            terms.append(term)
+            if created_at is not None and (newest is None or created_at > newest):
+                newest = created_at
+        if current_id is not None:
+            self.add(current_id, current_user, terms)
+        self._synced_until = newest
+
+    def candidates(
+        self,
+        terms: Iterable[str],
+        limit: int,
+        user_id: Optional[str] = None
+    ) -> List[Tuple[uuid.UUID, int]]:
+        """
+        Return up to limit (resume_id, shared_term_count) pairs, most shared
+        terms first. Multi-word terms are looked up by their individual words.
+        """
+        lookup = set()
+        for term in terms:
+            lookup.update(tokenize(term))
+
+        with self._lock:
+            total = len(self._resume_ids)
+            present = [term for term in lookup if term in self._postings]
+            if not total or not present or limit < 1:
+                return []
+
+            postings = np.concatenate([
+                np.frombuffer(self._postings[term], dtype=np.intc) for term in present
+            ])
+            counts = np.bincount(postings, minlength=total)
+            if user_id is not None:
+                user_code = self._user_lookup.get(user_id)
+                if user_code is None:
+                    return []
+                counts[np.frombuffer(self._user_codes, dtype=np.intc) != user_code] = 0
+
+            k = min(limit, total)
+            top = np.argpartition(-counts, k - 1)[:k]
+            top = top[counts[top] > 0]
+            top = top[np.lexsort((top, -counts[top]))]
+            return [(self._resume_ids[i], int(counts[i])) for i in top]
+
+
+resume_index = ResumeIndex()
+
+
+def rebuild_resume_index(db: Session, batch_size: int = 500) -> int:
+    """Recreate resume_terms rows for every stored resume"""
+    db.query(ResumeTerm).delete()
+    db.commit()
+
+    count = 0
+    query = select(Resume.id, Resume.raw_text).execution_options(yield_per=batch_size)
+    for partition in db.execute(query).partitions():
+        with Session(bind=db.get_bind()) as writer:
+            for resume_id, raw_text in partition:
+                add_resume_terms(writer, resume_id, raw_text)
+            writer.commit()
+        count += len(partition)
+    return count
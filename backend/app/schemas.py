@@ -1,5 +1,5 @@
 from pydantic import BaseModel
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, List
 from datetime import datetime
 from uuid import UUID
 
@@ -19,9 +19,43 @@ class ResumeResponse(BaseModel):
         from_attributes = True
 
 
+class ResumeListItem(BaseModel):
+    """A /resumes row; fields left out of the projection are omitted"""
+    id: UUID
+    created_at: datetime
+    user_id: Optional[str] = None
+    raw_text: Optional[str] = None
+    parsed_json: Optional[Dict[str, Any]] = None
+
+
+class ParseStatusResponse(BaseModel):
+    resume_id: UUID
+    user_id: str
+    filename: str
+    status: str  # queued, parsing, done, failed
+    progress: float
+    error: Optional[str] = None
+    cached: bool = False
+    created_at: Optional[datetime] = None
+    updated_at: Optional[datetime] = None
+    
+    class Config:
+        from_attributes = True
+
+
+class ParseCacheStatsResponse(BaseModel):
+    hits: int
+    misses: int
+    evictions: int
+    hit_rate: float
+    entries: int
+    total_bytes: int
+
+
 class JobDescriptionCreate(BaseModel):
     platform: str  # linkedin, indeed, dice
     raw_text: str
+    user_id: Optional[str] = None  # With EAGER_COMPILE, this user's resumes are compiled against the JD
 
 
 class JobDescriptionResponse(BaseModel):
@@ -35,6 +69,20 @@ class JobDescriptionResponse(BaseModel):
         from_attributes = True
 
 
+class JDBulkItemResult(BaseModel):
+    index: int
+    status: str  # created, duplicate or error
+    id: Optional[UUID] = None  # The new JD, or the stored JD a duplicate matched
+    error: Optional[str] = None
+
+
+class JDBulkResponse(BaseModel):
+    created: int
+    duplicates: int
+    errors: int
+    items: List[JDBulkItemResult]
+
+
 class CompileVariantRequest(BaseModel):
     resume_id: UUID
     jd_id: UUID
@@ -42,6 +90,13 @@ class CompileVariantRequest(BaseModel):
     platform: str  # linkedin, indeed, dice
 
 
+class CompileBatchRequest(BaseModel):
+    resume_id: UUID
+    jd_ids: List[UUID]
+    personas: List[str] = ["ic", "architect", "hybrid"]
+    platforms: Optional[List[str]] = None  # None = every platform in the registry
+
+
 class SurvivabilityScores(BaseModel):
     keyword_score: float
     title_score: float
@@ -50,6 +105,27 @@ class SurvivabilityScores(BaseModel):
     survivability: float
 
 
+class ScoreResponse(BaseModel):
+    resume_id: UUID
+    jd_id: UUID
+    platform: str
+    scores: SurvivabilityScores
+    cached: bool
+
+
+class ScoreCacheStatsResponse(BaseModel):
+    hits: int
+    memory_hits: int
+    redis_hits: int
+    misses: int
+    evictions: int
+    redis_errors: int
+    hit_rate: float
+    entries: int
+    max_entries: int
+    redis_enabled: bool
+
+
 class ResumeVariantResponse(BaseModel):
     id: UUID
     resume_id: UUID
@@ -64,6 +140,25 @@ class ResumeVariantResponse(BaseModel):
         from_attributes = True
 
 
+class ResumeVariantListItem(BaseModel):
+    """A /variants row; fields left out of the projection are omitted"""
+    id: UUID
+    created_at: datetime
+    resume_id: Optional[UUID] = None
+    jd_id: Optional[UUID] = None
+    persona: Optional[str] = None
+    platform: Optional[str] = None
+    compiled_text: Optional[str] = None
+    scores: Optional[SurvivabilityScores] = None
+
+
+class RankedResumeResponse(BaseModel):
+    resume_id: UUID
+    user_id: str
+    matched_terms: int
+    scores: SurvivabilityScores
+
+
 class OutcomeCreate(BaseModel):
     variant_id: UUID
     status: str  # rejected, interview, ghosted
@@ -77,3 +172,23 @@ class OutcomeResponse(BaseModel):
     
     class Config:
         from_attributes = True
+
+
+class PlatformProfileResponse(BaseModel):
+    platform: str
+    version: int  # Platform profiles version; 0 = built-in weights
+    default: bool  # Used to score platforms not in the registry
+    keyword_weight: float
+    title_weight: float
+    recency_weight: float
+
+
+class OutcomeRateResponse(BaseModel):
+    platform: str
+    persona: str
+    survivability_min: Optional[float] = None  # Bucket bounds; None for variants without scores
+    survivability_max: Optional[float] = None
+    outcomes: int
+    interviews: int
+    interview_rate: float
+    statuses: Dict[str, int]  # Outcomes by status
@@ -0,0 +1,232 @@
+"""
+Cache of survivability scores.
+
+Scores depend only on the resume text, the JD text and the JD signals
+scored against, the platform and the scorer itself, so they are cached
+under the SHA-256 of both texts and of the signals, the platform and
+scorer_version(). The signals are hashed rather than assumed to follow
+from the JD text because their top_terms are ranked against the corpus
+document frequencies, which change as JDs are stored. The version
+combines the platform registry's fingerprint (computed once per
+registry version), the scoring constants,
+SCORING_VERSION, SIGNALS_VERSION and the current year (age risk depends
+on it), so changing any of them misses every old entry instead of
+serving stale scores.
+
+Each process keeps an LRU of SCORE_CACHE_MAX_ENTRIES scores; with
+SCORE_CACHE_REDIS enabled, misses fall through to Redis so API processes
+and batch workers share results. Redis errors are logged and treated as
+misses.
+"""
+from collections import OrderedDict
+from datetime import datetime
+from functools import lru_cache
+from time import perf_counter
+from typing import Any, Dict, Optional, Tuple
+import hashlib
+import json
+import logging
+import threading
+
+import redis
+
+from .config import settings
+from .jd_extract import SIGNALS_VERSION, extract_jd_signals
+from .metrics import record_stage
+from .platform_profiles import platform_registry
+from .scoring import (
+    AGE_RISK_WEIGHT,
+    DEFAULT_RECENCY_SCORE,
+    OVERQUAL_RISK_WEIGHT,
+    SCORING_VERSION,
+    SENIOR_TERMS,
+    TITLE_WORDS,
+    calculate_survivability_score,
+)
+
+logger = logging.getLogger(__name__)
+
+SCORE_CACHE_KEY = "score:{}:{}:{}:{}:{}"
+
+# Fail fast rather than stall scoring when Redis is slow
+REDIS_TIMEOUT_SECONDS = 0.1
+
+
+# Scoring constants and versions; they only change with the code
+_SCORER_CONSTANTS = repr((
+    SCORING_VERSION,
+    SIGNALS_VERSION,
+    TITLE_WORDS,
+    SENIOR_TERMS,
+    DEFAULT_RECENCY_SCORE,
+    AGE_RISK_WEIGHT,
+    OVERQUAL_RISK_WEIGHT,
+))
+
+
+def scorer_version() -> str:
+    """Fingerprint of everything besides the inputs that scores depend on"""
+    return _digest(platform_registry().fingerprint, datetime.now().year)
+
+
+@lru_cache(maxsize=16)
+def _digest(registry_fingerprint: str, year: int) -> str:
+    return hashlib.sha256(repr((_SCORER_CONSTANTS, registry_fingerprint, year)).encode()).hexdigest()[:16]
+
+
+def text_hash(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def signals_hash(jd_signals: Dict[str, Any]) -> str:
+    """SHA-256 of JD signals, independent of key order"""
+    return text_hash(json.dumps(jd_signals, sort_keys=True, separators=(",", ":")))
+
+
+def score_cache_key(resume_text: str, jd_text: str, platform: str, jd_signals: Dict[str, Any]) -> str:
+    return SCORE_CACHE_KEY.format(
+        scorer_version(), text_hash(resume_text), text_hash(jd_text), signals_hash(jd_signals), platform.lower()
+    )
+
+
+class ScoreCache:
+    """Per-process LRU of scores, optionally backed by Redis"""
+
+    def __init__(self, max_entries: int, redis_url: Optional[str] = None, ttl_seconds: int = 0):
+        self._max_entries = max_entries
+        self._ttl_seconds = ttl_seconds or None
+        self._entries: "OrderedDict[str, Dict[str, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._redis = redis.Redis.from_url(
+            redis_url,
+            socket_timeout=REDIS_TIMEOUT_SECONDS,
+            socket_connect_timeout=REDIS_TIMEOUT_SECONDS
+        ) if redis_url else None
+        self.memory_hits = 0
+        self.redis_hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.redis_errors = 0
+
+    def get(self, key: str) -> Optional[Dict[str, float]]:
+        with self._lock:
+            scores = self._entries.get(key)
+            if scores is not None:
+                self._entries.move_to_end(key)
+                self.memory_hits += 1
+                return dict(scores)
+
+        if self._redis is not None:
+            try:
+                value = self._redis.get(key)
+            except redis.RedisError as e:
+                self._record_redis_error(e)
+                value = None
+            if value is not None:
+                scores = json.loads(value)
+                with self._lock:
+                    self.redis_hits += 1
+                    self._remember(key, scores)
+                return dict(scores)
+
+        with self._lock:
+            self.misses += 1
+        return None
+
+    def put(self, key: str, scores: Dict[str, float]) -> None:
+        with self._lock:
+            self._remember(key, dict(scores))
+        if self._redis is not None:
+            try:
+                self._redis.set(key, json.dumps(scores), ex=self._ttl_seconds)
+            except redis.RedisError as e:
+                self._record_redis_error(e)
+
+    def clear(self) -> None:
+        """Drop this process's entries (Redis entries expire on their own)"""
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            hits = self.memory_hits + self.redis_hits
+            lookups = hits + self.misses
+            return {
+                "hits": hits,
+                "memory_hits": self.memory_hits,
+                "redis_hits": self.redis_hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "redis_errors": self.redis_errors,
+                "hit_rate": hits / lookups if lookups else 0.0,
+                "entries": len(self._entries),
+                "max_entries": self._max_entries,
+                "redis_enabled": self._redis is not None,
+            }
+
+    def _remember(self, key: str, scores: Dict[str, float]) -> None:
+        # Caller holds the lock
+        self._entries[key] = scores
+        self._entries.move_to_end(key)
+        while len(self._entries) > self._max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def _record_redis_error(self, error: Exception) -> None:
+        with self._lock:
+            self.redis_errors += 1
+        logger.warning("Score cache Redis error: %s", error)
+
+
+_score_cache: Optional[ScoreCache] = None
+_score_cache_lock = threading.Lock()
+
+
+def get_score_cache() -> ScoreCache:
+    """Return this process's score cache"""
+    global _score_cache
+    with _score_cache_lock:
+        if _score_cache is None:
+            _score_cache = ScoreCache(
+                settings.SCORE_CACHE_MAX_ENTRIES,
+                redis_url=settings.REDIS_URL if settings.SCORE_CACHE_REDIS else None,
+                ttl_seconds=settings.SCORE_CACHE_TTL_SECONDS
+            )
+        return _score_cache
+
+
+def score_with_cache(
+    resume_text: str,
+    jd_text: str,
+    platform: str,
+    jd_signals: Optional[Dict[str, Any]] = None,
+    parsed_resume: Optional[Dict[str, Any]] = None
+) -> Tuple[Dict[str, float], bool]:
+    """calculate_survivability_score through the cache; returns (scores, cache hit)"""
+    start = perf_counter()
+    cache = get_score_cache()
+    if jd_signals is None:
+        jd_signals = extract_jd_signals(jd_text)
+    key = score_cache_key(resume_text, jd_text, platform, jd_signals)
+    scores = cache.get(key)
+    if scores is not None:
+        record_stage("score", perf_counter() - start, "hit")
+        return scores, True
+
+    scores = calculate_survivability_score(
+        resume_text, jd_text, platform, jd_signals=jd_signals, parsed_resume=parsed_resume
+    )
+    cache.put(key, scores)
+    record_stage("score", perf_counter() - start, "miss")
+    return scores, False
+
+
+def cached_survivability_score(
+    resume_text: str,
+    jd_text: str,
+    platform: str,
+    jd_signals: Optional[Dict[str, Any]] = None,
+    parsed_resume: Optional[Dict[str, Any]] = None
+) -> Dict[str, float]:
+    """Drop-in replacement for calculate_survivability_score that uses the cache"""
+    return score_with_cache(resume_text, jd_text, platform, jd_signals, parsed_resume)[0]
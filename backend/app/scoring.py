@@ -1,42 +1,92 @@
-from typing import Dict, Any, List
+from typing import Dict, Any, AbstractSet, List, Optional
 import re
 from datetime import datetime
 from .jd_extract import extract_jd_signals, extract_keywords
 from .platform_profiles import get_platform_profile
+from .matcher import get_keyword_matcher, is_single_word
 
+# Bump when a scoring heuristic changes, so cached scores are recomputed
+# (see score_cache.scorer_version)
+SCORING_VERSION = 1
 
-def calculate_keyword_score(resume_text: str, jd_keywords: List[str]) -> float:
-    """Calculate keyword match score (0-1)"""
+# Words that mark a line as a job title
+TITLE_WORDS = ['engineer', 'developer', 'architect', 'manager', 'lead']
+
+# Resume terms that suggest a senior candidate
+SENIOR_TERMS = ['senior', 'lead', 'principal', 'architect', 'director', 'vp', 'cto']
+
+# Recency score used until experience dates are parsed
+DEFAULT_RECENCY_SCORE = 0.7
+
+# Penalty weights for the risk scores
+AGE_RISK_WEIGHT = 0.1
+OVERQUAL_RISK_WEIGHT = 0.1
+
+# Years (1980-2029) that can date a candidate
+YEAR_RE = re.compile(r'\b(19[89]\d|20[0-2]\d)\b')
+
+
+def calculate_keyword_score(
+    resume_text: str,
+    jd_keywords: List[str],
+    resume_tokens: Optional[AbstractSet[str]] = None
+) -> float:
+    """Calculate keyword match score (0-1)
+    
+    With the resume's token set, single-word keywords are looked up
+    directly and only multi-word keywords need a scan of the text.
+    """
     if not jd_keywords:
         return 0.0
     
-    resume_lower = resume_text.lower()
-    matches = sum(1 for keyword in jd_keywords if keyword.lower() in resume_lower)
+    keywords = [keyword.lower() for keyword in jd_keywords]
+    if resume_tokens is None:
+        found = get_keyword_matcher(jd_keywords).scan(resume_text)
+        matches = sum(1 for keyword in keywords if keyword in found)
+    else:
+        phrases = [keyword for keyword in keywords if not is_single_word(keyword)]
+        found = get_keyword_matcher(phrases).scan(resume_text) if phrases else {}
+        matches = sum(
+            1 for keyword in keywords
+            if (keyword in resume_tokens if is_single_word(keyword) else keyword in found)
+        )
     
     return min(matches / len(jd_keywords), 1.0)
 
 
-def calculate_title_score(resume_text: str, jd_text: str) -> float:
+def _is_title_line(line: str) -> bool:
+    line_lower = line.lower()
+    return any(word in line_lower for word in TITLE_WORDS)
+
+
+def extract_jd_title(jd_text: str) -> Optional[str]:
+    """Return the first title-like line among the JD's first 10 lines"""
+    for line in jd_text.split('\n')[:10]:
+        if _is_title_line(line):
+            return line.strip()
+    return None
+
+
+def extract_resume_titles(resume_text: str) -> List[str]:
+    """Return title-like lines among the resume's first 50 lines"""
+    return [line.strip() for line in resume_text.split('\n')[:50] if _is_title_line(line)]
+
+
+def calculate_title_score(
+    resume_text: str,
+    jd_text: str,
+    resume_titles: Optional[List[str]] = None
+) -> float:
     """Calculate title alignment score (0-1)"""
     # Extract job title from JD (simple heuristic)
-    jd_lines = jd_text.split('\n')[:10]  # Check first 10 lines
-    jd_title = None
-    
-    for line in jd_lines:
-        if any(word in line.lower() for word in ['engineer', 'developer', 'architect', 'manager', 'lead']):
-            jd_title = line.strip()
-            break
+    jd_title = extract_jd_title(jd_text)
     
     if not jd_title:
         return 0.5  # Neutral if can't detect
     
     # Extract titles from resume
-    resume_lines = resume_text.split('\n')[:50]
-    resume_titles = []
-    
-    for line in resume_lines:
-        if any(word in line.lower() for word in ['engineer', 'developer', 'architect', 'manager', 'lead']):
-            resume_titles.append(line.strip())
+    if resume_titles is None:
+        resume_titles = extract_resume_titles(resume_text)
     
     if not resume_titles:
         return 0.3  # Low score if no titles found
@@ -58,22 +108,21 @@ def calculate_title_score(resume_text: str, jd_text: str) -> float:
     return 0.3  # Low match
 
 
-def calculate_age_proxy_risk(resume_text: str) -> float:
+def extract_years(resume_text: str) -> List[int]:
+    """Return the distinct years mentioned in the resume, oldest first"""
+    return sorted({int(year) for year in YEAR_RE.findall(resume_text)})
+
+
+def calculate_age_proxy_risk(resume_text: str, years: Optional[List[int]] = None) -> float:
     """Calculate age proxy risk (0-1, higher = more risk)"""
     # Look for graduation dates, very old experience dates
-    text_lower = resume_text.lower()
-    
-    # Find years (1980-2024)
-    years = re.findall(r'\b(19[89]\d|20[0-2]\d)\b', resume_text)
+    if years is None:
+        years = extract_years(resume_text)
     
     if not years:
         return 0.1  # Low risk if no dates
     
-    years_int = [int(y) for y in years if y.isdigit()]
-    if not years_int:
-        return 0.1
-    
-    oldest_year = min(years_int)
+    oldest_year = min(years)
     current_year = datetime.now().year
     
     # Risk increases if oldest year is before 2000
@@ -89,15 +138,14 @@ def calculate_age_proxy_risk(resume_text: str) -> float:
     return 0.1  # Low risk
 
 
-def calculate_overqual_risk(resume_text: str, jd_signals: Dict[str, Any]) -> float:
-    """Calculate overqualification risk (0-1, higher = more risk)"""
-    jd_seniority = jd_signals.get("seniority", "unspecified")
+def has_senior_terms(resume_text: str) -> bool:
+    """Check the resume for senior indicators"""
     resume_lower = resume_text.lower()
-    
-    # Check for senior indicators in resume
-    senior_terms = ['senior', 'lead', 'principal', 'architect', 'director', 'vp', 'cto']
-    resume_has_senior = any(term in resume_lower for term in senior_terms)
-    
+    return any(term in resume_lower for term in SENIOR_TERMS)
+
+
+def overqual_risk_for(resume_has_senior: bool, jd_seniority: str) -> float:
+    """Map resume seniority vs JD seniority to an overqualification risk"""
     # Risk if resume is senior but JD is junior
     if resume_has_senior and jd_seniority == "junior":
         return 0.7  # High risk
@@ -109,10 +157,24 @@ def calculate_overqual_risk(resume_text: str, jd_signals: Dict[str, Any]) -> flo
     return 0.1  # Low risk
 
 
+def calculate_overqual_risk(
+    resume_text: str,
+    jd_signals: Dict[str, Any],
+    resume_has_senior: Optional[bool] = None
+) -> float:
+    """Calculate overqualification risk (0-1, higher = more risk)"""
+    jd_seniority = jd_signals.get("seniority", "unspecified")
+    if resume_has_senior is None:
+        resume_has_senior = has_senior_terms(resume_text)
+    return overqual_risk_for(resume_has_senior, jd_seniority)
+
+
 def calculate_survivability_score(
     resume_text: str,
     jd_text: str,
-    platform: str
+    platform: str,
+    jd_signals: Optional[Dict[str, Any]] = None,
+    parsed_resume: Optional[Dict[str, Any]] = None
 ) -> Dict[str, float]:
     """
     Calculate comprehensive survivability score.
@@ -120,9 +182,14 @@ def calculate_survivability_score(
     Formula:
     Survivability = (KeywordScore × Wk) + (TitleScore × Wt) + (Recency × Wr)
                    - (AgeRisk × 0.1) - (OverQualRisk × 0.1)
+    
+    Pass precomputed jd_signals to avoid re-extracting them from jd_text,
+    and the resume's current parsed_json (see parsing.build_parsed_json)
+    to reuse its titles, years and tokens instead of rescanning the text.
     """
     # Extract JD signals
-    jd_signals = extract_jd_signals(jd_text)
+    if jd_signals is None:
+        jd_signals = extract_jd_signals(jd_text)
     jd_keywords = jd_signals.get("top_terms", [])
     
     # Get platform weights
@@ -131,24 +198,27 @@ def calculate_survivability_score(
     wt = platform_profile["title_weight"]
     wr = platform_profile["recency_weight"]
     
+    parsed = parsed_resume or {}
+    resume_tokens = set(parsed["tokens"]) if "tokens" in parsed else None
+    
     # Calculate individual scores
-    keyword_score = calculate_keyword_score(resume_text, jd_keywords)
-    title_score = calculate_title_score(resume_text, jd_text)
+    keyword_score = calculate_keyword_score(resume_text, jd_keywords, resume_tokens)
+    title_score = calculate_title_score(resume_text, jd_text, parsed.get("title_lines"))
     
     # Recency score (simplified - can be enhanced with actual dates)
-    recency_score = 0.7  # Default, can be calculated from experience dates
+    recency_score = DEFAULT_RECENCY_SCORE  # Can be calculated from experience dates
     
     # Risk scores
-    age_risk = calculate_age_proxy_risk(resume_text)
-    overqual_risk = calculate_overqual_risk(resume_text, jd_signals)
+    age_risk = calculate_age_proxy_risk(resume_text, parsed.get("years"))
+    overqual_risk = calculate_overqual_risk(resume_text, jd_signals, parsed.get("has_senior_terms"))
     
     # Calculate survivability
     survivability = (
         (keyword_score * wk) +
         (title_score * wt) +
         (recency_score * wr) -
-        (age_risk * 0.1) -
-        (overqual_risk * 0.1)
+        (age_risk * AGE_RISK_WEIGHT) -
+        (overqual_risk * OVERQUAL_RISK_WEIGHT)
     )
     
     # Clamp to 0-1
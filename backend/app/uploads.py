@@ -0,0 +1,79 @@
+"""
+Spooling of uploaded files to disk.
+
+Uploads are copied to a temp file in fixed-size chunks and hashed on the
+way, so neither the API nor the parser holds a whole upload in memory.
+Whoever receives a spool file's path (normally a parse task) owns it and
+removes it when done.
+"""
+from dataclasses import dataclass
+from typing import Optional
+import hashlib
+import os
+import tempfile
+
+from fastapi import UploadFile
+
+from .config import settings
+from .parsing import get_file_type
+
+UPLOAD_CHUNK_SIZE = 256 * 1024
+
+
+class UploadTooLargeError(ValueError):
+    pass
+
+
+@dataclass
+class SpooledUpload:
+    path: str
+    content_hash: str  # SHA-256 of the uploaded bytes
+    size: int
+
+
+def _new_spool_file(filename: str):
+    return tempfile.NamedTemporaryFile(
+        prefix="resume-",
+        suffix=get_file_type(filename),
+        dir=settings.UPLOAD_SPOOL_DIR,
+        delete=False
+    )
+
+
+async def spool_upload(upload: UploadFile, max_bytes: int) -> SpooledUpload:
+    """Copy an upload to a spool file, rejecting it once it exceeds max_bytes"""
+    digest = hashlib.sha256()
+    size = 0
+    spool = _new_spool_file(upload.filename)
+    try:
+        with spool:
+            while True:
+                chunk = await upload.read(UPLOAD_CHUNK_SIZE)
+                if not chunk:
+                    break
+                size += len(chunk)
+                if size > max_bytes:
+                    raise UploadTooLargeError(f"File exceeds the {max_bytes // (1024 * 1024)} MB upload limit")
+                digest.update(chunk)
+                spool.write(chunk)
+    except BaseException:
+        remove_spool_file(spool.name)
+        raise
+    return SpooledUpload(spool.name, digest.hexdigest(), size)
+
+
+def write_spool_file(content: bytes, filename: str) -> str:
+    """Write bytes received from elsewhere (e.g. Redis) to a new spool file"""
+    with _new_spool_file(filename) as spool:
+        spool.write(content)
+    return spool.name
+
+
+def remove_spool_file(path: Optional[str]) -> None:
+    """Delete a spool file; already-removed files are ignored"""
+    if not path:
+        return
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
@@ -0,0 +1,164 @@
+"""
+Storage of compiled variant text.
+
+Each distinct compiled text is stored once in variant_texts, keyed by its
+SHA-256 and zlib-compressed, and variants point at it through text_hash.
+The variants of one resume and JD differ only in the persona summary, so
+the platforms share a text, and compiled texts are mostly the resume's
+own sections, which compress well. Variants stored before text_hash
+existed keep their compiled_text inline; the loaders below fill it in
+either way.
+
+variant_input_hash fingerprints everything a compile depends on,
+including the JD signals it used (their keywords are ranked against the
+changing corpus, so they don't follow from the JD text alone), so a
+compile whose inputs match a stored variant can return that variant
+instead of inserting an identical one. A unique index on (resume_id,
+jd_id, input_hash) backs this up when two compiles race; insert_variants
+skips the loser's rows.
+"""
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+import hashlib
+import uuid
+import zlib
+
+from sqlalchemy import select
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session
+from sqlalchemy.orm.attributes import set_committed_value
+
+from .compiler import COMPILER_VERSION
+from .jd_extract import SIGNALS_VERSION
+from .models import ResumeVariant, VariantText
+from .parsing import PARSER_VERSION
+from .score_cache import scorer_version, signals_hash, text_hash
+
+COMPRESSION_LEVEL = 6
+
+_INSERTS = {"postgresql": postgresql.insert, "sqlite": sqlite.insert}
+
+
+def variant_input_hash(
+    resume_text: str,
+    jd_text: str,
+    persona: str,
+    platform: str,
+    jd_signals: Dict[str, Any]
+) -> str:
+    """Fingerprint of a compile's inputs plus the compiler, parser, signal and scorer versions"""
+    fingerprint = "\0".join([
+        str(COMPILER_VERSION),
+        str(PARSER_VERSION),
+        str(SIGNALS_VERSION),
+        scorer_version(),
+        text_hash(resume_text),
+        text_hash(jd_text),
+        signals_hash(jd_signals),
+        persona.lower(),
+        platform.lower(),
+    ])
+    return hashlib.sha256(fingerprint.encode("utf-8")).hexdigest()
+
+
+def compress_text(text: str) -> bytes:
+    return zlib.compress(text.encode("utf-8"), COMPRESSION_LEVEL)
+
+
+def decompress_text(data: bytes) -> str:
+    return zlib.decompress(data).decode("utf-8")
+
+
+def store_compiled_texts(db: Session, texts: Iterable[str]) -> List[str]:
+    """Store texts not stored yet, returning each text's hash in order. The caller commits."""
+    texts = list(texts)
+    hashes = [text_hash(text) for text in texts]
+    rows = {
+        digest: {"text_hash": digest, "compressed": compress_text(text), "size_bytes": len(text.encode("utf-8"))}
+        for digest, text in zip(hashes, texts)
+    }
+    if rows:
+        statement = _INSERTS[db.get_bind().dialect.name](VariantText).on_conflict_do_nothing(
+            index_elements=[VariantText.__table__.c.text_hash]
+        )
+        # Sorted so concurrent writers lock rows in the same order
+        ordered = [rows[digest] for digest in sorted(rows)]
+        for start in range(0, len(ordered), 1000):
+            db.execute(statement, ordered[start:start + 1000])
+    return hashes
+
+
+def load_compiled_texts(db: Session, hashes: Iterable[Optional[str]]) -> Dict[str, str]:
+    """Decompressed text by hash; None entries are skipped"""
+    wanted = list({digest for digest in hashes if digest})
+    texts = {}
+    for start in range(0, len(wanted), 1000):
+        rows = db.execute(
+            select(VariantText.text_hash, VariantText.compressed)
+            .where(VariantText.text_hash.in_(wanted[start:start + 1000]))
+        )
+        texts.update({digest: decompress_text(compressed) for digest, compressed in rows})
+    return texts
+
+
+def fill_compiled_text(db: Session, variants: List[ResumeVariant]) -> None:
+    """Load compiled_text onto variants stored by hash, without marking them modified"""
+    pending = [variant for variant in variants if variant.compiled_text is None and variant.text_hash]
+    texts = load_compiled_texts(db, (variant.text_hash for variant in pending))
+    for variant in pending:
+        set_committed_value(variant, "compiled_text", texts.get(variant.text_hash))
+
+
+def fill_compiled_text_rows(db: Session, rows: List[dict]) -> None:
+    """fill_compiled_text for list rows selected with compiled_text and text_hash"""
+    pending = [row for row in rows if row.get("compiled_text") is None and row.get("text_hash")]
+    texts = load_compiled_texts(db, (row["text_hash"] for row in pending))
+    for row in pending:
+        row["compiled_text"] = texts.get(row["text_hash"])
+
+
+def find_variant(db: Session, resume_id, jd_id, input_hash: str) -> Optional[ResumeVariant]:
+    """A stored variant of the resume and JD compiled from the same inputs, with its text loaded"""
+    variant = db.execute(
+        select(ResumeVariant)
+        .where(
+            ResumeVariant.input_hash == input_hash,
+            ResumeVariant.resume_id == resume_id,
+            ResumeVariant.jd_id == jd_id
+        )
+        .limit(1)
+    ).scalars().first()
+    if variant is not None:
+        fill_compiled_text(db, [variant])
+    return variant
+
+
+def stored_variant_ids_by_jd(
+    db: Session,
+    resume_id: uuid.UUID,
+    jd_ids: List[uuid.UUID],
+    input_hashes: Iterable[str]
+) -> Dict[Tuple[uuid.UUID, str], uuid.UUID]:
+    """Stored variant id by (JD id, input hash), among the resume's variants of jd_ids compiled from input_hashes"""
+    wanted = list(set(input_hashes))
+    stored = {}
+    for start in range(0, len(wanted), 1000):
+        rows = db.execute(
+            select(ResumeVariant.jd_id, ResumeVariant.input_hash, ResumeVariant.id)
+            .where(
+                ResumeVariant.resume_id == resume_id,
+                ResumeVariant.jd_id.in_(jd_ids),
+                ResumeVariant.input_hash.in_(wanted[start:start + 1000])
+            )
+        )
+        stored.update({(jd_id, input_hash): variant_id for jd_id, input_hash, variant_id in rows})
+    return stored
+
+
+def insert_variants(db: Session, rows: List[dict]) -> None:
+    """Insert variant rows, skipping any already stored from the same inputs. The caller commits."""
+    if rows:
+        statement = _INSERTS[db.get_bind().dialect.name](ResumeVariant).on_conflict_do_nothing(
+            index_elements=[ResumeVariant.__table__.c[name] for name in ("resume_id", "jd_id", "input_hash")]
+        )
+        for start in range(0, len(rows), 1000):
+            db.execute(statement, rows[start:start + 1000])
@@ -0,0 +1,32 @@
+"""
+Resume parse worker. Consumes uploads queued in Redis by /resumes/upload.
+
+Usage (from the backend directory):
+    python -m app.worker
+"""
+import logging
+
+from .config import settings
+from .db import Base, engine
+from .parse_queue import ParseWorker, RedisParseQueue
+
+logger = logging.getLogger(__name__)
+
+
+def main() -> None:
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(name)s: %(message)s")
+    Base.metadata.create_all(bind=engine)
+
+    queue = RedisParseQueue(settings.REDIS_URL)
+    worker = ParseWorker(settings.PARSE_WORKERS)
+    logger.info("Parse worker started with %d parser processes", settings.PARSE_WORKERS)
+    try:
+        queue.consume(worker, max_in_flight=settings.PARSE_WORKERS)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        worker.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,11 @@
+"""
+Performance benchmarks for the ATS Resume Compiler backend.
+Run individual scripts from the backend directory, e.g.:
+
+    python -m benchmarks.bench_compile
+
+bench_functions and load_generator write JSON results with --json; compare
+two runs with:
+
+    python -m benchmarks.compare baseline.json current.json
+"""
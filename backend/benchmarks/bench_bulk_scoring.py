@@ -0,0 +1,83 @@
+"""
+Bulk survivability scoring: scalar loop vs the vectorized score matrix.
+
+Scores 1,000 synthetic resumes against 1,000 synthetic JDs on all three
+platforms. The scalar path is timed on a sample of pairs and
+extrapolated; a block of pairs is cross-checked for exact equality.
+"""
+import random
+import time
+
+from app.bulk_scoring import pair_scores, score_matrix
+from app.jd_extract import extract_jd_signals
+from app.platform_profiles import PLATFORM_PROFILES
+from app.scoring import calculate_survivability_score
+
+SKILLS = [
+    "python", "java", "javascript", "go", "terraform", "kubernetes", "docker",
+    "azure", "aws", "gcp", "postgresql", "redis", "react", "graphql", "grpc",
+    "linux", "ansible", "jenkins", "spark", "kafka", "airflow", "snowflake",
+]
+TITLES = [
+    "Software Engineer", "Senior Software Engineer", "Lead Developer",
+    "Platform Architect", "Engineering Manager", "Data Engineer",
+    "Frontend Developer", "Site Reliability Engineer",
+]
+FILLER = ["designed", "built", "delivered", "migrated", "mentored", "optimized", "systems", "services"]
+
+
+def make_resume(rng: random.Random) -> str:
+    lines = ["Candidate Name", "SUMMARY", f"{rng.choice(TITLES)} with broad delivery experience", "SKILLS"]
+    lines.append(", ".join(rng.sample(SKILLS, rng.randint(4, 12))))
+    lines.append("EXPERIENCE")
+    year = rng.randint(1988, 2016)
+    for _ in range(rng.randint(2, 5)):
+        lines.append(f"{rng.choice(TITLES)}, Company {rng.randint(1, 99)} ({year} - {year + rng.randint(1, 6)})")
+        lines.append(" ".join(rng.choices(FILLER + SKILLS, k=12)))
+        year += rng.randint(1, 6)
+    lines += ["EDUCATION", f"B.S. Computer Science ({rng.randint(1980, 2012)})"]
+    return "\n".join(lines)
+
+
+def make_jd(rng: random.Random) -> str:
+    lines = [rng.choice(TITLES), "", "We are hiring for a " + rng.choice(["junior", "mid-level", "senior", "principal"]) + " role."]
+    lines.append("Requirements: " + ", ".join(rng.sample(SKILLS, rng.randint(5, 10))))
+    lines.append(" ".join(rng.choices(FILLER + SKILLS, k=40)))
+    return "\n".join(lines)
+
+
+def main(resumes: int = 1000, jds: int = 1000, scalar_sample: int = 3000) -> None:
+    rng = random.Random(11)
+    resume_texts = [make_resume(rng) for _ in range(resumes)]
+    jd_texts = [make_jd(rng) for _ in range(jds)]
+    jd_signals = [extract_jd_signals(text) for text in jd_texts]
+    platforms = list(PLATFORM_PROFILES)
+    total = resumes * jds * len(platforms)
+
+    start = time.perf_counter()
+    matrix = score_matrix(resume_texts, jd_texts, jd_signals=jd_signals)
+    vectorized = time.perf_counter() - start
+
+    pairs = [(rng.randrange(resumes), rng.randrange(jds), rng.choice(platforms)) for _ in range(scalar_sample)]
+    start = time.perf_counter()
+    for i, j, platform in pairs:
+        calculate_survivability_score(resume_texts[i], jd_texts[j], platform, jd_signals=jd_signals[j])
+    scalar = (time.perf_counter() - start) / scalar_sample * total
+
+    # Exactness: every pair in a 50 x 50 block, every platform
+    mismatches = 0
+    for i in range(50):
+        for j in range(50):
+            for platform in platforms:
+                expected = calculate_survivability_score(resume_texts[i], jd_texts[j], platform, jd_signals=jd_signals[j])
+                if pair_scores(matrix, i, j, platform) != expected:
+                    mismatches += 1
+
+    print(f"{resumes} resumes x {jds} JDs x {len(platforms)} platforms = {total:,} scores\n")
+    print(f"{'scalar (extrapolated)':<28} {scalar:>9.1f} s")
+    print(f"{'vectorized':<28} {vectorized:>9.1f} s   speedup {scalar / vectorized:.0f}x")
+    print(f"{'mismatches in 7,500 checks':<28} {mismatches:>9}")
+
+
+if __name__ == "__main__":
+    main()
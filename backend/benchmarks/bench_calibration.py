@@ -0,0 +1,164 @@
+"""
+Platform weight calibration over stored outcomes.
+
+Seeds outcomes in a scratch SQLite database whose interview odds follow
+known per-platform keyword/title trade-offs, then:
+
+- streams them through calibration.accumulate_outcomes at --outcomes / 10
+  (at least two chunks) and at --outcomes rows, reporting throughput and peak traced memory,
+  which must stay flat as the table grows
+- checks each platform's fitted keyword share of keyword + title weight
+  against the generating one
+- writes the calibrated profiles and checks get_platform_profile and the
+  score cache version pick them up without a restart, and what the reload
+  check adds to a profile lookup
+
+    python -m benchmarks.bench_calibration --json calibration.json
+"""
+import argparse
+import os
+import random
+import tempfile
+import time
+import tracemalloc
+import uuid
+
+from sqlalchemy import create_engine, insert
+from sqlalchemy.orm import Session
+
+from app.calibration import accumulate_outcomes, calibrate_profiles
+from app.config import settings
+from app.db import Base
+from app.models import ApplicationOutcome, JobDescription, Resume, ResumeVariant
+from app.platform_profiles import get_platform_profile, refresh_platform_profiles
+from app.score_cache import scorer_version
+
+from .common import measure
+from .results import record, write_results
+
+# Interview probability = base + keyword x K + title x T; keyword share = keyword / (keyword + title)
+TRUTH = {
+    "linkedin": {"base": 0.05, "keyword": 0.15, "title": 0.45},
+    "indeed": {"base": 0.05, "keyword": 0.40, "title": 0.20},
+    "dice": {"base": 0.02, "keyword": 0.55, "title": 0.05},
+}
+VARIANTS = 20_000
+
+
+def seed(db: Session, rng: random.Random, variants: list, outcomes: int) -> None:
+    for start in range(0, outcomes, 20000):
+        rows = []
+        for _ in range(min(20000, outcomes - start)):
+            variant = rng.choice(variants)
+            truth, scores = TRUTH[variant["platform"]], variant["scores"]
+            p = truth["base"] + truth["keyword"] * scores["keyword_score"] + truth["title"] * scores["title_score"]
+            status = "interview" if rng.random() < p else rng.choice(["rejected", "rejected", "ghosted"])
+            rows.append({"id": uuid.uuid4(), "variant_id": variant["id"], "status": status})
+        db.execute(insert(ApplicationOutcome), rows)
+    db.commit()
+
+
+def seed_variants(db: Session, rng: random.Random) -> list:
+    resume = Resume(user_id="bench_calibration", raw_text="resume")
+    jd = JobDescription(platform="linkedin", raw_text="jd")
+    db.add_all([resume, jd])
+    db.flush()
+    variants = [
+        {
+            "id": uuid.uuid4(),
+            "resume_id": resume.id,
+            "jd_id": jd.id,
+            "persona": rng.choice(["ic", "architect", "hybrid"]),
+            "platform": rng.choice(list(TRUTH)),
+            "scores": {
+                "keyword_score": round(rng.random(), 2),
+                "title_score": round(rng.random(), 2),
+                "age_proxy_risk": rng.choice([0.1, 0.5, 0.8]),
+                "overqual_risk": rng.choice([0.1, 0.2, 0.6]),
+            },
+        }
+        for _ in range(VARIANTS)
+    ]
+    for start in range(0, len(variants), 5000):
+        db.execute(insert(ResumeVariant), variants[start:start + 5000])
+    db.commit()
+    return variants
+
+
+def streamed(db: Session, batch_size: int) -> tuple:
+    """Fits, seconds and peak traced bytes of one pass over the outcomes"""
+    tracemalloc.start()
+    start = time.perf_counter()
+    fits = accumulate_outcomes(db, batch_size=batch_size)
+    seconds = time.perf_counter() - start
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return fits, seconds, peak
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--outcomes", type=int, default=1_000_000)
+    parser.add_argument("--batch-size", type=int, default=10000)
+    parser.add_argument("--seed", type=int, default=23)
+    parser.add_argument("--json", help="Write results to this file")
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    records = []
+    with tempfile.TemporaryDirectory(prefix="bench_calibration_") as directory:
+        engine = create_engine(f"sqlite:///{os.path.join(directory, 'outcomes.db')}")
+        Base.metadata.create_all(bind=engine)
+        with Session(engine) as db:
+            variants = seed_variants(db, rng)
+            seeded = 0
+            print(f"{'outcomes':>10} {'fitted':>8} {'seconds':>8} {'rows/s':>9} {'peak MB':>8}")
+            peaks = []
+            # The smaller pass still spans several chunks, so both peaks include a full one
+            for total in (max(args.outcomes // 10, 2 * args.batch_size), args.outcomes):
+                seed(db, rng, variants, total - seeded)
+                seeded = total
+                fits, seconds, peak = streamed(db, args.batch_size)
+                fitted = sum(fit.outcomes for fit in fits.values())
+                peaks.append(peak)
+                print(f"{total:>10} {fitted:>8} {seconds:>8.2f} {total / seconds:>9.0f} {peak / 2**20:>8.2f}")
+                records.append(record(f"accumulate[{total}]", seconds, "s", peak_bytes=peak))
+            assert peaks[1] < peaks[0] * 1.5, "Peak memory grew with the number of outcomes"
+
+            print(f"\n{'platform':<10} {'true share':>10} {'fitted':>8}")
+            for platform, truth in TRUTH.items():
+                coefficients = fits[platform].coefficients()
+                share = coefficients["keyword_score"] / (coefficients["keyword_score"] + coefficients["title_score"])
+                true_share = truth["keyword"] / (truth["keyword"] + truth["title"])
+                print(f"{platform:<10} {true_share:>10.3f} {share:>8.3f}")
+                assert abs(share - true_share) < 0.05, f"{platform} keyword share is off"
+
+            profiles_dir = os.path.join(directory, "profiles")
+            original_dir = settings.PLATFORM_PROFILES_DIR
+            lookup_builtin = measure(lambda: get_platform_profile("dice"), number=20000)["min_us"]
+            version_before = scorer_version()
+            try:
+                settings.PLATFORM_PROFILES_DIR = profiles_dir
+                result = calibrate_profiles(db, profiles_dir, min_outcomes=200, prior_outcomes=1000)
+                refresh_platform_profiles(force=True)
+                assert get_platform_profile("dice") == result["profiles"]["dice"], "Calibrated profile not loaded"
+                assert scorer_version() != version_before, "Score cache version did not change"
+                lookup_reloading = measure(lambda: get_platform_profile("dice"), number=20000)["min_us"]
+            finally:
+                settings.PLATFORM_PROFILES_DIR = original_dir
+                refresh_platform_profiles(force=True)
+        engine.dispose()
+
+    print(f"\nwrote and hot-loaded profiles v{result['version']}:")
+    for platform, weights in result["profiles"].items():
+        print(f"  {platform:<10} {weights}")
+    print(f"get_platform_profile: {lookup_builtin:.2f} us built-in, {lookup_reloading:.2f} us with reload checks")
+    records.append(record("lookup.builtin", lookup_builtin, "us"))
+    records.append(record("lookup.reloading", lookup_reloading, "us"))
+
+    if args.json:
+        write_results(args.json, "calibration", records, outcomes=args.outcomes, batch_size=args.batch_size)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+"""
+Per-compile latency with and without precomputed JD signals.
+
+The "re-extract" path mirrors the old /variants/compile behaviour, where
+both the compiler and the scorer ran extract_jd_signals on the raw JD.
+The "parsed resume" path also reuses the resume's stored parsed_json; its
+scores are first checked against the text-only scorer on generated pairs.
+"""
+import random
+
+from app.compiler import compile_resume_variant
+from app.jd_extract import extract_jd_signals
+from app.parsing import build_parsed_json
+from app.scoring import calculate_survivability_score
+
+from .bench_bulk_scoring import make_jd, make_resume
+from .common import SAMPLE_JD, SAMPLE_RESUME, measure, print_row
+
+
+def compile_reextract(resume_text: str, jd_text: str) -> None:
+    compile_resume_variant(resume_text, jd_text, "ic", "linkedin")
+    calculate_survivability_score(resume_text, jd_text, "linkedin")
+
+
+def compile_precomputed(resume_text: str, jd_text: str, jd_signals: dict) -> None:
+    compile_resume_variant(resume_text, jd_text, "ic", "linkedin", jd_signals=jd_signals)
+    calculate_survivability_score(resume_text, jd_text, "linkedin", jd_signals=jd_signals)
+
+
+def compile_parsed(resume_text: str, jd_text: str, jd_signals: dict, parsed: dict) -> None:
+    compile_resume_variant(
+        resume_text, jd_text, "ic", "linkedin",
+        jd_signals=jd_signals, resume_sections=parsed["sections"]
+    )
+    calculate_survivability_score(resume_text, jd_text, "linkedin", jd_signals=jd_signals, parsed_resume=parsed)
+
+
+def check_parsed_scores(pairs: int = 2000) -> None:
+    rng = random.Random(5)
+    for _ in range(pairs):
+        resume_text, jd_text = make_resume(rng), make_jd(rng)
+        signals = extract_jd_signals(jd_text)
+        expected = calculate_survivability_score(resume_text, jd_text, "dice", jd_signals=signals)
+        actual = calculate_survivability_score(
+            resume_text, jd_text, "dice", jd_signals=signals, parsed_resume=build_parsed_json(resume_text)
+        )
+        assert actual == expected, f"Parsed-resume scores differ: {actual} != {expected}"
+
+
+def main() -> None:
+    check_parsed_scores()
+    print("Parsed-resume scores match the text-only scorer\n")
+
+    jd_signals = extract_jd_signals(SAMPLE_JD)
+    parsed = build_parsed_json(SAMPLE_RESUME)
+    # A long posting makes the cost of re-extraction more visible
+    long_jd = SAMPLE_JD * 20
+
+    print("Per-compile latency (compile + score)\n")
+    for label, jd_text in (("sample JD", SAMPLE_JD), ("long JD (20x)", long_jd)):
+        signals = jd_signals if jd_text is SAMPLE_JD else extract_jd_signals(jd_text)
+        before = measure(lambda: compile_reextract(SAMPLE_RESUME, jd_text))
+        after = measure(lambda: compile_precomputed(SAMPLE_RESUME, jd_text, signals))
+        with_parse = measure(lambda: compile_parsed(SAMPLE_RESUME, jd_text, signals, parsed))
+        print_row(f"{label}: re-extract signals", before)
+        print_row(f"{label}: precomputed signals", after)
+        print_row(f"{label}: + parsed resume", with_parse)
+        print(f"{'':<40} speedup {before['median_us'] / with_parse['median_us']:.2f}x\n")
+
+
+if __name__ == "__main__":
+    main()
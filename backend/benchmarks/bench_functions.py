@@ -0,0 +1,128 @@
+"""
+Microbenchmarks for every public function in scoring.py, compiler.py and
+jd_extract.py.
+
+Text-taking functions run on generated short, medium and long resumes and
+JDs (see generators.SIZES); the rest run once. CASES must cover each
+public function of the three modules, so a new function fails the run
+until it gets a benchmark.
+
+    python -m benchmarks.bench_functions --json functions.json
+"""
+import argparse
+import inspect
+import random
+from typing import Any, Callable, Dict, List, Tuple
+
+from app import compiler, jd_extract, scoring
+from app.parsing import build_parsed_json
+
+from .common import measure
+from .generators import SIZES, make_jd, make_resume
+from .results import record, write_results
+
+MODULES = [scoring, compiler, jd_extract]
+
+# (function, inputs -> zero-argument call); inputs hold one size's texts and derived data
+Case = Tuple[Callable, Callable[[Dict[str, Any]], Callable[[], Any]]]
+
+SIZED_CASES: List[Case] = [
+    (scoring.calculate_keyword_score, lambda d: lambda: scoring.calculate_keyword_score(d["resume"], d["keywords"])),
+    (scoring.extract_jd_title, lambda d: lambda: scoring.extract_jd_title(d["jd"])),
+    (scoring.extract_resume_titles, lambda d: lambda: scoring.extract_resume_titles(d["resume"])),
+    (scoring.calculate_title_score, lambda d: lambda: scoring.calculate_title_score(d["resume"], d["jd"])),
+    (scoring.extract_years, lambda d: lambda: scoring.extract_years(d["resume"])),
+    (scoring.calculate_age_proxy_risk, lambda d: lambda: scoring.calculate_age_proxy_risk(d["resume"])),
+    (scoring.has_senior_terms, lambda d: lambda: scoring.has_senior_terms(d["resume"])),
+    (scoring.calculate_overqual_risk, lambda d: lambda: scoring.calculate_overqual_risk(d["resume"], d["signals"])),
+    (scoring.calculate_survivability_score, lambda d: lambda: scoring.calculate_survivability_score(
+        d["resume"], d["jd"], "linkedin", jd_signals=d["signals"], parsed_resume=d["parsed"]
+    )),
+    (compiler.extract_resume_sections, lambda d: lambda: compiler.extract_resume_sections(d["resume"])),
+    (compiler.find_matching_skills, lambda d: lambda: compiler.find_matching_skills(d["resume"], d["keywords"])),
+    (compiler.create_persona_summary, lambda d: lambda: compiler.create_persona_summary(
+        "architect", d["parsed"]["sections"], d["signals"]
+    )),
+    (compiler.compile_resume_variant, lambda d: lambda: compiler.compile_resume_variant(
+        d["resume"], d["jd"], "ic", "linkedin", jd_signals=d["signals"], resume_sections=d["parsed"]["sections"]
+    )),
+    (jd_extract.normalize_jd_text, lambda d: lambda: jd_extract.normalize_jd_text(d["jd"])),
+    (jd_extract.jd_text_hash, lambda d: lambda: jd_extract.jd_text_hash(d["jd"])),
+    (jd_extract.count_terms, lambda d: lambda: jd_extract.count_terms(d["jd"])),
+    (jd_extract.document_terms, lambda d: lambda: jd_extract.document_terms(d["jd"])),
+    (jd_extract.extract_keywords, lambda d: lambda: jd_extract.extract_keywords(d["jd"])),
+    (jd_extract.detect_seniority, lambda d: lambda: jd_extract.detect_seniority(d["jd"])),
+    (jd_extract.detect_hands_on_bias, lambda d: lambda: jd_extract.detect_hands_on_bias(d["jd"])),
+    (jd_extract.detect_fast_paced, lambda d: lambda: jd_extract.detect_fast_paced(d["jd"])),
+    (jd_extract.extract_jd_signals, lambda d: lambda: jd_extract.extract_jd_signals(d["jd"])),
+    (jd_extract.extract_jd_signals_and_terms, lambda d: lambda: jd_extract.extract_jd_signals_and_terms(d["jd"])),
+]
+
+UNSIZED_CASES: List[Case] = [
+    (scoring.overqual_risk_for, lambda d: lambda: scoring.overqual_risk_for(True, "mid")),
+    (jd_extract.load_tech_terms, lambda d: jd_extract.load_tech_terms),
+    (jd_extract.is_keyword_candidate, lambda d: lambda: jd_extract.is_keyword_candidate("kubernetes")),
+    (jd_extract.signals_are_current, lambda d: lambda: jd_extract.signals_are_current(d["signals"])),
+]
+
+
+def public_functions() -> List[Callable]:
+    return [
+        function
+        for module in MODULES
+        for name, function in inspect.getmembers(module, inspect.isfunction)
+        if function.__module__ == module.__name__ and not name.startswith("_")
+    ]
+
+
+def check_coverage() -> None:
+    covered = {function for function, _ in SIZED_CASES + UNSIZED_CASES}
+    missing = [f"{f.__module__}.{f.__name__}" for f in public_functions() if f not in covered]
+    assert not missing, f"No benchmark for: {', '.join(missing)}"
+
+
+def make_inputs(seed: int, size: str) -> Dict[str, Any]:
+    rng = random.Random(seed)
+    resume, jd = make_resume(rng, SIZES[size]), make_jd(rng, SIZES[size])
+    signals = jd_extract.extract_jd_signals(jd)
+    return {
+        "resume": resume,
+        "jd": jd,
+        "signals": signals,
+        "keywords": signals["top_terms"],
+        "parsed": build_parsed_json(resume),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--json", help="Write results to this file")
+    parser.add_argument("--number", type=int, default=200, help="Calls per timing sample")
+    parser.add_argument("--seed", type=int, default=19)
+    args = parser.parse_args()
+
+    check_coverage()
+    inputs = {size: make_inputs(args.seed, size) for size in SIZES}
+    records = []
+
+    def run(function: Callable, call: Callable[[], Any], size: str, chars: int) -> None:
+        name = f"{function.__module__.split('.')[-1]}.{function.__name__}"
+        stats = measure(call, repeat=5, number=args.number)
+        records.append(record(
+            f"{name}[{size}]", stats["median_us"], "us", min_us=stats["min_us"], chars=chars
+        ))
+        print(f"{name:<48} {size:<7} {chars:>7} {stats['median_us']:>10.1f} {stats['min_us']:>10.1f}")
+
+    print(f"{'function':<48} {'size':<7} {'chars':>7} {'median us':>10} {'min us':>10}")
+    for function, make_call in SIZED_CASES:
+        for size, data in inputs.items():
+            run(function, make_call(data), size, len(data["resume"]) + len(data["jd"]))
+    for function, make_call in UNSIZED_CASES:
+        run(function, make_call(inputs["medium"]), "-", 0)
+
+    if args.json:
+        write_results(args.json, "functions", records, seed=args.seed, number=args.number)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,136 @@
+"""
+Corpus IDF for JD keyword ranking.
+
+Seeds 10,000 synthetic JDs into the configured database, then times:
+
+- rebuild: python -m app.cli rebuild-idf over the whole corpus
+- snapshot load: reading jd_term_frequencies into memory, as the API does
+  at startup
+- extract_keywords with raw-frequency ranking vs TF-IDF against the
+  loaded snapshot (no database access per call)
+
+Every posting repeats "experience" and a few boilerplate lines but names a
+domain only a few postings share, so it also reports how often each
+ranking puts the domain, and "experience", in a posting's top 5 keywords.
+The seeded rows are deleted and the frequencies recounted afterwards.
+"""
+import random
+import time
+import uuid
+from typing import Tuple
+
+from sqlalchemy import insert
+
+from app.db import Base, SessionLocal, engine
+from app.jd_extract import DocumentFrequencies, document_frequencies, extract_keywords
+from app.jd_idf import rebuild_document_frequencies, refresh_document_frequencies
+from app.models import JobDescription
+
+from .bench_bulk_scoring import SKILLS, make_jd
+from .common import SAMPLE_JD, measure
+
+POSTINGS = 10_000
+BOILERPLATE = [
+    "We offer competitive salary, flexible working hours and excellent benefits.",
+    "Candidates must have proven experience, strong communication and the ability to work independently.",
+    "Our company values diversity; qualified applicants will receive consideration for employment.",
+]
+# What sets one posting apart from the next
+DOMAINS = [
+    "payments", "healthcare", "logistics", "telemetry", "compliance", "billing",
+    "genomics", "insurance", "marketplace", "streaming", "robotics", "trading",
+    "identity", "search", "advertising", "gaming", "mapping", "messaging",
+    "warehouse", "ticketing", "lending", "payroll", "pharmacy", "energy",
+]
+def make_posting(rng: random.Random) -> str:
+    requirements = [
+        f"- {rng.randint(2, 8)}+ years of experience with {skill}"
+        for skill in rng.sample(SKILLS, rng.randint(3, 6))
+    ]
+    domain = rng.choice(DOMAINS)
+    about = f"Join the {domain} team building {domain} products used by millions."
+    return "\n".join([make_jd(rng), about, *requirements, *rng.sample(BOILERPLATE, 2)])
+
+
+def top5_shares(texts) -> Tuple[float, float]:
+    """Share of postings with their domain, and with "experience", in the top 5 keywords"""
+    domain = experience = 0
+    for text in texts:
+        top = extract_keywords(text, top_n=5)
+        domain += any(term in DOMAINS for term in top)
+        experience += "experience" in top
+    return domain / len(texts), experience / len(texts)
+
+
+def cleanup(ids) -> None:
+    with SessionLocal() as db:
+        for start in range(0, len(ids), 1000):
+            db.query(JobDescription).filter(JobDescription.id.in_(ids[start:start + 1000])).delete(
+                synchronize_session=False
+            )
+        db.commit()
+        rebuild_document_frequencies(db)
+
+
+def main() -> None:
+    Base.metadata.create_all(bind=engine)
+    rng = random.Random(29)
+    texts = [make_posting(rng) for _ in range(POSTINGS)]
+    ids = [uuid.uuid4() for _ in texts]
+    sample = texts[:500]
+    posting = make_posting(rng)
+
+    # Ranking before the corpus exists is by raw frequency
+    document_frequencies.replace(0, {})
+    frequency_ranked = extract_keywords(posting)
+    frequency_shares = top5_shares(sample)
+    frequency_latency = {
+        label: measure(lambda: extract_keywords(text), repeat=5, number=500)["median_us"]
+        for label, text in (("posting", posting), ("sample JD", SAMPLE_JD))
+    }
+
+    try:
+        with SessionLocal() as db:
+            for start in range(0, POSTINGS, 1000):
+                db.execute(insert(JobDescription), [
+                    {"id": jd_id, "platform": "linkedin", "raw_text": text}
+                    for jd_id, text in zip(ids[start:start + 1000], texts[start:start + 1000])
+                ])
+            db.commit()
+
+            start = time.perf_counter()
+            counted = rebuild_document_frequencies(db)
+            rebuild = time.perf_counter() - start
+            start = time.perf_counter()
+            refresh_document_frequencies(db)
+            load = time.perf_counter() - start
+
+        print(f"rebuild-idf: {counted} JDs in {rebuild:.2f}s ({counted / rebuild:.0f} JDs/s)")
+        print(f"snapshot load: {len(document_frequencies)} terms in {load * 1000:.1f} ms\n")
+        assert counted >= POSTINGS
+        assert document_frequencies.is_ready()
+
+        # A copy of the snapshot ranks the same as the shared one
+        documents, df = document_frequencies.state()
+        copy = DocumentFrequencies()
+        copy.replace(documents, df)
+        assert extract_keywords(posting, frequencies=copy) == extract_keywords(posting)
+
+        print(f"{'posting':<12} {'frequency us':>13} {'tf-idf us':>10}")
+        for label, text in (("posting", posting), ("sample JD", SAMPLE_JD)):
+            tfidf = measure(lambda: extract_keywords(text), repeat=5, number=500)["median_us"]
+            print(f"{label:<12} {frequency_latency[label]:>13.1f} {tfidf:>10.1f}")
+
+        tfidf_shares = top5_shares(sample)
+        print(f"\n{'in top 5 keywords':<18} {'frequency':>10} {'tf-idf':>7}")
+        for label, frequency_share, tfidf_share in zip(("domain", '"experience"'), frequency_shares, tfidf_shares):
+            print(f"{label:<18} {frequency_share:>10.0%} {tfidf_share:>7.0%}")
+        print(f"frequency: {frequency_ranked[:10]}")
+        print(f"tf-idf:    {extract_keywords(posting)[:10]}")
+        assert tfidf_shares[0] > frequency_shares[0] and tfidf_shares[1] < frequency_shares[1]
+    finally:
+        cleanup(ids)
+
+
+if __name__ == "__main__":
+    main()
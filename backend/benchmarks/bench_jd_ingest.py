@@ -0,0 +1,113 @@
+"""
+Throughput of ingesting 10k job descriptions.
+
+Compares, against the configured database:
+
+- one by one: POST /jds per posting (signals extracted inline, one commit
+  each), timed on the first 1,000 postings
+- bulk JSON / bulk NDJSON: all 10k postings in one POST /jds:bulk, with
+  signals extracted across a process pool
+
+Postings are generated with 2% repeats and 1% invalid items. The bulk run
+checks that every posting is accounted for and that a stored JD's signals
+match extract_jd_signals. The rows are deleted afterwards.
+"""
+import json
+import random
+import time
+import uuid
+
+from fastapi.testclient import TestClient
+
+from app.db import SessionLocal
+from app.jd_extract import extract_jd_signals
+from app.jd_ingest import extract_signals_bulk
+from app.main import app
+from app.models import JobDescription
+
+from .bench_bulk_scoring import make_jd
+from .common import SAMPLE_JD
+
+POSTINGS = 10_000
+ONE_BY_ONE_SAMPLE = 1_000
+PLATFORMS = ["linkedin", "indeed", "dice"]
+
+
+def make_postings(rng: random.Random):
+    postings = []
+    for i in range(POSTINGS):
+        if i and rng.random() < 0.02:
+            postings.append(dict(rng.choice(postings)))
+        elif rng.random() < 0.01:
+            postings.append({"platform": "monster", "raw_text": "invalid platform"})
+        else:
+            # Typical postings run to a few KB
+            text = f"{make_jd(rng)}\nReq {i}\n{SAMPLE_JD * 2}"
+            postings.append({"platform": rng.choice(PLATFORMS), "raw_text": text})
+    return postings
+
+
+def cleanup(ids) -> None:
+    with SessionLocal() as db:
+        ids = [uuid.UUID(str(jd_id)) for jd_id in ids]
+        for start in range(0, len(ids), 1000):
+            db.query(JobDescription).filter(JobDescription.id.in_(ids[start:start + 1000])).delete(
+                synchronize_session=False
+            )
+        db.commit()
+
+
+def main() -> None:
+    client = TestClient(app)
+    rng = random.Random(17)
+    postings = make_postings(rng)
+    texts = [posting["raw_text"] for posting in postings]
+
+    print(f"{'ingestion':<24} {'postings':>8} {'seconds':>8} {'postings/s':>11}")
+
+    start = time.perf_counter()
+    [extract_jd_signals(text) for text in texts]
+    elapsed = time.perf_counter() - start
+    print(f"{'extract, sequential':<24} {POSTINGS:>8} {elapsed:>8.2f} {POSTINGS / elapsed:>11.0f}")
+    start = time.perf_counter()
+    extract_signals_bulk(texts)
+    elapsed = time.perf_counter() - start
+    print(f"{'extract, process pool':<24} {POSTINGS:>8} {elapsed:>8.2f} {POSTINGS / elapsed:>11.0f}")
+
+    created = set()
+    try:
+        start = time.perf_counter()
+        for posting in postings[:ONE_BY_ONE_SAMPLE]:
+            response = client.post("/jds", json=posting)
+            if response.status_code == 200:
+                created.add(response.json()["id"])
+        elapsed = time.perf_counter() - start
+        print(f"{'one by one':<24} {ONE_BY_ONE_SAMPLE:>8} {elapsed:>8.2f} {ONE_BY_ONE_SAMPLE / elapsed:>11.0f}")
+        cleanup(created)
+        created.clear()
+
+        for label, kwargs in (
+            ("bulk JSON", {"json": postings}),
+            ("bulk NDJSON", {
+                "content": "\n".join(json.dumps(posting) for posting in postings).encode(),
+                "headers": {"content-type": "application/x-ndjson"},
+            }),
+        ):
+            start = time.perf_counter()
+            result = client.post("/jds:bulk", **kwargs).json()
+            elapsed = time.perf_counter() - start
+            print(f"{label:<24} {POSTINGS:>8} {elapsed:>8.2f} {POSTINGS / elapsed:>11.0f}")
+            assert result["created"] + result["duplicates"] + result["errors"] == POSTINGS
+            created.update(item["id"] for item in result["items"] if item["status"] == "created")
+
+            stored = client.get(f"/jds/{next(iter(created))}").json()
+            assert stored["extracted_signals"] == extract_jd_signals(stored["raw_text"]), "Signals differ"
+            print(f"{'':<24} created {result['created']}, duplicates {result['duplicates']}, errors {result['errors']}")
+            cleanup(created)
+            created.clear()
+    finally:
+        cleanup(created)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,131 @@
+"""
+extract_jd_signals on long postings: separate detectors vs one pass.
+
+legacy_extract_jd_signals below is the previous composition, where
+extract_keywords and each detector lowercased the JD again and scanned
+every indicator. Both must return identical signals on every generated
+posting, with indicators planted at random, before timings are printed.
+
+JD ingestion also needs document_terms; extract_jd_signals_and_terms
+gets both from the same pass and is timed against calling the two.
+"""
+import random
+from typing import Any, Dict
+
+from app.jd_extract import (
+    SIGNALS_VERSION,
+    document_terms,
+    extract_jd_signals,
+    extract_jd_signals_and_terms,
+    extract_keywords,
+)
+
+from .bench_bulk_scoring import make_jd
+from .common import SAMPLE_JD, measure
+
+INDICATORS = [
+    "Senior", "Sr. Engineer", "team lead", "Staff", "mid-level", "Mid Level", "experienced",
+    "Junior", "Jr. role", "entry level", "internship", "hands-on experience", "Hands On",
+    "write code", "development", "Fast-Paced", "dynamic", "startup", "rapid growth", "move fast",
+]
+
+
+def legacy_detect_seniority(text: str) -> str:
+    text_lower = text.lower()
+    senior_indicators = ['senior', 'sr.', 'lead', 'principal', 'architect', 'staff', 'expert']
+    mid_indicators = ['mid-level', 'mid level', 'intermediate', 'experienced']
+    junior_indicators = ['junior', 'jr.', 'entry', 'associate', 'intern']
+    senior_count = sum(1 for term in senior_indicators if term in text_lower)
+    mid_count = sum(1 for term in mid_indicators if term in text_lower)
+    junior_count = sum(1 for term in junior_indicators if term in text_lower)
+    if senior_count > 0:
+        return "senior"
+    elif mid_count > 0:
+        return "mid"
+    elif junior_count > 0:
+        return "junior"
+    else:
+        return "unspecified"
+
+
+def legacy_detect_hands_on_bias(text: str) -> bool:
+    text_lower = text.lower()
+    hands_on_terms = [
+        'hands-on', 'hands on', 'hands-on experience', 'coding', 'development',
+        'implement', 'build', 'develop', 'write code', 'programming'
+    ]
+    return any(term in text_lower for term in hands_on_terms)
+
+
+def legacy_detect_fast_paced(text: str) -> bool:
+    text_lower = text.lower()
+    fast_paced_terms = [
+        'fast-paced', 'fast paced', 'fast-moving', 'dynamic', 'startup',
+        'rapid growth', 'high growth', 'move fast'
+    ]
+    return any(term in text_lower for term in fast_paced_terms)
+
+
+def legacy_extract_jd_signals(raw_text: str) -> Dict[str, Any]:
+    """extract_jd_signals as it was before the detectors were combined"""
+    return {
+        "version": SIGNALS_VERSION,
+        "top_terms": extract_keywords(raw_text),
+        "seniority": legacy_detect_seniority(raw_text),
+        "signals": {
+            "hands_on": legacy_detect_hands_on_bias(raw_text),
+            "fast_paced": legacy_detect_fast_paced(raw_text)
+        }
+    }
+
+
+def make_posting(rng: random.Random, length: int) -> str:
+    """A posting of at least length characters without indicators, plus a few planted ones"""
+    parts = []
+    while sum(map(len, parts)) < length:
+        # make_jd titles and levels carry seniority words; keep only the body
+        parts.append(make_jd(rng).split("\n", 3)[-1])
+    for _ in range(rng.randint(0, 3)):
+        parts.insert(rng.randrange(len(parts) + 1), rng.choice(INDICATORS))
+    return "\n".join(parts)
+
+
+def main() -> None:
+    rng = random.Random(31)
+    postings = [make_posting(rng, rng.choice([500, 2_000, 12_000])) for _ in range(1000)]
+    for posting in postings + [SAMPLE_JD]:
+        assert extract_jd_signals(posting) == legacy_extract_jd_signals(posting), f"Mismatch on {posting[:60]!r}"
+        assert extract_jd_signals_and_terms(posting) == (extract_jd_signals(posting), document_terms(posting))
+    seniorities = {legacy_detect_seniority(posting) for posting in postings}
+    print(f"Matches legacy on {len(postings) + 1} postings (seniorities seen: {sorted(seniorities)})\n")
+
+    long_plain = make_posting(random.Random(1), 12_000)
+    while legacy_extract_jd_signals(long_plain)["seniority"] != "unspecified":
+        long_plain = make_posting(rng, 12_000)
+    print(f"{'posting':<34} {'chars':>6} {'legacy us':>10} {'current us':>11} {'speedup':>8}")
+    for label, text in (
+        ("sample JD", SAMPLE_JD),
+        ("sample JD x 25", SAMPLE_JD * 25),
+        ("long, no indicators", long_plain),
+        ("long, senior + fast-paced at end", long_plain + "\nSenior role in a fast-paced team"),
+    ):
+        # Best of several runs: the differences are small next to scheduler noise
+        legacy = measure(lambda: legacy_extract_jd_signals(text), repeat=9, number=100)
+        current = measure(lambda: extract_jd_signals(text), repeat=9, number=100)
+        print(
+            f"{label:<34} {len(text):>6} {legacy['min_us']:>10.1f} {current['min_us']:>11.1f}"
+            f" {legacy['min_us'] / current['min_us']:>7.2f}x"
+        )
+
+    print(f"\n{'ingest (signals + terms)':<34} {'chars':>6} {'separate us':>11} {'one pass us':>11} {'speedup':>8}")
+    for label, text in (("sample JD", SAMPLE_JD), ("sample JD x 25", SAMPLE_JD * 25)):
+        separate = measure(lambda: (legacy_extract_jd_signals(text), document_terms(text)), repeat=9, number=100)
+        one_pass = measure(lambda: extract_jd_signals_and_terms(text), repeat=9, number=100)
+        print(
+            f"{label:<34} {len(text):>6} {separate['min_us']:>11.1f} {one_pass['min_us']:>11.1f}"
+            f" {separate['min_us'] / one_pass['min_us']:>7.2f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+"""
+extract_keywords throughput against the implementation before multi-word terms.
+
+The previous implementation is kept below as legacy_extract_keywords. On
+postings without any multi-word term both must return identical keywords;
+tests/test_keywords.py covers the phrase terms the legacy version missed.
+"""
+import random
+import re
+from collections import Counter
+from typing import List
+
+from app.jd_extract import extract_keywords
+
+from .bench_bulk_scoring import make_jd
+from .common import SAMPLE_JD, measure
+
+
+def legacy_extract_keywords(text: str, top_n: int = 20) -> List[str]:
+    """extract_keywords as it was before the term file and phrase trie"""
+    tech_terms = [
+        'azure', 'aws', 'gcp', 'terraform', 'kubernetes', 'docker',
+        'python', 'java', 'javascript', 'typescript', 'react', 'node',
+        'sql', 'postgresql', 'mongodb', 'redis', 'elasticsearch',
+        'ci/cd', 'jenkins', 'gitlab', 'github', 'agile', 'scrum',
+        'microservices', 'api', 'rest', 'graphql', 'grpc',
+        'linux', 'bash', 'shell', 'ansible', 'puppet', 'chef',
+        'bgp', 'ospf', 'networking', 'security', 'firewall',
+        'ml', 'machine learning', 'ai', 'data science', 'analytics'
+    ]
+    words = re.findall(r'\b[a-z]+\b', text.lower())
+    word_counts = Counter(words)
+    important_words = []
+    for word in word_counts.most_common(100):
+        if word[0] in tech_terms or len(word[0]) > 4:
+            important_words.append(word[0])
+    return important_words[:top_n]
+
+
+def check_golden(texts: List[str]) -> int:
+    """Compare with the legacy version on texts without phrase terms"""
+    compared = 0
+    for text in texts:
+        if not re.search(r'machine\s+learning|data\s+science|ci\s*/\s*cd', text.lower()):
+            assert extract_keywords(text) == legacy_extract_keywords(text), f"Mismatch on {text[:60]!r}"
+            compared += 1
+    return compared
+
+
+def main() -> None:
+    rng = random.Random(23)
+    texts = [
+        "\n".join(make_jd(rng) for _ in range(rng.randint(1, 8))) + "\nPython 3, k8s, node.js; e-mail: jobs@example.com"
+        for _ in range(2000)
+    ]
+    compared = check_golden(texts)
+    print(f"Matches legacy on {compared} phrase-free postings\n")
+
+    phrase_jd = SAMPLE_JD + "\nMachine learning, data science and CI/CD experience a plus.\n"
+    print(f"{'posting':<22} {'legacy us':>10} {'current us':>11} {'speedup':>8}")
+    for label, text in (
+        ("sample JD", SAMPLE_JD),
+        ("sample JD + phrases", phrase_jd),
+        ("long JD (10x)", phrase_jd * 10),
+    ):
+        legacy = measure(lambda: legacy_extract_keywords(text), repeat=5, number=500)
+        current = measure(lambda: extract_keywords(text), repeat=5, number=500)
+        print(
+            f"{label:<22} {legacy['median_us']:>10.1f} {current['median_us']:>11.1f}"
+            f" {legacy['median_us'] / current['median_us']:>7.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
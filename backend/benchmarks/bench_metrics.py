@@ -0,0 +1,142 @@
+"""
+Overhead of request metrics on POST /variants/compile.
+
+Runs the same compile requests in child processes with METRICS_ENABLED
+on and off, alternating, and compares the best median latency of each.
+Score caching is bypassed so every request scores.
+
+End-to-end differences of a fraction of a percent are well within
+run-to-run noise, so the instrumentation is also costed directly: the measured
+per-request cost of the middleware and of recording one stage, times the
+stages a compile records, as a share of the compile's latency. That share
+must stay under 1%.
+"""
+import asyncio
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+import uuid
+
+ROUNDS = 3
+REQUESTS = 300
+
+
+def child() -> None:
+    from fastapi.testclient import TestClient
+
+    from app import score_cache
+    from app.db import SessionLocal
+    from app.jd_extract import extract_jd_signals
+    from app.main import app
+    from app.metrics import STAGE_SECONDS
+    from app.models import JobDescription, Resume, ResumeVariant
+    from app.parsing import build_parsed_json
+
+    from .common import SAMPLE_JD, SAMPLE_RESUME
+
+    # Every request scores instead of hitting the score cache
+    score_cache.get_score_cache().get = lambda key: None
+
+    resume_id, jd_id = uuid.uuid4(), uuid.uuid4()
+    with SessionLocal() as db:
+        db.add(Resume(
+            id=resume_id, user_id="bench_metrics", raw_text=SAMPLE_RESUME,
+            parsed_json=build_parsed_json(SAMPLE_RESUME)
+        ))
+        db.add(JobDescription(
+            id=jd_id, platform="linkedin", raw_text=SAMPLE_JD, extracted_signals=extract_jd_signals(SAMPLE_JD)
+        ))
+        db.commit()
+
+    client = TestClient(app)
+    body = {"resume_id": str(resume_id), "jd_id": str(jd_id), "persona": "ic", "platform": "linkedin"}
+    try:
+        for _ in range(20):
+            client.post("/variants/compile", json=body)
+        observations = STAGE_SECONDS.total_count()
+        latencies = []
+        for _ in range(REQUESTS):
+            start = time.perf_counter()
+            response = client.post("/variants/compile", json=body)
+            latencies.append(time.perf_counter() - start)
+            assert response.status_code == 200, response.text
+        stages = (STAGE_SECONDS.total_count() - observations) / REQUESTS
+    finally:
+        with SessionLocal() as db:
+            db.query(ResumeVariant).filter(ResumeVariant.resume_id == resume_id).delete()
+            db.query(JobDescription).filter(JobDescription.id == jd_id).delete()
+            db.query(Resume).filter(Resume.id == resume_id).delete()
+            db.commit()
+    print(json.dumps({"median_ms": statistics.median(latencies) * 1000, "stages": stages}))
+
+
+def run_child(metrics_enabled: bool) -> dict:
+    env = dict(os.environ, METRICS_ENABLED=str(metrics_enabled).lower())
+    output = subprocess.run(
+        [sys.executable, "-m", "benchmarks.bench_metrics", "--child"],
+        env=env, check=True, capture_output=True, text=True
+    ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def instrumentation_cost_us() -> dict:
+    """Per-request middleware cost and per-stage recording cost, in microseconds"""
+    from app.metrics import MetricsMiddleware, record_stage, timed
+
+    from .common import measure
+
+    async def endpoint(scope, receive, send):
+        await send({"type": "http.response.start", "status": 200, "headers": []})
+        await send({"type": "http.response.body", "body": b""})
+
+    async def send(message):
+        pass
+
+    scope = {"type": "http", "method": "POST", "path": "/variants/compile", "headers": []}
+    wrapped = MetricsMiddleware(endpoint)
+    loop = asyncio.new_event_loop()
+    bare = measure(lambda: loop.run_until_complete(endpoint(scope, None, send)), number=2000)
+    instrumented = measure(lambda: loop.run_until_complete(wrapped(scope, None, send)), number=2000)
+    loop.close()
+
+    def timed_block():
+        with timed("compile"):
+            pass
+
+    return {
+        "middleware": instrumented["min_us"] - bare["min_us"],
+        "record_stage": measure(lambda: record_stage("db", 0.001, "select"), number=20000)["min_us"],
+        "timed": measure(timed_block, number=20000)["min_us"],
+    }
+
+
+def main() -> None:
+    results = {True: [], False: []}
+    for _ in range(ROUNDS):
+        for enabled in (True, False):
+            results[enabled].append(run_child(enabled))
+
+    print(f"compile request, median of {REQUESTS} per run, {ROUNDS} runs each")
+    for enabled, label in ((False, "metrics off"), (True, "metrics on ")):
+        medians = sorted(result["median_ms"] for result in results[enabled])
+        print(f"  {label} best {medians[0]:8.3f} ms   runs {', '.join(f'{m:.2f}' for m in medians)}")
+    disabled_ms = min(result["median_ms"] for result in results[False])
+    stages = results[True][0]["stages"]
+    print()
+
+    cost = instrumentation_cost_us()
+    per_request_us = cost["middleware"] + stages * max(cost["record_stage"], cost["timed"])
+    share = per_request_us / (disabled_ms * 1000)
+    print(f"middleware {cost['middleware']:.2f} us/request, one stage {max(cost['record_stage'], cost['timed']):.2f} us")
+    print(f"{stages:.0f} stages per compile -> {per_request_us:.1f} us/request = {share:.2%} of a compile")
+    assert share < 0.01, "Instrumentation costs 1% or more of a compile"
+
+
+if __name__ == "__main__":
+    if "--child" in sys.argv:
+        child()
+    else:
+        main()
@@ -0,0 +1,180 @@
+"""
+Offline directory compile vs driving the HTTP API.
+
+Writes --resumes resumes (TXT, DOCX and PDF in turn) and --jds JDs into a
+scratch directory, then compiles every resume x JD x persona x platform:
+
+- http per variant: upload, create JDs and POST /variants/compile for
+  every variant, as example_usage.py does, against a uvicorn server
+- http batch: the same with one POST /variants/compile:batch per resume
+- offline: run_offline_compile to a JSONL file, with one worker and with
+  --workers, and into the database
+
+All must produce the same scores. Reports variants per second.
+
+    python -m benchmarks.bench_offline_compile --json offline_compile.json
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import tempfile
+import time
+
+import httpx
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session
+
+from app.db import Base
+from app.offline_compile import PERSONAS, OfflineCompileOptions, run_offline_compile
+from app.platform_profiles import platform_names
+
+from .generators import FILE_TYPES, make_jd, make_resume, render_resume
+from .load_generator import free_port, start_server, wait_for_server
+from .results import record, write_results
+
+
+def write_inputs(directory: str, rng: random.Random, resumes: int, jds: int) -> None:
+    os.makedirs(os.path.join(directory, "resumes"))
+    os.makedirs(os.path.join(directory, "jds"))
+    for i in range(resumes):
+        file_type = FILE_TYPES[i % len(FILE_TYPES)]
+        with open(os.path.join(directory, "resumes", f"resume{i:04d}{file_type}"), "wb") as f:
+            f.write(render_resume(make_resume(rng), file_type))
+    for j in range(jds):
+        with open(os.path.join(directory, "jds", f"jd{j:04d}.txt"), "w") as f:
+            f.write(make_jd(rng))
+
+
+def upload_inputs(http: httpx.Client, directory: str, platform: str):
+    """Upload every resume and JD; returns {resume name: id}, {JD name: id}"""
+    resume_ids = {}
+    for name in sorted(os.listdir(os.path.join(directory, "resumes"))):
+        with open(os.path.join(directory, "resumes", name), "rb") as f:
+            status = http.post("/resumes/upload", files={"file": (name, f.read())}).json()
+        while status["status"] not in ("done", "failed"):
+            time.sleep(0.02)
+            status = http.get(f"/resumes/{status['resume_id']}/status").json()
+        resume_ids[name] = status["resume_id"]
+    jd_ids = {}
+    for name in sorted(os.listdir(os.path.join(directory, "jds"))):
+        with open(os.path.join(directory, "jds", name)) as f:
+            jd_ids[name] = http.post("/jds", json={"platform": platform, "raw_text": f.read()}).json()["id"]
+    return resume_ids, jd_ids
+
+
+def http_per_variant(http: httpx.Client, directory: str, platforms: list) -> dict:
+    resume_ids, jd_ids = upload_inputs(http, directory, platforms[0])
+    scores = {}
+    for resume, resume_id in resume_ids.items():
+        for jd, jd_id in jd_ids.items():
+            for persona in PERSONAS:
+                for platform in platforms:
+                    variant = http.post("/variants/compile", json={
+                        "resume_id": resume_id, "jd_id": jd_id, "persona": persona, "platform": platform
+                    }).json()
+                    scores[(resume, jd, persona, platform)] = variant["scores"]
+    return scores
+
+
+def http_batch(http: httpx.Client, directory: str, platforms: list) -> dict:
+    resume_ids, jd_ids = upload_inputs(http, directory, platforms[0])
+    jd_names = {jd_id: name for name, jd_id in jd_ids.items()}
+    scores = {}
+    for resume, resume_id in resume_ids.items():
+        response = http.post("/variants/compile:batch", json={
+            "resume_id": resume_id, "jd_ids": list(jd_ids.values()), "personas": list(PERSONAS), "platforms": platforms
+        })
+        for line in response.text.splitlines()[:-1]:
+            variant = json.loads(line)
+            scores[(resume, jd_names[variant["jd_id"]], variant["persona"], variant["platform"])] = variant["scores"]
+    return scores
+
+
+def timed_http(function, directory: str, platforms: list, database_url: str):
+    port = free_port()
+    server = start_server(database_url, port)
+    url = f"http://127.0.0.1:{port}"
+    try:
+        asyncio.run(wait_for_server(url, server))
+        with httpx.Client(base_url=url, timeout=300) as http:
+            start = time.perf_counter()
+            scores = function(http, directory, platforms)
+            return time.perf_counter() - start, scores
+    finally:
+        server.terminate()
+        server.wait()
+
+
+def offline(directory: str, platforms: list, workers: int, output: str = None, db: Session = None):
+    options = OfflineCompileOptions(
+        resume_dir=os.path.join(directory, "resumes"),
+        jd_dir=os.path.join(directory, "jds"),
+        personas=list(PERSONAS),
+        platforms=platforms,
+        output=output,
+        checkpoint=os.path.join(directory, f"checkpoint-{workers}-{bool(db)}"),
+        workers=workers,
+        restart=True
+    )
+    start = time.perf_counter()
+    run_offline_compile(options, db=db, progress=False)
+    seconds = time.perf_counter() - start
+    if output is None:
+        return seconds, None
+    with open(output) as f:
+        rows = [json.loads(line) for line in f]
+    return seconds, {(r["resume"], r["jd"], r["persona"], r["platform"]): r["scores"] for r in rows}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--resumes", type=int, default=20)
+    parser.add_argument("--jds", type=int, default=20)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--seed", type=int, default=25)
+    parser.add_argument("--json", help="Write results to this file")
+    args = parser.parse_args()
+
+    platforms = list(platform_names())
+    variants = args.resumes * args.jds * len(PERSONAS) * len(platforms)
+    timings = {}
+    with tempfile.TemporaryDirectory(prefix="bench_offline_compile_") as directory:
+        write_inputs(directory, random.Random(args.seed), args.resumes, args.jds)
+
+        print(f"{args.resumes} resumes x {args.jds} JDs x {len(PERSONAS)} personas x {len(platforms)} platforms"
+              f" = {variants} variants\n")
+        timings["http_per_variant"], expected = timed_http(
+            http_per_variant, directory, platforms, f"sqlite:///{os.path.join(directory, 'http1.db')}"
+        )
+        timings["http_batch"], batch_scores = timed_http(
+            http_batch, directory, platforms, f"sqlite:///{os.path.join(directory, 'http2.db')}"
+        )
+        assert batch_scores == expected, "compile:batch scores differ from per-variant compiles"
+
+        output = os.path.join(directory, "variants.jsonl")
+        for workers in dict.fromkeys([1, args.workers]):
+            timings[f"offline[workers={workers}]"], scores = offline(directory, platforms, workers, output=output)
+            assert scores == expected, "Offline scores differ from the API's"
+
+        engine = create_engine(f"sqlite:///{os.path.join(directory, 'offline.db')}")
+        Base.metadata.create_all(bind=engine)
+        with Session(engine) as db:
+            timings[f"offline_db[workers={args.workers}]"], _ = offline(directory, platforms, args.workers, db=db)
+        engine.dispose()
+
+    baseline = timings["http_per_variant"]
+    print(f"{'path':<26} {'seconds':>8} {'variants/s':>11} {'speedup':>8}")
+    for name, seconds in timings.items():
+        print(f"{name:<26} {seconds:>8.2f} {variants / seconds:>11.0f} {baseline / seconds:>7.1f}x")
+    assert timings["offline[workers=1]"] < timings["http_batch"], "Offline compile is slower than compile:batch"
+
+    if args.json:
+        write_results(args.json, "offline_compile", [
+            record(name, seconds, "s", variants_per_second=variants / seconds) for name, seconds in timings.items()
+        ], resumes=args.resumes, jds=args.jds, workers=args.workers)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,195 @@
+"""
+Outcome analytics over 1M outcomes: rollups vs joining every outcome.
+
+Seeds --variants scored variants and --outcomes outcomes (interviews more
+likely at higher survivability) in a scratch SQLite database, then times
+interview rates by platform x persona x survivability bucket computed:
+
+- client-side: every outcome joined with its variant and pulled into
+  Python, as clients of GET /outcomes had to
+- SQL join: the same join grouped in the database (json_extract on the
+  scores column, so SQLite-specific)
+- rollups: outcome_rates, which GET /outcomes/analytics serves
+
+All three must agree. Also reports the cost the rollup adds to recording
+an outcome and the time to rebuild the rollups from scratch.
+
+    python -m benchmarks.bench_outcome_analytics --json analytics.json
+"""
+import argparse
+import os
+import random
+import tempfile
+import time
+import uuid
+from collections import Counter
+
+from sqlalchemy import create_engine, insert, select, text
+from sqlalchemy.orm import Session
+
+from app.db import Base
+from app.models import ApplicationOutcome, JobDescription, OutcomeRollup, Resume, ResumeVariant
+from app.outcome_rollups import (
+    SURVIVABILITY_BUCKETS,
+    add_rollup_counts,
+    outcome_rates,
+    rebuild_outcome_rollups,
+    record_outcome_rollup,
+    survivability_bucket,
+)
+
+from .results import record, write_results
+
+PERSONAS = ["ic", "architect", "hybrid"]
+PLATFORMS = ["linkedin", "indeed", "dice"]
+SINGLE_INSERTS = 1000
+
+
+def seed(db: Session, rng: random.Random, variants: int, outcomes: int) -> None:
+    resume = Resume(user_id="bench_outcome_analytics", raw_text="resume")
+    jd = JobDescription(platform="linkedin", raw_text="jd")
+    db.add_all([resume, jd])
+    db.flush()
+
+    variant_rows = [
+        {
+            "id": uuid.uuid4(),
+            "resume_id": resume.id,
+            "jd_id": jd.id,
+            "persona": rng.choice(PERSONAS),
+            "platform": rng.choice(PLATFORMS),
+            "scores": {"survivability": round(rng.betavariate(4, 3), 2)} if rng.random() > 0.01 else None,
+        }
+        for _ in range(variants)
+    ]
+    for start in range(0, variants, 5000):
+        db.execute(insert(ResumeVariant), variant_rows[start:start + 5000])
+
+    counts: Counter = Counter()
+    for start in range(0, outcomes, 20000):
+        rows = []
+        for _ in range(min(20000, outcomes - start)):
+            variant = rng.choice(variant_rows)
+            survivability = (variant["scores"] or {}).get("survivability", 0.3)
+            roll = rng.random()
+            status = "interview" if roll < survivability * 0.3 else ("rejected" if roll < 0.7 else "ghosted")
+            rows.append({"id": uuid.uuid4(), "variant_id": variant["id"], "status": status})
+            counts[(variant["platform"], variant["persona"], survivability_bucket(variant["scores"]), status)] += 1
+        db.execute(insert(ApplicationOutcome), rows)
+    # Same totals recording each outcome would have produced
+    add_rollup_counts(db, counts)
+    db.commit()
+
+
+def client_side(db: Session) -> Counter:
+    counts: Counter = Counter()
+    query = (
+        select(ResumeVariant.platform, ResumeVariant.persona, ResumeVariant.scores, ApplicationOutcome.status)
+        .select_from(ApplicationOutcome)
+        .join(ResumeVariant, ResumeVariant.id == ApplicationOutcome.variant_id)
+    )
+    for platform, persona, scores, status in db.execute(query):
+        counts[(platform, persona, survivability_bucket(scores), status)] += 1
+    return counts
+
+
+def sql_join(db: Session) -> Counter:
+    rows = db.execute(text(f"""
+        SELECT v.platform, v.persona,
+               CASE WHEN json_extract(v.scores, '$.survivability') IS NULL THEN -1
+                    ELSE MIN(MAX(CAST(json_extract(v.scores, '$.survivability') * {SURVIVABILITY_BUCKETS} AS INTEGER), 0),
+                             {SURVIVABILITY_BUCKETS - 1}) END AS bucket,
+               o.status, COUNT(*)
+        FROM application_outcomes o JOIN resume_variants v ON v.id = o.variant_id
+        GROUP BY 1, 2, 3, 4
+    """))
+    return Counter({(platform, persona, bucket, status): count for platform, persona, bucket, status, count in rows})
+
+
+def rollup_counts(db: Session) -> Counter:
+    counts: Counter = Counter()
+    for rate in outcome_rates(db):
+        bucket = (
+            -1 if rate["survivability_min"] is None
+            else round(rate["survivability_min"] * SURVIVABILITY_BUCKETS)
+        )
+        for status, count in rate["statuses"].items():
+            counts[(rate["platform"], rate["persona"], bucket, status)] = count
+    return counts
+
+
+def timed_call(function, *args, repeat: int = 1):
+    best, result = float("inf"), None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = function(*args)
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def single_insert_seconds(db: Session, variant_ids: list, with_rollup: bool) -> float:
+    """Mean time to record one outcome and commit, as POST /outcomes does"""
+    start = time.perf_counter()
+    for variant_id in variant_ids:
+        variant = db.get(ResumeVariant, variant_id)
+        db.add(ApplicationOutcome(variant_id=variant_id, status="ghosted"))
+        if with_rollup:
+            record_outcome_rollup(db, variant, "ghosted")
+        db.commit()
+    return (time.perf_counter() - start) / len(variant_ids)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--outcomes", type=int, default=1_000_000)
+    parser.add_argument("--variants", type=int, default=50_000)
+    parser.add_argument("--seed", type=int, default=22)
+    parser.add_argument("--json", help="Write results to this file")
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    with tempfile.TemporaryDirectory(prefix="bench_outcome_analytics_") as directory:
+        engine = create_engine(f"sqlite:///{os.path.join(directory, 'outcomes.db')}")
+        Base.metadata.create_all(bind=engine)
+        with Session(engine) as db:
+            start = time.perf_counter()
+            seed(db, rng, args.variants, args.outcomes)
+            print(f"Seeded {args.outcomes} outcomes of {args.variants} variants in {time.perf_counter() - start:.1f}s\n")
+
+            client_s, expected = timed_call(client_side, db)
+            sql_s, sql_counts = timed_call(sql_join, db, repeat=3)
+            rollup_s, rollups = timed_call(rollup_counts, db, repeat=20)
+            assert sql_counts == expected, "SQL join disagrees with the client-side join"
+            assert rollups == expected, "Rollups disagree with the client-side join"
+            groups = len(outcome_rates(db))
+
+            rebuild_s, counted = timed_call(rebuild_outcome_rollups, db)
+            assert counted == args.outcomes and rollup_counts(db) == expected, "Rebuilt rollups disagree"
+
+            variant_ids = [variant_id for variant_id, in db.execute(select(ResumeVariant.id).limit(SINGLE_INSERTS))]
+            without_rollup = single_insert_seconds(db, variant_ids, with_rollup=False)
+            with_rollup = single_insert_seconds(db, variant_ids, with_rollup=True)
+            rollup_rows = db.query(OutcomeRollup).count()
+        engine.dispose()
+
+    print(f"{groups} platform x persona x bucket groups from {rollup_rows} rollup rows\n")
+    print(f"{'method':<14} {'ms':>10} {'speedup':>9}")
+    for name, seconds in (("client-side", client_s), ("SQL join", sql_s), ("rollups", rollup_s)):
+        print(f"{name:<14} {seconds * 1e3:>10.2f} {client_s / seconds:>8.0f}x")
+    print(f"\nrecord outcome: {without_rollup * 1e3:.2f} ms -> {with_rollup * 1e3:.2f} ms with the rollup "
+          f"(+{(with_rollup - without_rollup) * 1e3:.2f} ms)")
+    print(f"rebuild rollups from {args.outcomes} outcomes: {rebuild_s:.1f}s")
+
+    if args.json:
+        write_results(args.json, "outcome_analytics", [
+            record("client_side", client_s * 1e3, "ms"),
+            record("sql_join", sql_s * 1e3, "ms"),
+            record("rollups", rollup_s * 1e3, "ms"),
+            record("record_outcome", without_rollup * 1e3, "ms"),
+            record("record_outcome_with_rollup", with_rollup * 1e3, "ms"),
+            record("rebuild_rollups", rebuild_s, "s"),
+        ], outcomes=args.outcomes, variants=args.variants, seed=args.seed)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,143 @@
+"""
+Peak memory of PDF extraction for 1, 10 and 100-page files.
+
+Each page carries a block of resume text and an uncompressed 256x256 RGB
+image, like a scanned page. Every measurement runs in a fresh spawned
+process and reports that process's peak RSS above its baseline after
+imports:
+
+- in-memory: the whole file read into bytes and every page's text
+  collected from a BytesIO, as parse_pdf did before spooling
+- streaming: parse_resume on the spooled file, page by page
+"""
+import io
+import multiprocessing
+import os
+import resource
+import tempfile
+import time
+
+from .common import SAMPLE_RESUME
+
+PAGE_COUNTS = [1, 10, 100]
+IMAGE_SIDE = 256
+
+
+def make_pdf(pages: int) -> bytes:
+    """Build a simple PDF with one text block and one image per page"""
+    objects = []  # Object n is objects[n - 1]
+
+    def add(body: bytes) -> int:
+        objects.append(body)
+        return len(objects)
+
+    def stream(header: bytes, data: bytes) -> bytes:
+        return header[:-2] + b" /Length %d >>\nstream\n" % len(data) + data + b"\nendstream"
+
+    catalog = add(b"")  # Filled in once the page tree exists
+    pages_id = add(b"")
+    font = add(b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>")
+
+    lines = [line.replace("(", "[").replace(")", "]") for line in SAMPLE_RESUME.splitlines()]
+    page_ids = []
+    for number in range(pages):
+        text = b"BT /F1 10 Tf 12 TL 50 760 Td " + b" ".join(
+            b"(%s) '" % line.encode("latin-1") for line in lines + [f"Page {number + 1}"]
+        ) + b" ET\n"
+        draw = b"q 200 0 0 200 350 50 cm /Im1 Do Q\n"
+        content = add(stream(b"<< >>", text + draw))
+        pixels = bytes((number + i) % 251 for i in range(IMAGE_SIDE * IMAGE_SIDE * 3))
+        image = add(stream(
+            b"<< /Type /XObject /Subtype /Image /Width %d /Height %d "
+            b"/ColorSpace /DeviceRGB /BitsPerComponent 8 >>" % (IMAGE_SIDE, IMAGE_SIDE),
+            pixels
+        ))
+        page_ids.append(add(
+            b"<< /Type /Page /Parent %d 0 R /MediaBox [0 0 612 792] /Contents %d 0 R "
+            b"/Resources << /Font << /F1 %d 0 R >> /XObject << /Im1 %d 0 R >> >> >>"
+            % (pages_id, content, font, image)
+        ))
+
+    objects[catalog - 1] = b"<< /Type /Catalog /Pages %d 0 R >>" % pages_id
+    kids = b" ".join(b"%d 0 R" % page_id for page_id in page_ids)
+    objects[pages_id - 1] = b"<< /Type /Pages /Kids [%s] /Count %d >>" % (kids, pages)
+
+    out = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for n, body in enumerate(objects, start=1):
+        offsets.append(len(out))
+        out += b"%d 0 obj\n%s\nendobj\n" % (n, body)
+    xref = len(out)
+    out += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1)
+    out += b"".join(b"%010d 00000 n \n" % offset for offset in offsets)
+    out += b"trailer\n<< /Size %d /Root %d 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (
+        len(objects) + 1, catalog, xref
+    )
+    return bytes(out)
+
+
+def _peak_rss_kb() -> int:
+    # ru_maxrss survives exec, so a spawned child would inherit the parent's
+    # peak; VmHWM is per address space
+    try:
+        with open("/proc/self/status") as status:
+            for line in status:
+                if line.startswith("VmHWM:"):
+                    return int(line.split()[1])
+    except OSError:
+        pass
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+
+def parse_pdf_in_memory(content: bytes) -> str:
+    """parse_pdf before uploads were spooled: one reader over the whole file, every page kept"""
+    import pypdf
+
+    reader = pypdf.PdfReader(io.BytesIO(content))
+    return "\n".join([page.extract_text() for page in reader.pages])
+
+
+def _measure(path: str, mode: str, results) -> None:
+    from app.parsing import parse_resume
+
+    baseline = _peak_rss_kb()
+    start = time.perf_counter()
+    if mode == "in-memory":
+        with open(path, "rb") as pdf_file:
+            text = parse_pdf_in_memory(pdf_file.read())
+    else:
+        text = parse_resume(path, "resume.pdf")["raw_text"]
+    elapsed = time.perf_counter() - start
+    results.put((_peak_rss_kb() - baseline, elapsed, len(text)))
+
+
+def measure_in_child(path: str, mode: str):
+    """Run one extraction in a fresh process; returns (peak RSS delta KB, seconds, chars)"""
+    context = multiprocessing.get_context("spawn")
+    results = context.Queue()
+    process = context.Process(target=_measure, args=(path, mode, results))
+    process.start()
+    result = results.get()
+    process.join()
+    return result
+
+
+def main() -> None:
+    with tempfile.TemporaryDirectory() as workdir:
+        print(f"{'pages':>5} {'file MB':>8}  {'mode':<10} {'peak RSS +MB':>12} {'seconds':>8}")
+        for pages in PAGE_COUNTS:
+            path = os.path.join(workdir, f"resume-{pages}.pdf")
+            with open(path, "wb") as pdf_file:
+                pdf_file.write(make_pdf(pages))
+            size_mb = os.path.getsize(path) / 1e6
+
+            chars = set()
+            for mode in ("in-memory", "streaming"):
+                rss_kb, elapsed, length = measure_in_child(path, mode)
+                chars.add(length)
+                print(f"{pages:>5} {size_mb:>8.1f}  {mode:<10} {rss_kb / 1024:>12.1f} {elapsed:>8.2f}")
+            assert len(chars) == 1, "Extraction modes disagree"
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,125 @@
+"""
+Platform registry lookups as the registry grows and while it reloads.
+
+Writes profile versions with --sizes platforms into a scratch
+PLATFORM_PROFILES_DIR and, for each, times:
+
+- get_platform_profile and is_valid_platform, which must not get slower
+  with the number of platforms
+- loading and validating the version (the cost of one reload)
+
+Then times lookups while another thread keeps writing and loading new
+versions, checking every snapshot a reader gets holds a single version's
+weights for all of its platforms.
+
+    python -m benchmarks.bench_platform_registry --json platform_registry.json
+"""
+import argparse
+import tempfile
+import threading
+import time
+
+from app.config import settings
+from app.platform_profiles import (
+    get_platform_profile,
+    is_valid_platform,
+    platform_registry,
+    refresh_platform_profiles,
+    write_profile_version,
+)
+
+from .common import measure
+from .results import record, write_results
+
+
+def profiles_payload(version: int, platforms: int) -> dict:
+    """Every platform's keyword weight encodes the version, so mixed snapshots are detectable"""
+    marker = version / 1e6
+    return {
+        "version": version,
+        "default_platform": "platform0000",
+        "profiles": {
+            f"platform{index:04d}": {"keyword_weight": marker, "title_weight": 0.3, "recency_weight": 0.1}
+            for index in range(platforms)
+        },
+    }
+
+
+def churn(directory: str, platforms: int, first_version: int, stop: threading.Event, reloads: list) -> None:
+    version = first_version
+    while not stop.is_set():
+        version += 1
+        write_profile_version(directory, profiles_payload(version, platforms))
+        refresh_platform_profiles(force=True)
+        reloads.append(version)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[3, 30, 300, 3000])
+    parser.add_argument("--churn-platforms", type=int, default=30)
+    parser.add_argument("--churn-seconds", type=float, default=2.0)
+    parser.add_argument("--json", help="Write results to this file")
+    args = parser.parse_args()
+
+    records = []
+    original_dir = settings.PLATFORM_PROFILES_DIR
+    builtin = measure(lambda: get_platform_profile("dice"), number=20000)["min_us"]
+    print(f"built-in profiles: get_platform_profile {builtin:.3f} us\n")
+    print(f"{'platforms':>9} {'lookup us':>10} {'valid us':>9} {'reload ms':>10}")
+    lookups = []
+    with tempfile.TemporaryDirectory(prefix="bench_platform_registry_") as directory:
+        try:
+            settings.PLATFORM_PROFILES_DIR = directory
+            for version, size in enumerate(args.sizes, start=1):
+                write_profile_version(directory, profiles_payload(version, size))
+                start = time.perf_counter()
+                refresh_platform_profiles(force=True)
+                reload_ms = (time.perf_counter() - start) * 1e3
+                assert platform_registry().version == version and len(platform_registry().platforms) == size
+
+                name = f"platform{size // 2:04d}"
+                lookup = measure(lambda: get_platform_profile(name), number=20000)["min_us"]
+                valid = measure(lambda: is_valid_platform(name), number=20000)["min_us"]
+                lookups.append(lookup)
+                print(f"{size:>9} {lookup:>10.3f} {valid:>9.3f} {reload_ms:>10.2f}")
+                records.append(record(f"lookup[{size}]", lookup, "us"))
+                records.append(record(f"is_valid[{size}]", valid, "us"))
+                records.append(record(f"reload[{size}]", reload_ms, "ms"))
+            assert max(lookups) < min(lookups) * 2, "Lookup cost grew with the number of platforms"
+
+            stop, reloads = threading.Event(), []
+            writer = threading.Thread(
+                target=churn, args=(directory, args.churn_platforms, len(args.sizes), stop, reloads)
+            )
+            writer.start()
+            seen, checked = set(), 0
+            start = time.perf_counter()
+            try:
+                while time.perf_counter() - start < args.churn_seconds:
+                    registry = platform_registry()
+                    marker = registry.version / 1e6
+                    assert all(
+                        weights["keyword_weight"] == marker for weights in registry.profiles.values()
+                    ), f"Snapshot v{registry.version} mixes versions"
+                    seen.add(registry.version)
+                    checked += 1
+                churn_lookup = measure(lambda: get_platform_profile("platform0001"), number=20000)["min_us"]
+            finally:
+                stop.set()
+                writer.join()
+        finally:
+            settings.PLATFORM_PROFILES_DIR = original_dir
+            refresh_platform_profiles(force=True)
+
+    print(f"\nwhile reloading: {len(reloads)} versions loaded, {checked} snapshots checked across "
+          f"{len(seen)} versions, get_platform_profile {churn_lookup:.3f} us")
+    records.append(record("lookup.builtin", builtin, "us"))
+    records.append(record("lookup.during_reloads", churn_lookup, "us"))
+
+    if args.json:
+        write_results(args.json, "platform_registry", records, sizes=args.sizes)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,60 @@
+"""
+Resume ranking latency over a synthetic 100k-resume index.
+
+Measures the in-memory candidate lookup for a 20-term JD, and the full
+ranking step (candidate lookup plus scoring the top candidates). Resumes
+draw ~250 distinct words from a Zipf-like 20k-word vocabulary, so common
+JD terms have posting lists covering most of the corpus.
+"""
+import itertools
+import random
+import time
+import uuid
+
+from app.jd_extract import extract_jd_signals
+from app.resume_index import ResumeIndex
+from app.scoring import calculate_survivability_score
+
+from .common import SAMPLE_JD, SAMPLE_RESUME, measure, print_row
+
+RESUMES = 100_000
+VOCABULARY = 20_000
+TERMS_PER_RESUME = 250
+
+
+def build_index(rng: random.Random, jd_terms: list) -> ResumeIndex:
+    vocabulary = jd_terms + [f"word{i}" for i in range(VOCABULARY - len(jd_terms))]
+    cum_weights = list(itertools.accumulate(1.0 / (rank + 1) for rank in range(len(vocabulary))))
+    index = ResumeIndex()
+    for i in range(RESUMES):
+        terms = set(rng.choices(vocabulary, cum_weights=cum_weights, k=TERMS_PER_RESUME))
+        index.add(uuid.uuid4(), f"user{i % 1000}", terms)
+    return index
+
+
+def main() -> None:
+    rng = random.Random(7)
+    jd_signals = extract_jd_signals(SAMPLE_JD)
+    jd_terms = jd_signals["top_terms"]
+
+    start = time.perf_counter()
+    index = build_index(rng, jd_terms)
+    print(f"Built index of {len(index)} resumes in {time.perf_counter() - start:.1f} s\n")
+
+    limit = 10
+    pool = limit * 5
+    lookup = measure(lambda: index.candidates(jd_terms, pool), repeat=5, number=20)
+    print_row(f"candidate lookup ({len(jd_terms)} terms)", lookup)
+    lookup_user = measure(lambda: index.candidates(jd_terms, pool, user_id="user7"), repeat=5, number=20)
+    print_row("candidate lookup (one user)", lookup_user)
+
+    # Full ranking: lookup plus scoring every candidate
+    def rank() -> None:
+        for _ in index.candidates(jd_terms, pool):
+            calculate_survivability_score(SAMPLE_RESUME, SAMPLE_JD, "linkedin", jd_signals=jd_signals)
+
+    print_row(f"rank top {limit} (score {pool} candidates)", measure(rank, repeat=5, number=5))
+
+
+if __name__ == "__main__":
+    main()
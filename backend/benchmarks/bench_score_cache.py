@@ -0,0 +1,84 @@
+"""
+Scoring throughput with a cold and a warm score cache.
+
+Scores 300 generated resume x JD pairs on every platform, first with an
+empty cache (every lookup misses and the scorer runs) and then again with
+every score cached. Cached scores are checked against the scorer, and a
+change to the platform weights is checked to change the cache key.
+"""
+import copy
+import random
+import tempfile
+import time
+
+from app.config import settings
+from app.jd_extract import extract_jd_signals
+from app.parsing import build_parsed_json
+from app.platform_profiles import PLATFORM_PROFILES, refresh_platform_profiles, write_profile_version
+from app.score_cache import ScoreCache, score_cache_key
+from app import score_cache
+from app.scoring import calculate_survivability_score
+
+from .bench_bulk_scoring import make_jd, make_resume
+
+PAIRS = 300
+PLATFORMS = ["linkedin", "indeed", "dice"]
+
+
+def check_version_invalidation(resume_text: str, jd_text: str, signals) -> None:
+    before = score_cache_key(resume_text, jd_text, "dice", signals)
+    profiles = copy.deepcopy(PLATFORM_PROFILES)
+    profiles["dice"]["keyword_weight"] += 0.01
+    original_dir = settings.PLATFORM_PROFILES_DIR
+    with tempfile.TemporaryDirectory() as directory:
+        try:
+            settings.PLATFORM_PROFILES_DIR = directory
+            write_profile_version(directory, {"version": 1, "profiles": profiles})
+            refresh_platform_profiles(force=True)
+            assert score_cache_key(resume_text, jd_text, "dice", signals) != before, "Weight change kept the cache key"
+        finally:
+            settings.PLATFORM_PROFILES_DIR = original_dir
+            refresh_platform_profiles(force=True)
+    # The same JD text ranked against a different corpus
+    reranked = {**signals, "top_terms": signals["top_terms"][::-1][:-1]}
+    assert score_cache_key(resume_text, jd_text, "dice", reranked) != before, "Signal change kept the cache key"
+
+
+def score_all(inputs) -> float:
+    start = time.perf_counter()
+    for resume_text, jd_text, signals, parsed in inputs:
+        for platform in PLATFORMS:
+            score_cache.cached_survivability_score(
+                resume_text, jd_text, platform, jd_signals=signals, parsed_resume=parsed
+            )
+    return time.perf_counter() - start
+
+
+def main() -> None:
+    rng = random.Random(13)
+    inputs = []
+    for _ in range(PAIRS):
+        resume_text, jd_text = make_resume(rng), make_jd(rng)
+        inputs.append((resume_text, jd_text, extract_jd_signals(jd_text), build_parsed_json(resume_text)))
+    check_version_invalidation(*inputs[0][:3])
+
+    cache = ScoreCache(max_entries=PAIRS * len(PLATFORMS))
+    score_cache._score_cache = cache
+    cold = score_all(inputs)
+    warm = score_all(inputs)
+
+    for resume_text, jd_text, signals, parsed in inputs:
+        for platform in PLATFORMS:
+            expected = calculate_survivability_score(resume_text, jd_text, platform, jd_signals=signals)
+            assert cache.get(score_cache_key(resume_text, jd_text, platform, signals)) == expected, "Cached scores differ"
+    print("Cached scores match the scorer; weight and signal changes change the key\n")
+
+    scores = PAIRS * len(PLATFORMS)
+    print(f"{'cache':<6} {'scores/s':>10} {'us/score':>9}")
+    for label, elapsed in (("cold", cold), ("warm", warm)):
+        print(f"{label:<6} {scores / elapsed:>10.0f} {elapsed / scores * 1e6:>9.1f}")
+    print(f"\n{cache.stats()}")
+
+
+if __name__ == "__main__":
+    main()
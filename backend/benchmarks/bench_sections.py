@@ -0,0 +1,92 @@
+"""
+extract_resume_sections throughput on synthetic 1 to 50-page resumes.
+
+Compares the single-pass header classifier against the previous
+implementation (kept below as legacy_extract_resume_sections), checking
+both produce identical sections on the benchmark inputs before timing
+anything. Edge cases are covered by tests/test_sections.py.
+"""
+import random
+import re
+from typing import Dict
+
+from app.compiler import extract_resume_sections
+
+from .common import measure
+
+PAGE_COUNTS = [1, 5, 10, 50]
+LINES_PER_PAGE = 55
+
+FILLER_WORDS = (
+    "designed built led migrated optimized python java kubernetes terraform "
+    "platform services pipelines latency customers team data api cloud"
+).split()
+HEADERS = ["SUMMARY", "TECHNICAL SKILLS", "PROFESSIONAL EXPERIENCE", "EDUCATION", "CERTIFICATIONS"]
+
+
+def legacy_extract_resume_sections(resume_text: str) -> Dict[str, str]:
+    """extract_resume_sections as it was before the single-pass classifier"""
+    sections = {
+        "summary": "",
+        "skills": "",
+        "experience": "",
+        "education": ""
+    }
+    summary_patterns = [r'summary', r'profile', r'objective', r'overview']
+    skills_patterns = [r'skills', r'technical skills', r'competencies']
+    experience_patterns = [r'experience', r'work history', r'employment', r'professional experience']
+    education_patterns = [r'education', r'academic', r'qualifications']
+
+    lines = resume_text.split('\n')
+    current_section = None
+    for line in lines:
+        line_lower = line.lower().strip()
+        if any(re.search(pattern, line_lower) for pattern in summary_patterns):
+            current_section = "summary"
+        elif any(re.search(pattern, line_lower) for pattern in skills_patterns):
+            current_section = "skills"
+        elif any(re.search(pattern, line_lower) for pattern in experience_patterns):
+            current_section = "experience"
+        elif any(re.search(pattern, line_lower) for pattern in education_patterns):
+            current_section = "education"
+        elif current_section and line.strip():
+            sections[current_section] += line + "\n"
+    return sections
+
+
+def make_resume(pages: int, rng: random.Random) -> str:
+    """A resume of pages * LINES_PER_PAGE lines: headers, bullets and blanks"""
+    lines = []
+    for i in range(pages * LINES_PER_PAGE):
+        if i % 40 == 0:
+            lines.append(rng.choice(HEADERS))
+        elif i % 7 == 0:
+            lines.append("")
+        else:
+            lines.append("- " + " ".join(rng.choices(FILLER_WORDS, k=rng.randint(6, 14))))
+    return "\n".join(lines)
+
+
+def check_same_sections(resumes) -> None:
+    for text in resumes:
+        assert extract_resume_sections(text) == legacy_extract_resume_sections(text), "Section mismatch"
+
+
+def main() -> None:
+    rng = random.Random(11)
+    resumes = {pages: make_resume(pages, rng) for pages in PAGE_COUNTS}
+    check_same_sections(list(resumes.values()))
+
+    print(f"{'pages':>5}  {'legacy resumes/s':>17}  {'single-pass resumes/s':>22}  {'speedup':>7}")
+    for pages, text in resumes.items():
+        number = max(1, 200 // pages)
+        legacy = measure(lambda: legacy_extract_resume_sections(text), repeat=5, number=number)
+        current = measure(lambda: extract_resume_sections(text), repeat=5, number=number)
+        print(
+            f"{pages:>5}  {1e6 / legacy['median_us']:>17.1f}  {1e6 / current['median_us']:>22.1f}"
+            f"  {legacy['median_us'] / current['median_us']:>6.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,185 @@
+"""
+Storage of 100k compiled variants: inline text vs content-addressed blobs.
+
+Compiles --variants variants (each resume against --jds-per-resume JDs x
+every persona x platform, like eager compilation does) and stores them in
+two scratch SQLite databases:
+
+- inline: compiled_text on every row, as variants were stored before
+- blobs: text stored once per distinct text, zlib-compressed, plus the
+  input hash idempotent compiles look variants up by
+
+Reports the bytes used by the variant tables and their indexes, insert
+time, the time to read back the text of random variants and the input
+hash lookup /variants/compile does before compiling. Every text read back
+is checked against what was compiled.
+
+    python -m benchmarks.bench_variant_storage --json storage.json
+"""
+import argparse
+import os
+import random
+import tempfile
+import time
+import uuid
+
+from sqlalchemy import create_engine, insert, select
+from sqlalchemy.orm import Session
+
+from app.compiler import compile_resume_variant, extract_resume_sections
+from app.db import Base
+from app.jd_extract import extract_jd_signals
+from app.models import ResumeVariant
+from app.variant_store import find_variant, load_compiled_texts, store_compiled_texts, variant_input_hash
+
+from .generators import make_jd, make_resume
+from .results import record, write_results
+
+PERSONAS = ["ic", "architect", "hybrid"]
+PLATFORMS = ["linkedin", "indeed", "dice"]
+SCORES = {"keyword_score": 0.5, "title_score": 0.8, "age_proxy_risk": 0.1, "overqual_risk": 0.1, "survivability": 0.6}
+VARIANT_TABLES = ("resume_variants", "variant_texts")
+
+
+def scratch_engine(directory: str, name: str):
+    engine = create_engine(f"sqlite:///{os.path.join(directory, name)}")
+    Base.metadata.create_all(bind=engine)
+    return engine
+
+
+def table_bytes(engine) -> int:
+    """Pages used by the variant tables and their indexes"""
+    with engine.connect() as connection:
+        connection.exec_driver_sql("VACUUM")
+        rows = connection.exec_driver_sql(
+            "SELECT s.tbl_name, SUM(d.pgsize) FROM dbstat d JOIN sqlite_schema s ON s.name = d.name GROUP BY s.tbl_name"
+        ).all()
+    return sum(size for table, size in rows if table in VARIANT_TABLES)
+
+
+def generate(rng: random.Random, variants: int, jds_per_resume: int):
+    """Yield each resume's compiled variants as (row, compiled_text) pairs"""
+    jds = [make_jd(rng, rng.choice([3, 6, 10])) for _ in range(jds_per_resume * 4)]
+    jd_inputs = [(uuid.uuid4(), jd, extract_jd_signals(jd)) for jd in jds]
+    produced = 0
+    while produced < variants:
+        resume = make_resume(rng, rng.choice([2, 4, 6, 10]))
+        sections = extract_resume_sections(resume)
+        resume_id = uuid.uuid4()
+        batch = []
+        for jd_id, jd_text, signals in rng.sample(jd_inputs, jds_per_resume):
+            for persona in PERSONAS:
+                compiled_text = compile_resume_variant(
+                    resume, jd_text, persona, PLATFORMS[0], jd_signals=signals, resume_sections=sections
+                )
+                for platform in PLATFORMS:
+                    row = {
+                        "id": uuid.uuid4(),
+                        "resume_id": resume_id,
+                        "jd_id": jd_id,
+                        "persona": persona,
+                        "platform": platform,
+                        "input_hash": variant_input_hash(resume, jd_text, persona, platform, signals),
+                        "scores": SCORES,
+                    }
+                    batch.append((row, compiled_text))
+        batch = batch[:variants - produced]
+        produced += len(batch)
+        yield batch
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--variants", type=int, default=100_000)
+    parser.add_argument("--jds-per-resume", type=int, default=12)
+    parser.add_argument("--reads", type=int, default=1000, help="Random variants read back")
+    parser.add_argument("--seed", type=int, default=21)
+    parser.add_argument("--json", help="Write results to this file")
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    with tempfile.TemporaryDirectory(prefix="bench_variant_storage_") as directory:
+        inline_engine = scratch_engine(directory, "inline.db")
+        blob_engine = scratch_engine(directory, "blobs.db")
+        insert_seconds = {"inline": 0.0, "blobs": 0.0}
+        text_bytes = 0
+        samples = []
+
+        with Session(inline_engine) as inline_db, Session(blob_engine) as blob_db:
+            for batch in generate(rng, args.variants, args.jds_per_resume):
+                texts = [compiled_text for _, compiled_text in batch]
+                text_bytes += sum(len(text.encode("utf-8")) for text in texts)
+                samples.extend(rng.sample(batch, min(len(batch), 3)))
+
+                start = time.perf_counter()
+                inline_db.execute(insert(ResumeVariant), [
+                    {**row, "input_hash": None, "compiled_text": text} for row, text in batch
+                ])
+                inline_db.commit()
+                insert_seconds["inline"] += time.perf_counter() - start
+
+                start = time.perf_counter()
+                hashes = store_compiled_texts(blob_db, texts)
+                blob_db.execute(insert(ResumeVariant), [
+                    {**row, "text_hash": digest} for (row, _), digest in zip(batch, hashes)
+                ])
+                blob_db.commit()
+                insert_seconds["blobs"] += time.perf_counter() - start
+
+            samples = rng.sample(samples, min(args.reads, len(samples)))
+            ids = [row["id"] for row, _ in samples]
+            expected = {row["id"]: text for row, text in samples}
+
+            start = time.perf_counter()
+            for variant_id in ids:
+                text = inline_db.execute(
+                    select(ResumeVariant.compiled_text).where(ResumeVariant.id == variant_id)
+                ).scalar_one()
+                assert text == expected[variant_id]
+            inline_read_us = (time.perf_counter() - start) / len(ids) * 1e6
+
+            start = time.perf_counter()
+            for variant_id in ids:
+                digest = blob_db.execute(
+                    select(ResumeVariant.text_hash).where(ResumeVariant.id == variant_id)
+                ).scalar_one()
+                assert load_compiled_texts(blob_db, [digest])[digest] == expected[variant_id]
+            blob_read_us = (time.perf_counter() - start) / len(ids) * 1e6
+
+            start = time.perf_counter()
+            for row, text in samples:
+                variant = find_variant(blob_db, row["resume_id"], row["jd_id"], row["input_hash"])
+                assert variant.compiled_text == text
+                blob_db.expunge(variant)
+            lookup_us = (time.perf_counter() - start) / len(samples) * 1e6
+
+            distinct_texts = blob_db.execute(select(ResumeVariant.text_hash).distinct()).all()
+
+        inline_bytes, blob_bytes = table_bytes(inline_engine), table_bytes(blob_engine)
+        inline_engine.dispose()
+        blob_engine.dispose()
+
+    mb = 1024 * 1024
+    print(f"{args.variants} variants, {len(distinct_texts)} distinct texts, {text_bytes / mb:.1f} MB of compiled text\n")
+    print(f"{'layout':<8} {'table MB':>9} {'B/variant':>10} {'insert s':>9} {'read us':>8}")
+    print(f"{'inline':<8} {inline_bytes / mb:>9.1f} {inline_bytes / args.variants:>10.0f} "
+          f"{insert_seconds['inline']:>9.2f} {inline_read_us:>8.1f}")
+    print(f"{'blobs':<8} {blob_bytes / mb:>9.1f} {blob_bytes / args.variants:>10.0f} "
+          f"{insert_seconds['blobs']:>9.2f} {blob_read_us:>8.1f}")
+    print(f"\nblobs use {inline_bytes / blob_bytes:.1f}x less space; "
+          f"input hash lookup with text {lookup_us:.1f} us")
+
+    if args.json:
+        write_results(args.json, "variant_storage", [
+            record("inline.bytes_per_variant", inline_bytes / args.variants, "B"),
+            record("blobs.bytes_per_variant", blob_bytes / args.variants, "B"),
+            record("inline.insert", insert_seconds["inline"], "s"),
+            record("blobs.insert", insert_seconds["blobs"], "s"),
+            record("inline.read", inline_read_us, "us"),
+            record("blobs.read", blob_read_us, "us"),
+            record("blobs.input_hash_lookup", lookup_us, "us"),
+        ], variants=args.variants, jds_per_resume=args.jds_per_resume, seed=args.seed)
+
+
+if __name__ == "__main__":
+    main()
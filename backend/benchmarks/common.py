@@ -0,0 +1,64 @@
+"""
+Shared helpers and sample data for the benchmark scripts.
+"""
+import statistics
+import time
+from typing import Callable, Dict, Any
+
+SAMPLE_RESUME = """Jane Doe
+jane@example.com
+
+SUMMARY
+Senior Software Engineer with 12 years of experience building cloud platforms.
+
+TECHNICAL SKILLS
+Python, Java, Go, Terraform, Kubernetes, Docker, PostgreSQL, Redis, Azure, AWS
+
+PROFESSIONAL EXPERIENCE
+Lead Software Engineer, Acme Corp (2018 - 2024)
+- Designed microservices architecture serving 10M requests per day
+- Built CI/CD pipelines with GitHub Actions and Terraform
+- Mentored a team of six engineers
+
+Software Engineer, Globex (2012 - 2018)
+- Developed REST and GraphQL APIs in Python and Java
+- Migrated on-prem workloads to Azure
+
+EDUCATION
+B.S. Computer Science, State University (2008 - 2012)
+"""
+
+SAMPLE_JD = """Senior Software Engineer
+
+We are looking for a Senior Software Engineer with hands-on experience in:
+- Python, FastAPI, PostgreSQL
+- Azure cloud services
+- Terraform and infrastructure as code
+- Microservices architecture and Kubernetes
+
+Requirements:
+- 5+ years of software development experience
+- Strong problem-solving skills
+- Experience with CI/CD pipelines
+- Comfortable in a fast-paced environment
+"""
+
+
+def measure(fn: Callable[[], Any], repeat: int = 5, number: int = 200) -> Dict[str, float]:
+    """Time fn() and return per-call latency statistics in microseconds"""
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for _ in range(number):
+            fn()
+        samples.append((time.perf_counter() - start) / number * 1e6)
+    return {
+        "min_us": min(samples),
+        "median_us": statistics.median(samples),
+        "max_us": max(samples),
+    }
+
+
+def print_row(label: str, stats: Dict[str, float]) -> None:
+    """Print a single benchmark result line"""
+    print(f"{label:<40} median {stats['median_us']:>10.1f} us   min {stats['min_us']:>10.1f} us")
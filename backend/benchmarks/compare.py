@@ -0,0 +1,55 @@
+"""
+Compare two benchmark results files.
+
+    python -m benchmarks.compare baseline.json current.json --threshold 10
+
+Prints every result present in both files with its change, and exits 1
+if any got worse by more than --threshold percent.
+"""
+import argparse
+import sys
+
+from .results import HIGHER_IS_BETTER_UNITS, read_results
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("baseline")
+    parser.add_argument("current")
+    parser.add_argument("--threshold", type=float, default=10.0, help="Regression threshold in percent")
+    args = parser.parse_args(argv)
+
+    baseline, current = read_results(args.baseline), read_results(args.current)
+    if baseline["suite"] != current["suite"]:
+        print(f"Comparing different suites: {baseline['suite']} vs {current['suite']}")
+    print(f"baseline {baseline['environment']['commit']} ({baseline['environment']['timestamp']})")
+    print(f"current  {current['environment']['commit']} ({current['environment']['timestamp']})\n")
+
+    old = {entry["name"]: entry for entry in baseline["results"]}
+    regressions = 0
+    width = max((len(entry["name"]) for entry in current["results"]), default=10)
+    print(f"{'result':<{width}} {'baseline':>12} {'current':>12} {'change':>8}")
+    for entry in current["results"]:
+        before = old.get(entry["name"])
+        if before is None or before["unit"] != entry["unit"] or not before["value"]:
+            continue
+        change = (entry["value"] / before["value"] - 1) * 100
+        worse = -change if entry["unit"] in HIGHER_IS_BETTER_UNITS else change
+        flag = ""
+        if worse > args.threshold:
+            regressions += 1
+            flag = "  REGRESSION"
+        print(
+            f"{entry['name']:<{width}} {before['value']:>9.2f} {before['unit']:<2}"
+            f" {entry['value']:>9.2f} {entry['unit']:<2} {change:>+7.1f}%{flag}"
+        )
+
+    missing = sorted(set(old) - {entry["name"] for entry in current["results"]})
+    if missing:
+        print(f"\nNot in current run: {', '.join(missing)}")
+    print(f"\n{regressions} regression(s) over {args.threshold:.0f}%")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
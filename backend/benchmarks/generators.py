@@ -0,0 +1,151 @@
+"""
+Synthetic resumes and job descriptions for benchmarks and load tests.
+
+Texts are built from a seeded random.Random, so a seed always produces
+the same corpus. SIZES names the lengths benchmarks sweep over; each
+generator takes the size's count (roles for resumes, requirement blocks
+for JDs). Resumes can be rendered as TXT, DOCX or PDF upload bodies.
+"""
+import io
+import random
+from typing import Dict, List
+
+SIZES = {"short": 2, "medium": 6, "long": 24}
+
+FILE_TYPES = [".txt", ".docx", ".pdf"]
+
+SKILLS = [
+    "python", "java", "javascript", "typescript", "go", "terraform", "kubernetes", "docker",
+    "azure", "aws", "gcp", "postgresql", "redis", "mongodb", "react", "node", "graphql", "grpc",
+    "linux", "ansible", "jenkins", "github", "spark", "kafka", "airflow", "snowflake",
+    "machine learning", "data science", "ci/cd", "microservices", "security", "networking",
+]
+TITLES = [
+    "Software Engineer", "Senior Software Engineer", "Lead Developer", "Staff Engineer",
+    "Platform Architect", "Engineering Manager", "Data Engineer", "Junior Developer",
+    "Frontend Developer", "Site Reliability Engineer", "Principal Engineer",
+]
+VERBS = ["Designed", "Built", "Delivered", "Migrated", "Led", "Optimized", "Automated", "Mentored"]
+OBJECTS = [
+    "a payments platform", "CI/CD pipelines", "microservices on Kubernetes", "data pipelines",
+    "an internal developer portal", "REST and GraphQL APIs", "observability tooling",
+    "a multi-region failover plan", "batch analytics jobs", "the public website",
+]
+OUTCOMES = [
+    "serving 10M requests per day", "cutting costs by 30%", "with 99.99% availability",
+    "for a team of eight engineers", "ahead of schedule", "reducing latency by half",
+]
+JD_FLAVOR = [
+    "We move fast in a fast-paced, high growth environment.",
+    "You will write code daily and stay hands-on with development.",
+    "This is a dynamic startup team with a strong engineering culture.",
+    "Comfortable mentoring others and leading technical direction.",
+    "Experience with agile delivery and scrum rituals is a plus.",
+]
+
+
+def make_resume(rng: random.Random, roles: int = SIZES["medium"]) -> str:
+    """A resume with summary, skills, roles experience entries and education"""
+    year = rng.randint(1990, 2012)
+    lines = [
+        f"Candidate {rng.randint(1000, 9999)}",
+        f"candidate{rng.randint(1, 999)}@example.com",
+        "",
+        "SUMMARY",
+        f"{rng.choice(TITLES)} with {rng.randint(2, 25)} years of experience across "
+        + ", ".join(rng.sample(SKILLS, 3)) + ".",
+        "",
+        "TECHNICAL SKILLS",
+        ", ".join(rng.sample(SKILLS, rng.randint(6, 14))),
+        "",
+        "PROFESSIONAL EXPERIENCE",
+    ]
+    for _ in range(roles):
+        end = min(year + rng.randint(1, 5), 2024)
+        lines.append(f"{rng.choice(TITLES)}, Company {rng.randint(1, 500)} ({year} - {end})")
+        for _ in range(rng.randint(2, 5)):
+            lines.append(f"- {rng.choice(VERBS)} {rng.choice(OBJECTS)} {rng.choice(OUTCOMES)} "
+                         f"using {rng.choice(SKILLS)} and {rng.choice(SKILLS)}")
+        year = end
+    lines += ["", "EDUCATION", f"B.S. Computer Science, State University ({rng.randint(1980, 2012)})"]
+    return "\n".join(lines) + "\n"
+
+
+def make_jd(rng: random.Random, blocks: int = SIZES["medium"]) -> str:
+    """A job description with a title, blocks requirement/responsibility paragraphs and flavor text"""
+    lines = [rng.choice(TITLES), "", f"About the role: {rng.choice(JD_FLAVOR)}", ""]
+    for _ in range(blocks):
+        lines.append(rng.choice(["Requirements:", "Responsibilities:", "Nice to have:"]))
+        for skill in rng.sample(SKILLS, rng.randint(3, 6)):
+            lines.append(f"- {rng.randint(1, 8)}+ years of experience with {skill}")
+        lines.append(rng.choice(JD_FLAVOR))
+        lines.append("")
+    return "\n".join(lines)
+
+
+def make_corpus(seed: int, count: int, size: str = "medium") -> Dict[str, List[str]]:
+    """count resumes and count JDs of one size"""
+    rng = random.Random(seed)
+    return {
+        "resumes": [make_resume(rng, SIZES[size]) for _ in range(count)],
+        "jds": [make_jd(rng, SIZES[size]) for _ in range(count)],
+    }
+
+
+def to_txt(text: str) -> bytes:
+    return text.encode("utf-8")
+
+
+def to_docx(text: str) -> bytes:
+    """A DOCX with one paragraph per line"""
+    from docx import Document
+
+    document = Document()
+    for line in text.splitlines():
+        document.add_paragraph(line)
+    out = io.BytesIO()
+    document.save(out)
+    return out.getvalue()
+
+
+def to_pdf(text: str, lines_per_page: int = 60) -> bytes:
+    """A text-only PDF, lines_per_page lines of Helvetica per page"""
+    lines = [
+        line.encode("latin-1", "replace").replace(b"\\", b"\\\\").replace(b"(", b"\\(").replace(b")", b"\\)")
+        for line in text.splitlines()
+    ] or [b""]
+    pages = [lines[start:start + lines_per_page] for start in range(0, len(lines), lines_per_page)]
+
+    # Objects 1-3 are the catalog, page tree and font; then content and page per page
+    objects = [b"<< /Type /Catalog /Pages 2 0 R >>", b"", b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>"]
+    page_ids = []
+    for page_lines in pages:
+        content = b"BT /F1 10 Tf 12 TL 50 760 Td " + b" ".join(b"(%s) '" % line for line in page_lines) + b" ET"
+        objects.append(b"<< /Length %d >>\nstream\n%s\nendstream" % (len(content), content))
+        objects.append(
+            b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] /Contents %d 0 R "
+            b"/Resources << /Font << /F1 3 0 R >> >> >>" % len(objects)
+        )
+        page_ids.append(len(objects))
+    objects[1] = b"<< /Type /Pages /Kids [%s] /Count %d >>" % (
+        b" ".join(b"%d 0 R" % page_id for page_id in page_ids), len(page_ids)
+    )
+
+    out = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for number, body in enumerate(objects, start=1):
+        offsets.append(len(out))
+        out += b"%d 0 obj\n%s\nendobj\n" % (number, body)
+    xref = len(out)
+    out += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1)
+    out += b"".join(b"%010d 00000 n \n" % offset for offset in offsets)
+    out += b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(objects) + 1, xref)
+    return bytes(out)
+
+
+RENDERERS = {".txt": to_txt, ".docx": to_docx, ".pdf": to_pdf}
+
+
+def render_resume(text: str, file_type: str) -> bytes:
+    """The upload body for text as a file_type file"""
+    return RENDERERS[file_type](text)
@@ -0,0 +1,247 @@
+"""
+End-to-end load generator for the API with a mixed workload.
+
+Starts the app with uvicorn on a fresh SQLite database (or --database-url,
+e.g. a local Postgres) and in-process parsing, or targets a running server
+with --url. Seeds generated resumes, uploaded as TXT, DOCX and PDF and
+polled until parsed, and job descriptions, then has --clients concurrent
+clients each run --requests operations cycling through uploads, JD
+creation, compiles, scores and reads. With --mix reads the clients only
+read, cycling through GET /jds/{id}, GET /variants?jd_id= and GET
+/resumes/{id}/status for an unknown id (a 404 after two lookups). Reports
+p50/p99 latency per endpoint and overall throughput.
+
+    python -m benchmarks.load_generator --clients 20 --json load.json
+    python -m benchmarks.load_generator --mix reads --clients 200 --requests 30
+    python -m benchmarks.load_generator --database-url postgresql://localhost/ats_bench
+"""
+import argparse
+import asyncio
+import os
+import random
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import uuid
+from collections import defaultdict
+from typing import Dict, List, Optional, Tuple
+
+import httpx
+
+from .generators import FILE_TYPES, SIZES, make_jd, make_resume, render_resume
+from .results import record, write_results
+
+CONTENT_TYPES = {
+    ".txt": "text/plain",
+    ".docx": "application/vnd.openxmlformats-officedocument.wordprocessingml.document",
+    ".pdf": "application/pdf",
+}
+USER_ID = "load_generator"
+MIXES = ("mixed", "reads")
+
+
+def percentile(samples: List[float], pct: float) -> float:
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct / 100))]
+
+
+def free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def start_server(database_url: str, port: int) -> subprocess.Popen:
+    env = dict(os.environ, DATABASE_URL=database_url, PARSE_QUEUE_BACKEND="inprocess")
+    return subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "app.main:app", "--port", str(port), "--log-level", "warning"],
+        env=env
+    )
+
+
+async def wait_for_server(url: str, server: Optional[subprocess.Popen], timeout: float = 60) -> None:
+    deadline = time.monotonic() + timeout
+    async with httpx.AsyncClient(base_url=url) as http:
+        while True:
+            if server is not None and server.poll() is not None:
+                raise RuntimeError(f"Server exited with code {server.returncode}")
+            try:
+                if (await http.get("/")).status_code == 200:
+                    return
+            except httpx.TransportError:
+                pass
+            if time.monotonic() > deadline:
+                raise RuntimeError(f"Server at {url} did not start within {timeout:.0f}s")
+            await asyncio.sleep(0.2)
+
+
+class Workload:
+    """Seeded resumes and JDs plus the operations the clients cycle through"""
+
+    def __init__(self, http: httpx.AsyncClient, seed: int, size: str, mix: str = "mixed"):
+        self.http = http
+        self.rng = random.Random(seed)
+        self.size = size
+        self.mix = mix
+        self.resume_ids: List[str] = []
+        self.jd_ids: List[str] = []
+        self.latencies: Dict[str, List[float]] = defaultdict(list)
+        self.uploads = 0
+
+    async def request(
+        self, endpoint: str, method: str, path: str, expected: Tuple[int, ...] = (), **kwargs
+    ) -> httpx.Response:
+        start = time.perf_counter()
+        response = await self.http.request(method, path, **kwargs)
+        self.latencies[endpoint].append(time.perf_counter() - start)
+        if response.status_code >= 400 and response.status_code not in expected:
+            raise RuntimeError(f"{method} {path} returned {response.status_code}: {response.text[:200]}")
+        return response
+
+    async def upload(self) -> str:
+        file_type = FILE_TYPES[self.uploads % len(FILE_TYPES)]
+        self.uploads += 1
+        body = render_resume(make_resume(self.rng, SIZES[self.size]), file_type)
+        files = {"file": (f"resume{self.uploads}{file_type}", body, CONTENT_TYPES[file_type])}
+        response = await self.request("upload", "POST", "/resumes/upload", files=files, data={"user_id": USER_ID})
+        return response.json()["resume_id"]
+
+    async def wait_parsed(self, resume_id: str, timeout: float = 60) -> None:
+        deadline = time.monotonic() + timeout
+        while True:
+            status = (await self.request("status", "GET", f"/resumes/{resume_id}/status")).json()
+            if status["status"] == "done":
+                return
+            if status["status"] == "failed":
+                raise RuntimeError(f"Resume {resume_id} failed to parse: {status.get('error')}")
+            if time.monotonic() > deadline:
+                raise RuntimeError(f"Resume {resume_id} still {status['status']} after {timeout:.0f}s")
+            await asyncio.sleep(0.05)
+
+    async def create_jd(self) -> str:
+        body = {"platform": self.rng.choice(["linkedin", "indeed", "dice"]),
+                "raw_text": make_jd(self.rng, SIZES[self.size])}
+        return (await self.request("jds", "POST", "/jds", json=body)).json()["id"]
+
+    async def seed(self, resumes: int, jds: int) -> None:
+        for _ in range(resumes):
+            resume_id = await self.upload()
+            await self.wait_parsed(resume_id)
+            self.resume_ids.append(resume_id)
+        for _ in range(jds):
+            self.jd_ids.append(await self.create_jd())
+
+    async def operation(self, step: int) -> None:
+        if self.mix == "reads":
+            return await self.read_operation(step)
+        rng = self.rng
+        resume_id, jd_id = rng.choice(self.resume_ids), rng.choice(self.jd_ids)
+        kind = step % 10
+        if kind == 0:
+            await self.wait_parsed(await self.upload())
+        elif kind == 1:
+            await self.create_jd()
+        elif kind in (2, 3, 4):
+            body = {"resume_id": resume_id, "jd_id": jd_id,
+                    "persona": rng.choice(["ic", "architect", "hybrid"]), "platform": "linkedin"}
+            await self.request("compile", "POST", "/variants/compile", json=body)
+        elif kind in (5, 6):
+            await self.request("scores", "GET", "/scores", params={"resume_id": resume_id, "jd_id": jd_id})
+        elif kind == 7:
+            await self.request("get_jd", "GET", f"/jds/{jd_id}")
+        elif kind == 8:
+            await self.request("get_resume", "GET", f"/resumes/{resume_id}")
+        else:
+            await self.request("list_variants", "GET", "/variants", params={"jd_id": jd_id})
+
+    async def read_operation(self, step: int) -> None:
+        jd_id = self.jd_ids[step % len(self.jd_ids)]
+        kind = step % 3
+        if kind == 0:
+            await self.request("get_jd", "GET", f"/jds/{jd_id}")
+        elif kind == 1:
+            await self.request("list_variants", "GET", "/variants", params={"jd_id": jd_id})
+        else:
+            await self.request("status_404", "GET", f"/resumes/{uuid.uuid4()}/status", expected=(404,))
+
+
+async def client_loop(workload: Workload, requests: int, offset: int) -> None:
+    for step in range(offset, offset + requests):
+        await workload.operation(step)
+
+
+async def run(url: str, args: argparse.Namespace, server: Optional[subprocess.Popen]) -> list:
+    await wait_for_server(url, server)
+    limits = httpx.Limits(max_connections=args.clients, max_keepalive_connections=args.clients)
+    async with httpx.AsyncClient(base_url=url, limits=limits, timeout=120) as http:
+        workload = Workload(http, args.seed, args.size, args.mix)
+        await workload.seed(args.resumes, args.jds)
+        workload.latencies.clear()
+
+        start = time.perf_counter()
+        await asyncio.gather(*(client_loop(workload, args.requests, offset) for offset in range(args.clients)))
+        elapsed = time.perf_counter() - start
+
+    print(f"{args.clients} clients x {args.requests} {args.mix} operations in {elapsed:.2f}s ({args.size} documents)\n")
+    print(f"{'endpoint':<14} {'requests':>8} {'p50 ms':>8} {'p99 ms':>8} {'mean ms':>8}")
+    records = []
+    total = 0
+    for endpoint, samples in sorted(workload.latencies.items()):
+        total += len(samples)
+        p50, p99 = percentile(samples, 50) * 1e3, percentile(samples, 99) * 1e3
+        print(f"{endpoint:<14} {len(samples):>8} {p50:>8.1f} {p99:>8.1f} {statistics.mean(samples) * 1e3:>8.1f}")
+        records.append(record(f"{endpoint}.p50", p50, "ms", requests=len(samples)))
+        records.append(record(f"{endpoint}.p99", p99, "ms", requests=len(samples)))
+    print(f"\nthroughput {total / elapsed:.0f} requests/s")
+    records.append(record("throughput", total / elapsed, "req/s", requests=total))
+    return records
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--url", help="Target a running server instead of starting one")
+    parser.add_argument("--database-url", help="Database for the started server (default: a temporary SQLite file)")
+    parser.add_argument("--mix", choices=MIXES, default="mixed", help="reads: only the read endpoints")
+    parser.add_argument("--clients", type=int, default=20)
+    parser.add_argument("--requests", type=int, default=20, help="Operations per client")
+    parser.add_argument("--resumes", type=int, default=9, help="Resumes to seed")
+    parser.add_argument("--jds", type=int, default=5, help="Job descriptions to seed")
+    parser.add_argument("--size", choices=list(SIZES), default="medium")
+    parser.add_argument("--seed", type=int, default=19)
+    parser.add_argument("--json", help="Write results to this file")
+    args = parser.parse_args()
+
+    server, database_path = None, None
+    url = args.url
+    if url is None:
+        database_url = args.database_url
+        if database_url is None:
+            fd, database_path = tempfile.mkstemp(prefix="ats_load_", suffix=".db")
+            os.close(fd)
+            database_url = f"sqlite:///{database_path}"
+        port = free_port()
+        url = f"http://127.0.0.1:{port}"
+        server = start_server(database_url, port)
+
+    try:
+        records = asyncio.run(run(url, args, server))
+    finally:
+        if server is not None:
+            server.terminate()
+            server.wait(timeout=30)
+        if database_path is not None:
+            os.remove(database_path)
+
+    if args.json:
+        write_results(
+            args.json, "load", records, mix=args.mix, clients=args.clients, requests=args.requests,
+            resumes=args.resumes, jds=args.jds, size=args.size, seed=args.seed,
+            database="external" if args.url else ("sqlite" if database_path else "custom")
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,60 @@
+"""
+Benchmark results as JSON, so runs can be compared.
+
+A results file holds the suite name, the environment it ran in and a list
+of records. Each record has a unique name, a value and its unit; "req/s"
+values are better higher, every other unit is a latency and better lower.
+Compare two files with:
+
+    python -m benchmarks.compare baseline.json current.json
+"""
+import json
+import os
+import platform
+import subprocess
+import sys
+from datetime import datetime, timezone
+from typing import Any, Dict, List
+
+HIGHER_IS_BETTER_UNITS = {"req/s"}
+
+
+def git_commit() -> str:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True, text=True, check=True, cwd=os.path.dirname(__file__)
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def environment() -> Dict[str, Any]:
+    return {
+        "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "commit": git_commit(),
+        "python": sys.version.split()[0],
+        "platform": platform.platform(),
+        "cpus": os.cpu_count(),
+    }
+
+
+def record(name: str, value: float, unit: str, **extra: Any) -> Dict[str, Any]:
+    return {"name": name, "value": value, "unit": unit, **extra}
+
+
+def write_results(path: str, suite: str, records: List[Dict[str, Any]], **parameters: Any) -> None:
+    names = [entry["name"] for entry in records]
+    assert len(names) == len(set(names)), "Record names must be unique"
+    with open(path, "w") as f:
+        json.dump(
+            {"suite": suite, "environment": environment(), "parameters": parameters, "results": records},
+            f, indent=2
+        )
+        f.write("\n")
+    print(f"\nWrote {len(records)} results to {path}")
+
+
+def read_results(path: str) -> Dict[str, Any]:
+    with open(path) as f:
+        return json.load(f)
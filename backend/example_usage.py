@@ -4,18 +4,32 @@ Run this after starting the backend server.
 """
 import requests
 import json
+import time
 
 BASE_URL = "http://localhost:8000"
 
 
 def upload_resume(file_path: str, user_id: str = "test_user") -> dict:
-    """Upload a resume file"""
+    """Upload a resume file and wait for it to be parsed"""
     with open(file_path, 'rb') as f:
         files = {'file': f}
         data = {'user_id': user_id}
         response = requests.post(f"{BASE_URL}/resumes/upload", files=files, data=data)
         response.raise_for_status()
-        return response.json()
+        status = response.json()
+    
+    # Parsing runs in the background; poll until it finishes
+    while status['status'] in ('queued', 'parsing'):
+        time.sleep(0.5)
+        response = requests.get(f"{BASE_URL}/resumes/{status['resume_id']}/status")
+        response.raise_for_status()
+        status = response.json()
+    if status['status'] == 'failed':
+        raise RuntimeError(status['error'])
+    
+    response = requests.get(f"{BASE_URL}/resumes/{status['resume_id']}")
+    response.raise_for_status()
+    return response.json()
 
 
 def create_job_description(platform: str, raw_text: str) -> dict:
@@ -0,0 +1,21 @@
+"""API tests run against a temporary SQLite database, parsing uploads in-process"""
+import os
+import tempfile
+
+# Set before anything imports app.config
+_database_dir = tempfile.mkdtemp(prefix="ats-tests-")
+os.environ["DATABASE_URL"] = f"sqlite:///{_database_dir}/test.db"
+os.environ.pop("ASYNC_DATABASE_URL", None)
+os.environ["PARSE_QUEUE_BACKEND"] = "inprocess"
+
+import pytest  # noqa: E402
+
+
+@pytest.fixture(scope="session")
+def client():
+    from fastapi.testclient import TestClient
+
+    from app.main import app
+
+    with TestClient(app) as client:
+        yield client
@@ -0,0 +1,90 @@
+"""Compiles are idempotent: the same inputs map to one stored variant and id"""
+import json
+import uuid
+
+import pytest
+
+from app import main
+from app.db import SessionLocal
+from app.models import Resume, ResumeVariant
+from benchmarks.common import SAMPLE_JD, SAMPLE_RESUME
+
+
+@pytest.fixture
+def resume_and_jd(client):
+    resume = Resume(user_id=f"batch-{uuid.uuid4()}", raw_text=SAMPLE_RESUME)
+    with SessionLocal() as db:
+        db.add(resume)
+        db.commit()
+        resume_id = str(resume.id)
+    jd = client.post("/jds", json={"platform": "dice", "raw_text": f"{SAMPLE_JD}\nReq {uuid.uuid4().hex}"})
+    return resume_id, jd.json()["id"]
+
+
+def compile_batch(client, resume_id: str, jd_id: str, personas, platforms) -> tuple:
+    """(variant lines, status line) of one compile:batch"""
+    body = {"resume_id": resume_id, "jd_ids": [jd_id], "personas": personas, "platforms": platforms}
+    lines = [json.loads(line) for line in client.post("/variants/compile:batch", json=body).text.splitlines()]
+    return lines[:-1], lines[-1]
+
+
+def stored_variants(resume_id: str) -> int:
+    with SessionLocal() as db:
+        return db.query(ResumeVariant).filter(ResumeVariant.resume_id == uuid.UUID(resume_id)).count()
+
+
+BATCHES = [
+    pytest.param(["ic"], ["dice"], id="one_variant"),
+    pytest.param(["ic", "architect", "hybrid"], ["linkedin", "indeed", "dice"], id="all_personas_and_platforms"),
+]
+
+
+@pytest.mark.parametrize("personas, platforms", BATCHES)
+def test_batch_compile_is_idempotent(client, resume_and_jd, personas, platforms):
+    resume_id, jd_id = resume_and_jd
+    total = len(personas) * len(platforms)
+    single = client.post(
+        "/variants/compile",
+        json={"resume_id": resume_id, "jd_id": jd_id, "persona": "ic", "platform": "dice"}
+    ).json()
+
+    first, first_status = compile_batch(client, resume_id, jd_id, personas, platforms)
+    second, second_status = compile_batch(client, resume_id, jd_id, personas, platforms)
+
+    assert first_status == {"status": "committed", "count": total, "new": total - 1, "replaced": {}}
+    assert second_status == {"status": "committed", "count": total, "new": 0, "replaced": {}}
+    assert single["id"] in {variant["id"] for variant in first}
+    assert [variant["id"] for variant in second] == [variant["id"] for variant in first]
+    assert stored_variants(resume_id) == total
+
+
+def test_compile_returns_stored_variant(client, resume_and_jd):
+    resume_id, jd_id = resume_and_jd
+    body = {"resume_id": resume_id, "jd_id": jd_id, "persona": "architect", "platform": "linkedin"}
+    first = client.post("/variants/compile", json=body).json()
+    assert client.post("/variants/compile", json=body).json()["id"] == first["id"]
+    assert stored_variants(resume_id) == 1
+
+
+def test_batch_reports_ids_stored_by_concurrent_compile(client, resume_and_jd, monkeypatch):
+    resume_id, jd_id = resume_and_jd
+    stored, _ = compile_batch(client, resume_id, jd_id, ["ic", "architect"], ["dice"])
+
+    # A concurrent compile stores the variants after this batch looked for them
+    lookup = main.stored_variant_ids_by_jd
+    lookups = []
+
+    def stored_after_first_lookup(*args):
+        lookups.append(args)
+        return {} if len(lookups) == 1 else lookup(*args)
+
+    monkeypatch.setattr(main, "stored_variant_ids_by_jd", stored_after_first_lookup)
+    streamed, status = compile_batch(client, resume_id, jd_id, ["ic", "architect"], ["dice"])
+
+    assert status["new"] == 0
+    assert status["replaced"] == {
+        streamed_variant["id"]: stored_variant["id"] for streamed_variant, stored_variant in zip(streamed, stored)
+    }
+    for variant_id in status["replaced"].values():
+        assert client.get(f"/variants/{variant_id}").status_code == 200
+    assert stored_variants(resume_id) == 2
@@ -0,0 +1,42 @@
+"""bulk_scoring.score_matrix gives exactly the scores of calculate_survivability_score"""
+import random
+
+import pytest
+
+from app.bulk_scoring import pair_scores, score_matrix
+from app.jd_extract import extract_jd_signals
+from app.platform_profiles import PLATFORM_PROFILES
+from app.scoring import calculate_survivability_score
+from benchmarks.bench_bulk_scoring import make_jd, make_resume
+
+RESUMES = [
+    "",
+    "Jane Doe\nSKILLS\nPython, Kubernetes",
+    "SUMMARY\nPrincipal Architect, 20 years\nEXPERIENCE\nChief Architect (1990 - 2020)\nEDUCATION\nB.S. (1985)",
+    "Senior Software Engineer\nGo, Terraform, AWS, Kafka\nSoftware Engineer (2019 - 2024)",
+]
+JDS = [
+    "",
+    "Junior Software Engineer\n\nRequirements: Python, Docker",
+    "Senior Software Engineer\n\nWe need Go, Terraform, AWS and Kafka. Mentor engineers.",
+]
+
+rng = random.Random(11)
+GENERATED_RESUMES = [make_resume(rng) for _ in range(15)]
+GENERATED_JDS = [make_jd(rng) for _ in range(15)]
+
+COHORTS = [
+    pytest.param(RESUMES, JDS, id="edge_cases"),
+    pytest.param(GENERATED_RESUMES, GENERATED_JDS, id="generated"),
+]
+
+
+@pytest.mark.parametrize("resume_texts, jd_texts", COHORTS)
+@pytest.mark.parametrize("platform", list(PLATFORM_PROFILES))
+def test_score_matrix_matches_scalar_scores(resume_texts, jd_texts, platform):
+    jd_signals = [extract_jd_signals(text) for text in jd_texts]
+    matrix = score_matrix(resume_texts, jd_texts, jd_signals=jd_signals)
+    for i, resume_text in enumerate(resume_texts):
+        for j, jd_text in enumerate(jd_texts):
+            expected = calculate_survivability_score(resume_text, jd_text, platform, jd_signals=jd_signals[j])
+            assert pair_scores(matrix, i, j, platform) == expected, (i, j)
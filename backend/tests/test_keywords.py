@@ -0,0 +1,31 @@
+"""Multi-word terms from the keyword vocabulary are extracted as single keywords"""
+import pytest
+
+from app.jd_extract import DocumentFrequencies, extract_keywords
+
+# Ranked by raw frequency, as before the corpus has IDF_MIN_DOCUMENTS JDs
+NO_CORPUS = DocumentFrequencies()
+
+PHRASE_CASES = [
+    pytest.param(
+        "Experience with Machine Learning and data science",
+        ["experience", "machine learning", "data science"],
+        id="title_case_phrases"
+    ),
+    pytest.param("Own our CI/CD pipelines", ["ci/cd", "pipelines"], id="slash_term"),
+    pytest.param("ci / cd, Machine\n  learning", ["ci/cd", "machine learning"], id="spacing_and_line_breaks"),
+    pytest.param("Big data. Science background", ["science", "background"], id="not_across_sentences"),
+    pytest.param("machine-learning", ["machine", "learning"], id="not_hyphenated"),
+]
+
+
+@pytest.mark.parametrize("text, expected", PHRASE_CASES)
+def test_extract_keywords_phrases(text, expected):
+    assert extract_keywords(text, frequencies=NO_CORPUS) == expected
+
+
+def test_phrase_counts_once_per_occurrence():
+    text = "Machine learning. Machine learning platform. Python"
+    keywords = extract_keywords(text, frequencies=NO_CORPUS)
+    assert keywords[0] == "machine learning"
+    assert "machine" not in keywords and "learning" not in keywords
@@ -0,0 +1,113 @@
+"""Keyset pages visit every row once, in order, and cursors round-trip"""
+from datetime import datetime, timedelta, timezone
+import base64
+import json
+import uuid
+
+import pytest
+
+from app.db import SessionLocal
+from app.models import Resume
+from app.pagination import decode_cursor, encode_cursor
+
+CURSOR_ROWS = [
+    pytest.param(datetime(2026, 10, 17, 9, 30, tzinfo=timezone.utc), id="utc"),
+    pytest.param(datetime(2026, 10, 17, 9, 30, 0, 123456, tzinfo=timezone.utc), id="microseconds"),
+    pytest.param(datetime(2026, 10, 17, 9, 30, tzinfo=timezone(timedelta(hours=-5))), id="offset"),
+    pytest.param(datetime(2026, 10, 17, 9, 30), id="naive"),
+]
+
+
+@pytest.mark.parametrize("created_at", CURSOR_ROWS)
+def test_cursor_round_trip(created_at):
+    row_id = uuid.uuid4()
+    cursor = encode_cursor(created_at, row_id)
+    assert "=" not in cursor
+    assert decode_cursor(cursor) == (created_at, row_id)
+
+
+MALFORMED_CURSORS = [
+    pytest.param("", id="empty"),
+    pytest.param("zzz", id="not_base64_json"),
+    pytest.param(base64.urlsafe_b64encode(b'{"a": 1}').decode(), id="not_a_pair"),
+    pytest.param(base64.urlsafe_b64encode(json.dumps(["yesterday", str(uuid.uuid4())]).encode()).decode(), id="bad_date"),
+    pytest.param(base64.urlsafe_b64encode(json.dumps(["2026-10-17T09:30:00", "42"]).encode()).decode(), id="bad_id"),
+]
+
+
+@pytest.mark.parametrize("cursor", MALFORMED_CURSORS)
+def test_malformed_cursor_raises_value_error(cursor):
+    with pytest.raises(ValueError, match="Invalid cursor"):
+        decode_cursor(cursor)
+
+
+@pytest.fixture(scope="module")
+def resume_ids(client):
+    """Resumes for one user, several sharing a created_at so pages split on id"""
+    user_id = f"pagination-{uuid.uuid4()}"
+    start = datetime(2026, 10, 17, tzinfo=timezone.utc)
+    resumes = [
+        Resume(user_id=user_id, raw_text=f"Resume {i}", created_at=start + timedelta(seconds=i // 3))
+        for i in range(11)
+    ]
+    with SessionLocal() as db:
+        db.add_all(resumes)
+        db.commit()
+        return user_id, {str(resume.id) for resume in resumes}
+
+
+def list_all(client, user_id: str, limit: int, **params) -> list:
+    pages = []
+    cursor = None
+    while True:
+        request = {"user_id": user_id, "limit": limit, **params}
+        if cursor:
+            request["cursor"] = cursor
+        response = client.get("/resumes", params=request)
+        assert response.status_code == 200, response.text
+        pages.append(response.json())
+        cursor = response.headers.get("X-Next-Cursor")
+        if not cursor:
+            return pages
+
+
+@pytest.mark.parametrize("limit", [1, 2, 3, 10, 11, 50])
+def test_pages_visit_every_row_once_in_order(client, resume_ids, limit):
+    user_id, expected = resume_ids
+    pages = list_all(client, user_id, limit)
+    rows = [row for page in pages for row in page]
+    ids = [row["id"] for row in rows]
+    assert len(ids) == len(set(ids)) and set(ids) == expected
+    assert [row["created_at"] for row in rows] == sorted(row["created_at"] for row in rows)
+    assert all(len(page) == limit for page in pages[:-1]) and 0 < len(pages[-1]) <= limit
+
+
+PROJECTIONS = [
+    pytest.param(None, {"id", "user_id", "created_at"}, id="default_leaves_out_text"),
+    pytest.param("raw_text", {"raw_text", "id", "created_at"}, id="named_field_and_sort_key"),
+    pytest.param("user_id, raw_text", {"user_id", "raw_text", "id", "created_at"}, id="several_fields"),
+]
+
+
+@pytest.mark.parametrize("fields, expected", PROJECTIONS)
+def test_fields_projection(client, resume_ids, fields, expected):
+    user_id, _ = resume_ids
+    params = {"user_id": user_id, "limit": 2}
+    if fields is not None:
+        params["fields"] = fields
+    rows = client.get("/resumes", params=params).json()
+    assert [set(row) for row in rows] == [expected, expected]
+
+
+BAD_REQUESTS = [
+    pytest.param({"cursor": "zzz"}, id="malformed_cursor"),
+    pytest.param({"fields": "nope"}, id="unknown_field"),
+    pytest.param({"limit": 0}, id="limit_too_small"),
+    pytest.param({"limit": 10 ** 6}, id="limit_too_large"),
+]
+
+
+@pytest.mark.parametrize("params", BAD_REQUESTS)
+def test_bad_list_requests_are_rejected(client, resume_ids, params):
+    user_id, _ = resume_ids
+    assert client.get("/resumes", params={"user_id": user_id, **params}).status_code == 400
@@ -0,0 +1,159 @@
+"""Parse jobs are failed only once their owner stops heartbeating, and poison uploads stop retrying"""
+from datetime import datetime, timedelta, timezone
+import json
+import uuid
+
+import fakeredis
+import pytest
+
+from app import parse_queue
+from app.config import settings
+from app.db import Base, SessionLocal, engine
+from app.models import ParseJob
+from app.parse_queue import (
+    PARSE_PAYLOAD_KEY,
+    PARSE_QUEUE_KEY,
+    ParseTask,
+    RedisParseQueue,
+    claim_parse_job,
+    fail_stale_parse_jobs,
+    heartbeat_parse_jobs,
+    release_parse_jobs,
+)
+from app.uploads import remove_spool_file, write_spool_file
+
+TIMEOUT = 300
+
+
+@pytest.fixture
+def db():
+    Base.metadata.create_all(bind=engine)
+    with SessionLocal() as db:
+        yield db
+
+
+def add_job(db, status: str = "queued", owner_id=None, silent_for=None) -> uuid.UUID:
+    """A parse job whose owner last heartbeated silent_for seconds ago"""
+    resume_id = uuid.uuid4()
+    heartbeat_at = None if silent_for is None else datetime.now(timezone.utc) - timedelta(seconds=silent_for)
+    db.add(ParseJob(
+        resume_id=resume_id, user_id="u", filename="r.txt", status=status, owner_id=owner_id, heartbeat_at=heartbeat_at
+    ))
+    db.commit()
+    return resume_id
+
+
+def job_status(db, resume_id: uuid.UUID) -> str:
+    db.expire_all()
+    return db.get(ParseJob, resume_id).status
+
+
+STALE_SWEEPS = [
+    pytest.param("queued", None, None, "queued", id="waiting_in_redis_queue"),
+    pytest.param("queued", "owner", 10, "queued", id="owner_alive"),
+    pytest.param("parsing", "owner", 10, "parsing", id="parsing_owner_alive"),
+    pytest.param("queued", "owner", TIMEOUT + 10, "failed", id="owner_gone_before_parsing"),
+    pytest.param("parsing", "owner", TIMEOUT + 10, "failed", id="owner_gone_while_parsing"),
+    pytest.param("done", "owner", TIMEOUT + 10, "done", id="finished"),
+]
+
+
+@pytest.mark.parametrize("status, owner_id, silent_for, expected", STALE_SWEEPS)
+def test_fail_stale_parse_jobs(db, status, owner_id, silent_for, expected):
+    resume_id = add_job(db, status, owner_id and uuid.uuid4().hex, silent_for)
+    fail_stale_parse_jobs(db, older_than_seconds=TIMEOUT)
+    assert job_status(db, resume_id) == expected
+
+
+def test_heartbeat_keeps_owned_jobs_alive(db):
+    owner_id, other_id = uuid.uuid4().hex, uuid.uuid4().hex
+    alive = add_job(db, "parsing", owner_id, TIMEOUT + 10)
+    gone = add_job(db, "parsing", other_id, TIMEOUT + 10)
+    heartbeat_parse_jobs(db, owner_id)
+    fail_stale_parse_jobs(db, older_than_seconds=TIMEOUT)
+    assert (job_status(db, alive), job_status(db, gone)) == ("parsing", "failed")
+
+
+def test_claimed_job_is_not_stale(db):
+    resume_id = add_job(db)
+    claim_parse_job(db, resume_id, uuid.uuid4().hex)
+    fail_stale_parse_jobs(db, older_than_seconds=TIMEOUT)
+    assert job_status(db, resume_id) == "queued"
+
+
+def test_released_job_is_not_failed(db):
+    resume_id = add_job(db, "parsing", uuid.uuid4().hex, TIMEOUT + 10)
+    release_parse_jobs(db, [resume_id])
+    fail_stale_parse_jobs(db, older_than_seconds=TIMEOUT)
+    assert job_status(db, resume_id) == "parsing"
+
+
+@pytest.fixture
+def new_queue():
+    """Makes Redis parse queues, each a separate consumer of one fake Redis server"""
+    server = fakeredis.FakeServer()
+
+    def new_queue() -> RedisParseQueue:
+        queue = RedisParseQueue("redis://localhost")
+        queue._client = fakeredis.FakeRedis(server=server)
+        return queue
+
+    return new_queue
+
+
+def enqueue_job(db, queue: RedisParseQueue) -> uuid.UUID:
+    resume_id = add_job(db)
+    queue.enqueue(ParseTask(resume_id, "u", "r.txt", write_spool_file(b"Jane Doe\nSKILLS\nPython", "r.txt")))
+    return resume_id
+
+
+def take(queue: RedisParseQueue) -> bytes:
+    return queue._client.blmove(PARSE_QUEUE_KEY, queue._processing_key, 1, "RIGHT", "LEFT")
+
+
+@pytest.mark.parametrize("max_attempts", [1, 3])
+def test_retries_stop_after_max_attempts(db, new_queue, monkeypatch, max_attempts):
+    monkeypatch.setattr(settings, "PARSE_MAX_ATTEMPTS", max_attempts)
+    queue = new_queue()
+    resume_id = enqueue_job(db, queue)
+
+    for attempt in range(1, max_attempts):
+        queue._retry(take(queue))
+        assert json.loads(queue._client.lindex(PARSE_QUEUE_KEY, 0))["attempts"] == attempt
+        assert job_status(db, resume_id) == "queued"
+    queue._retry(take(queue))
+
+    assert job_status(db, resume_id) == "failed"
+    assert queue._client.llen(PARSE_QUEUE_KEY) == 0
+    assert queue._client.llen(queue._processing_key) == 0
+    assert not queue._client.exists(PARSE_PAYLOAD_KEY.format(resume_id))
+
+
+def test_abandoned_message_is_requeued_and_released(db, new_queue, monkeypatch):
+    # The sweep fails every owned job at once, so only the release saves this one
+    monkeypatch.setattr(parse_queue, "fail_stale_parse_jobs", lambda db: fail_stale_parse_jobs(db, 0))
+    stopped, running = new_queue(), new_queue()
+    resume_id = enqueue_job(db, stopped)
+    remove_spool_file(stopped._load_task(take(stopped)).path)
+    db.expire_all()
+    assert db.get(ParseJob, resume_id).owner_id == stopped.consumer_id
+
+    # The stopped consumer never heartbeated, so its processing list is abandoned
+    running._sweep()
+
+    assert stopped._client.llen(stopped._processing_key) == 0
+    assert json.loads(running._client.lindex(PARSE_QUEUE_KEY, 0))["resume_id"] == str(resume_id)
+    db.expire_all()
+    job = db.get(ParseJob, resume_id)
+    assert (job.status, job.owner_id) == ("queued", None)
+
+
+def test_finished_job_message_is_acknowledged(db, new_queue):
+    queue = new_queue()
+    resume_id = enqueue_job(db, queue)
+    db.query(ParseJob).filter(ParseJob.resume_id == resume_id).update({"status": "done"})
+    db.commit()
+
+    assert queue._load_task(take(queue)) is None
+    assert queue._client.llen(queue._processing_key) == 0
+    assert not queue._client.exists(PARSE_PAYLOAD_KEY.format(resume_id))
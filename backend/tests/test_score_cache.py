@@ -0,0 +1,73 @@
+"""Cached scores are exactly the scorer's, and anything scores depend on changes the cache key"""
+import copy
+import random
+
+import pytest
+
+from app import score_cache
+from app.config import settings
+from app.jd_extract import extract_jd_signals
+from app.parsing import build_parsed_json
+from app.platform_profiles import PLATFORM_PROFILES, refresh_platform_profiles, write_profile_version
+from app.score_cache import ScoreCache, score_cache_key, score_with_cache
+from app.scoring import calculate_survivability_score
+from benchmarks.bench_bulk_scoring import make_jd, make_resume
+
+rng = random.Random(13)
+PAIRS = [(make_resume(rng), make_jd(rng)) for _ in range(10)]
+
+
+@pytest.fixture
+def cache(monkeypatch):
+    cache = ScoreCache(max_entries=1000)
+    monkeypatch.setattr(score_cache, "_score_cache", cache)
+    return cache
+
+
+@pytest.fixture
+def profiles_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "PLATFORM_PROFILES_DIR", str(tmp_path))
+    yield str(tmp_path)
+    monkeypatch.undo()
+    refresh_platform_profiles(force=True)
+
+
+@pytest.mark.parametrize("platform", list(PLATFORM_PROFILES))
+def test_cached_scores_match_scorer(cache, platform):
+    for resume_text, jd_text in PAIRS:
+        signals = extract_jd_signals(jd_text)
+        expected = calculate_survivability_score(resume_text, jd_text, platform, jd_signals=signals)
+        parsed = build_parsed_json(resume_text)
+        assert score_with_cache(resume_text, jd_text, platform, signals, parsed) == (expected, False)
+        assert score_with_cache(resume_text, jd_text, platform, signals, parsed) == (expected, True)
+
+
+KEY_CHANGES = [
+    pytest.param(lambda resume, jd, signals: (resume + "\nGo", jd, "dice", signals), id="resume_text"),
+    pytest.param(lambda resume, jd, signals: (resume, jd + "\nGo", "dice", signals), id="jd_text"),
+    pytest.param(lambda resume, jd, signals: (resume, jd, "linkedin", signals), id="platform"),
+    pytest.param(
+        # The same JD text ranked against a different corpus
+        lambda resume, jd, signals: (resume, jd, "dice", {**signals, "top_terms": signals["top_terms"][::-1][:-1]}),
+        id="signals"
+    ),
+]
+
+
+@pytest.mark.parametrize("change", KEY_CHANGES)
+def test_input_change_changes_key(change):
+    resume_text, jd_text = PAIRS[0]
+    signals = extract_jd_signals(jd_text)
+    before = score_cache_key(resume_text, jd_text, "dice", signals)
+    assert score_cache_key(*change(resume_text, jd_text, signals)) != before
+
+
+def test_weight_change_changes_key(profiles_dir):
+    resume_text, jd_text = PAIRS[0]
+    signals = extract_jd_signals(jd_text)
+    before = score_cache_key(resume_text, jd_text, "dice", signals)
+    profiles = copy.deepcopy(PLATFORM_PROFILES)
+    profiles["dice"]["keyword_weight"] += 0.01
+    write_profile_version(profiles_dir, {"version": 1, "profiles": profiles})
+    refresh_platform_profiles(force=True)
+    assert score_cache_key(resume_text, jd_text, "dice", signals) != before
@@ -0,0 +1,83 @@
+"""Golden outputs of compiler.extract_resume_sections, frozen from the classifier it replaced"""
+import pytest
+
+from app.compiler import extract_resume_sections
+
+RESUME = """Jane Doe
+jane@example.com
+
+SUMMARY
+Senior Software Engineer with 12 years of experience building cloud platforms.
+
+TECHNICAL SKILLS
+Python, Java, Go, Terraform, Kubernetes
+
+PROFESSIONAL EXPERIENCE
+Lead Software Engineer, Acme Corp (2018 - 2024)
+- Designed microservices serving 10M requests per day
+
+Software Engineer, Globex (2012 - 2018)
+- Developed REST APIs in Python
+
+EDUCATION
+B.S. Computer Science, State University (2008 - 2012)
+"""
+
+EMPTY = {"summary": "", "skills": "", "experience": "", "education": ""}
+
+RESUME_SECTIONS = {
+    # The summary's only line names "experience", so it starts that section
+    "summary": "",
+    "skills": "Python, Java, Go, Terraform, Kubernetes\n",
+    "experience": (
+        "Lead Software Engineer, Acme Corp (2018 - 2024)\n"
+        "- Designed microservices serving 10M requests per day\n"
+        "Software Engineer, Globex (2012 - 2018)\n"
+        "- Developed REST APIs in Python\n"
+    ),
+    "education": "B.S. Computer Science, State University (2008 - 2012)\n",
+}
+
+GOLDEN = [
+    pytest.param("", EMPTY, id="empty"),
+    pytest.param("\n\n\n", EMPTY, id="blank_lines"),
+    pytest.param("No headers at all\njust text", EMPTY, id="no_headers"),
+    pytest.param(RESUME, RESUME_SECTIONS, id="resume"),
+    pytest.param(
+        RESUME.replace("\n", "\r\n"),
+        {section: text.replace("\n", "\r\n") for section, text in RESUME_SECTIONS.items()},
+        id="crlf"
+    ),
+    pytest.param(
+        "SKILLS\n  python  \n\t\nExperience with Go\nmore",
+        {**EMPTY, "skills": "  python  \n", "experience": "more\n"},
+        id="whitespace_kept"
+    ),
+    pytest.param(
+        "Professional Summary and Skills\nbuilt data platforms",
+        {**EMPTY, "summary": "built data platforms\n"},
+        id="first_section_wins"
+    ),
+    pytest.param(
+        "Work History / Education\nbuilt data platforms",
+        {**EMPTY, "experience": "built data platforms\n"},
+        id="experience_before_education"
+    ),
+    pytest.param(
+        "Education\nacademic qualifications line\nBS CS\nSummary\nrewritten",
+        {**EMPTY, "summary": "rewritten\n", "education": "BS CS\n"},
+        id="header_words_in_body"
+    ),
+    pytest.param("PROFILE\nline\nPROFILE\nsecond profile block\n", {**EMPTY, "summary": "line\n"}, id="repeated_header"),
+    pytest.param("KOMPETENZEN İstanbul\nSKİLLS\nÉDUCATION\nbody line", EMPTY, id="non_ascii"),
+    pytest.param(
+        "experience\n\n\n   \nlast line without newline",
+        {**EMPTY, "experience": "last line without newline\n"},
+        id="no_trailing_newline"
+    ),
+]
+
+
+@pytest.mark.parametrize("text, expected", GOLDEN)
+def test_extract_resume_sections(text, expected):
+    assert extract_resume_sections(text) == expected
@@ -17,6 +17,17 @@ export interface Resume {
   created_at: string
 }
 
+export interface ParseStatus {
+  resume_id: string
+  user_id: string
+  filename: string
+  status: 'queued' | 'parsing' | 'done' | 'failed'
+  progress: number
+  error: string | null
+  created_at: string | null
+  updated_at: string | null
+}
+
 export interface JobDescription {
   id: string
   platform: string
@@ -42,14 +53,52 @@ export interface ResumeVariant {
   created_at: string
 }
 
+// List endpoints return one page at a time, with the cursor for the next
+// page in this header until the last page
+const NEXT_CURSOR_HEADER = 'x-next-cursor'
+const LIST_PAGE_SIZE = 500
+
+async function listAll<T>(path: string, params: Record<string, string | undefined>): Promise<T[]> {
+  const rows: T[] = []
+  let cursor: string | undefined
+  do {
+    const response = await api.get<T[]>(path, {
+      params: { ...params, limit: LIST_PAGE_SIZE, cursor },
+    })
+    rows.push(...response.data)
+    const next = response.headers[NEXT_CURSOR_HEADER]
+    cursor = typeof next === 'string' && next ? next : undefined
+  } while (cursor)
+  return rows
+}
+
 export const resumeApi = {
-  upload: async (file: File, userId: string = 'default_user'): Promise<Resume> => {
+  upload: async (
+    file: File,
+    userId: string = 'default_user',
+    pollIntervalMs: number = 500
+  ): Promise<Resume> => {
     const formData = new FormData()
     formData.append('file', file)
     formData.append('user_id', userId)
     
     // Don't set Content-Type header - axios will set it automatically with boundary
-    const response = await api.post<Resume>('/resumes/upload', formData)
+    const response = await api.post<ParseStatus>('/resumes/upload', formData)
+    
+    // Parsing happens in the background; poll until it finishes
+    let status = response.data
+    while (status.status === 'queued' || status.status === 'parsing') {
+      await new Promise((resolve) => setTimeout(resolve, pollIntervalMs))
+      status = await resumeApi.status(status.resume_id)
+    }
+    if (status.status === 'failed') {
+      throw new Error(status.error || 'Resume parsing failed')
+    }
+    return resumeApi.get(status.resume_id)
+  },
+
+  status: async (resumeId: string): Promise<ParseStatus> => {
+    const response = await api.get<ParseStatus>(`/resumes/${resumeId}/status`)
     return response.data
   },
 
@@ -58,11 +107,10 @@ export const resumeApi = {
     return response.data
   },
 
+  // All of a user's resumes; list endpoints leave out large text columns
+  // unless they are requested in `fields`
   list: async (userId: string = 'default_user'): Promise<Resume[]> => {
-    const response = await api.get<Resume[]>('/resumes', {
-      params: { user_id: userId },
-    })
-    return response.data
+    return listAll<Resume>('/resumes', { user_id: userId, fields: 'user_id,raw_text,parsed_json' })
   },
 }
 
@@ -102,11 +150,13 @@ export const variantApi = {
     return response.data
   },
 
+  // All matching variants, including their compiled text
   list: async (resumeId?: string, jdId?: string): Promise<ResumeVariant[]> => {
-    const response = await api.get<ResumeVariant[]>('/variants', {
-      params: { resume_id: resumeId, jd_id: jdId },
+    return listAll<ResumeVariant>('/variants', {
+      resume_id: resumeId,
+      jd_id: jdId,
+      fields: 'resume_id,jd_id,persona,platform,compiled_text,scores',
     })
-    return response.data
   },
 }
 